@@ -3,9 +3,10 @@
 FINAL VERSION: Add ONLY real grants with verified working links and correct schema
 """
 
+import asyncio
 import os
 import sys
-import requests
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
 # Add the core directory to path
@@ -18,30 +19,46 @@ except ImportError as e:
     print(f"❌ Failed to import airtable: {e}")
     sys.exit(1)
 
-def test_link_with_retries(url, retries=2, timeout=15):
-    """Test link with retries and proper headers"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-    }
-    
-    for attempt in range(retries + 1):
-        try:
-            response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
-            if response.status_code in [200, 301, 302]:
-                print(f"   ✅ Status: {response.status_code} - Link verified (attempt {attempt + 1})")
-                return True
-            else:
-                print(f"   ⚠️ Status: {response.status_code} - Trying again... (attempt {attempt + 1})")
-        except Exception as e:
-            print(f"   ❌ Attempt {attempt + 1} failed: {str(e)[:100]}")
-            if attempt < retries:
-                print(f"   🔄 Retrying...")
-            continue
-    return False
+from http_client import HttpClient
+from link_health import LinkHealthService, LinkHealthStore
+
+# Link checks are shared with the scrapers: links verified within a day are not requested again
+LINK_HEALTH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'grant_aggregator', 'cache', 'link_health.sqlite')
+
+LINK_CHECK_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+@asynccontextmanager
+async def link_checker():
+    """Link-health service on the shared store; requests retry transient failures up to 3 attempts"""
+    store = LinkHealthStore(LINK_HEALTH_PATH)
+    try:
+        async with HttpClient(max_attempts=3, connect_timeout=15, read_timeout=15) as http_client:
+            yield LinkHealthService(store, http_client, accepted_statuses=(200, 301, 302), headers=LINK_CHECK_HEADERS)
+    finally:
+        store.close()
+
+async def verify_links(urls):
+    """Check links concurrently, {url: LinkCheck}"""
+    async with link_checker() as checker:
+        return await checker.check_many(urls)
+
+async def revalidate_links(table):
+    """Check the application links of every record of a table, [(record, LinkCheck or None)]"""
+    async with link_checker() as checker:
+        return await checker.revalidate_table(table)
+
+def describe_check(check):
+    """One line about a link check"""
+    if check.status is None:
+        return f"❌ No response ({check.latency:.1f}s)"
+    redirect = f" → {check.final_url}" if check.final_url and check.final_url != check.url else ""
+    return f"{'✅' if check.ok else '⚠️'} Status: {check.status} ({check.latency:.1f}s){redirect}"
 
 def create_verified_real_grants():
     """Create ONLY real grant opportunities with working links and schema compliance"""
@@ -265,12 +282,16 @@ def main():
         real_grants = create_verified_real_grants()
         print(f"\n🔍 Verifying {len(real_grants)} grant application links...")
         
+        checks = asyncio.run(verify_links(grant['Application Link'] for grant in real_grants))
+        
         verified_grants = []
         for i, grant in enumerate(real_grants, 1):
+            check = checks[grant['Application Link']]
             print(f"\n{i}. Testing: {grant['Opportunity Title'][:60]}...")
             print(f"   🔗 URL: {grant['Application Link']}")
+            print(f"   {describe_check(check)}")
             
-            if test_link_with_retries(grant['Application Link']):
+            if check.ok:
                 print(f"   ✅ VERIFIED - Adding to database")
                 verified_grants.append(grant)
             else:
@@ -294,18 +315,17 @@ def main():
             except Exception as e:
                 print(f"   ❌ Error: {str(e)[:100]}...")
         
-        # Final verification - test all links in database 
+        # Final verification - all links in database (those just verified are not requested again)
         print(f"\n🔍 FINAL VERIFICATION: Testing all links in database...")
-        final_records = client.get_all()
+        final_checks = asyncio.run(revalidate_links(client))
+        final_records = [record for record, _ in final_checks]
         working_links = 0
         
-        for record in final_records:
-            fields = record['fields']
-            title = fields.get('Opportunity Title', 'Unknown')
-            link = fields.get('Application Link', '')
+        for record, check in final_checks:
+            title = record['fields'].get('Opportunity Title', 'Unknown')
             
             print(f"📋 {title[:50]}...")
-            if link and test_link_with_retries(link):
+            if check is not None and check.ok:
                 working_links += 1
             else:
                 print(f"   🚨 WARNING: Link may be broken!")
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+⏱️ Keyword Matcher Benchmark Suite
+
+Measures throughput (grants/s), per-grant latency (p50/p99) and peak memory of
+the keyword matcher engines on a deterministic synthetic corpus, writes the
+results as JSON and compares them against a stored baseline. A regression
+beyond the tolerance makes the run exit with status 1, and so does a missing
+baseline with --require-baseline (for CI).
+
+Usage:
+    python3 benchmarks/benchmark_keyword_matcher.py [--sizes 1000 10000 100000]
+    python3 benchmarks/benchmark_keyword_matcher.py --sizes 1000 --save-baseline
+    python3 benchmarks/benchmark_keyword_matcher.py --sizes 1000 --require-baseline
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCHMARK_DIR), 'grant_aggregator', 'core'))
+
+import keyword_matcher
+from keyword_matcher import PeruGrantKeywordMatcher
+from synthetic_grants import generate_corpus
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, 'results', 'keyword_matcher_latest.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline_keyword_matcher.json')
+
+# Metrics compared against the baseline, and whether higher is better
+COMPARED_METRICS = {
+    'grants_per_second': True,
+    'p99_ms': False,
+    'peak_memory_mb': False
+}
+
+WARMUP_GRANTS = 200
+
+
+def _grant_fields(grant: Dict[str, Any]):
+    """Fields in the form the matcher's batch APIs read them"""
+    title = grant.get('title', '')
+    description = grant.get('description', '')
+    return grant.get('full_text', f"{title} {description}"), title, description
+
+
+def _per_grant(method_name: str, **matcher_options) -> Callable:
+    """Engine calling a per-grant matcher method, timing every call"""
+    def run(grants: List[Dict[str, Any]], latencies: Optional[List[float]]):
+        matcher = PeruGrantKeywordMatcher(**matcher_options)
+        method = getattr(matcher, method_name)
+        for grant in grants:
+            full_text, title, description = _grant_fields(grant)
+            if latencies is None:
+                method(full_text, title, description)
+            else:
+                started = time.perf_counter()
+                method(full_text, title, description)
+                latencies.append(time.perf_counter() - started)
+    return run
+
+
+def _whole_corpus(method_name: str, **method_options) -> Callable:
+    """Engine processing the whole corpus in one call (no per-grant latency)"""
+    def run(grants: List[Dict[str, Any]], latencies: Optional[List[float]]):
+        matcher = PeruGrantKeywordMatcher()
+        getattr(matcher, method_name)(grants, **method_options)
+    return run
+
+
+ENGINES = {
+    'analyze_grant_text': _per_grant('analyze_grant_text'),
+    'analyze_grant_text_field_aware': _per_grant('analyze_grant_text', field_aware=True),
+    'score_grant_text': _per_grant('score_grant_text'),
+    'batch_analyze_grants': _whole_corpus('batch_analyze_grants'),
+    'batch_analyze_grants_vectorized': _whole_corpus('batch_analyze_grants', vectorized=True),
+    'parallel_analyze_grants': _whole_corpus('parallel_analyze_grants'),
+    'top_k_grants': _whole_corpus('top_k_grants', k=10)
+}
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def run_benchmark(engine: str, grants: List[Dict[str, Any]], measure_memory: bool = True,
+                  repeat: int = 1) -> Dict[str, Any]:
+    """Benchmark one engine on one corpus, keeping the fastest of repeat runs"""
+    run = ENGINES[engine]
+
+    # Warm up lazily compiled patterns, the keyword database and imports
+    run(grants[:WARMUP_GRANTS], None)
+
+    elapsed = None
+    latencies = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        run_latencies = []
+        started = time.perf_counter()
+        run(grants, run_latencies)
+        run_elapsed = time.perf_counter() - started
+        if elapsed is None or run_elapsed < elapsed:
+            elapsed, latencies = run_elapsed, run_latencies
+
+    result = {
+        'engine': engine,
+        'size': len(grants),
+        'seconds': round(elapsed, 4),
+        'grants_per_second': round(len(grants) / elapsed, 1) if elapsed > 0 else None,
+        'p50_ms': None,
+        'p99_ms': None,
+        'peak_memory_mb': None
+    }
+
+    if latencies:
+        latencies.sort()
+        result['p50_ms'] = round(_percentile(latencies, 50) * 1000, 4)
+        result['p99_ms'] = round(_percentile(latencies, 99) * 1000, 4)
+
+    # Memory is traced in a separate pass, since tracing slows everything down
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(grants, None)
+            result['peak_memory_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def compare_with_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every metric that regressed by more than tolerance"""
+    baseline_results = {(entry['engine'], entry['size']): entry for entry in baseline.get('results', [])}
+    regressions = []
+
+    for result in results:
+        reference = baseline_results.get((result['engine'], result['size']))
+        if not reference:
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            current, previous = result.get(metric), reference.get(metric)
+            if not current or not previous:
+                continue
+            change = (current - previous) / previous
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(
+                    f"{result['engine']} @ {result['size']}: {metric} {previous} -> {current} ({change:+.1%})"
+                )
+
+    return regressions
+
+
+def _environment() -> Dict[str, Any]:
+    """Describe the machine and interpreter the benchmark ran on"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'vectorized_available': keyword_matcher.np is not None
+    }
+
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description='Benchmark the Peru grant keyword matcher')
+    parser.add_argument('--sizes', nargs='*', type=int, default=DEFAULT_SIZES, help='Corpus sizes to benchmark')
+    parser.add_argument('--engines', nargs='*', choices=sorted(ENGINES), default=list(ENGINES),
+                        help='Engines to benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic corpus seed')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per engine; the fastest is reported')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the (slower) peak memory pass')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write the JSON results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='Fail (exit status 1) when there is no baseline to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative regression before failing (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    engines = list(args.engines)
+    if keyword_matcher.np is None and 'batch_analyze_grants_vectorized' in engines:
+        print("⚠️ numpy/scipy not installed, skipping batch_analyze_grants_vectorized")
+        engines.remove('batch_analyze_grants_vectorized')
+
+    print("⏱️ Keyword Matcher Benchmark")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        grants = generate_corpus(size, args.seed)
+        print(f"\n📚 Corpus: {size} grants (seed {args.seed})")
+        for engine in engines:
+            result = run_benchmark(engine, grants, measure_memory=not args.no_memory, repeat=args.repeat)
+            results.append(result)
+            print(f"   {engine:<32} {result['grants_per_second'] or 0:>10.1f} grants/s"
+                  f"   p50 {result['p50_ms'] if result['p50_ms'] is not None else '-':>8} ms"
+                  f"   p99 {result['p99_ms'] if result['p99_ms'] is not None else '-':>8} ms"
+                  f"   peak {result['peak_memory_mb'] if result['peak_memory_mb'] is not None else '-':>8} MB")
+        del grants
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'environment': _environment(),
+        'results': results
+    }
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results saved to: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline saved to: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        if args.require_baseline:
+            print(f"\n❌ No baseline at {args.baseline}; run with --save-baseline to create one")
+            return 1
+        print(f"ℹ️ No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ PERFORMANCE REGRESSION (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+
+    print(f"\n✅ No regressions against baseline (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+🧪 Synthetic Grant Corpus Generator
+
+Generates deterministic English and Spanish grant texts for benchmarking the
+keyword matcher. The same seed and size always produce the same corpus, so
+results from different runs and machines are comparable.
+
+Usage:
+    python3 benchmarks/synthetic_grants.py --size 10000 --output grants.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List, Any, Iterator, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'grant_aggregator', 'core'))
+
+from keyword_database import load_keyword_database
+
+
+# Share of grants written in Spanish (the rest are in English)
+SPANISH_SHARE = 0.35
+
+# Share of sentences that mention a keyword, by how relevant the grant is
+KEYWORD_DENSITY = {
+    'unrelated': 0.003,
+    'partial': 0.03,
+    'relevant': 0.2
+}
+RELEVANCE_MIX = (('unrelated', 0.7), ('partial', 0.2), ('relevant', 0.1))
+
+SENTENCE_TEMPLATES = {
+    'en': [
+        "The {program} will support {beneficiary} through {activity} over the next {years} years.",
+        "Funding of up to USD {amount} is available for {activity} led by {beneficiary}.",
+        "Applicants must demonstrate experience in {activity} and partnerships with {beneficiary}.",
+        "This call prioritizes proposals that strengthen {activity} in {place}.",
+        "Eligible organizations include {beneficiary} working in {place}.",
+        "Projects should report measurable outcomes on {activity} and {activity}.",
+        "The {program} is financed by {donor} and administered by a regional office.",
+        "Proposals are reviewed by an independent committee on a rolling basis.",
+        "Budgets must include monitoring, evaluation and learning costs.",
+        "Co-financing of at least {percent} percent of the total budget is expected."
+    ],
+    'es': [
+        "El {program} apoyará a {beneficiary} mediante {activity} durante los próximos {years} años.",
+        "Se otorgará financiamiento de hasta USD {amount} para {activity} liderado por {beneficiary}.",
+        "Los postulantes deben demostrar experiencia en {activity} y alianzas con {beneficiary}.",
+        "Esta convocatoria prioriza propuestas que fortalezcan {activity} en {place}.",
+        "Pueden postular {beneficiary} que trabajen en {place}.",
+        "Los proyectos deben reportar resultados medibles en {activity} y {activity}.",
+        "El {program} es financiado por {donor} y administrado por una oficina regional.",
+        "Las propuestas son evaluadas por un comité independiente de forma continua.",
+        "Los presupuestos deben incluir costos de monitoreo, evaluación y aprendizaje.",
+        "Se espera un cofinanciamiento de al menos {percent} por ciento del presupuesto total."
+    ]
+}
+
+FILLERS = {
+    'en': {
+        'program': ["grant program", "innovation fund", "small grants facility", "technical cooperation program"],
+        'beneficiary': ["local organizations", "municipal governments", "research centers", "private companies",
+                        "civil society groups", "universities"],
+        'activity': ["capacity building", "infrastructure upgrades", "policy research", "market access",
+                     "data systems", "public health campaigns", "teacher training"],
+        'place': ["the region", "participating countries", "urban centers", "coastal areas", "border provinces"],
+        'donor': ["a multilateral bank", "a private foundation", "a bilateral agency", "an international trust fund"]
+    },
+    'es': {
+        'program': ["programa de subvenciones", "fondo de innovación", "programa de cooperación técnica",
+                    "fondo concursable"],
+        'beneficiary': ["organizaciones locales", "gobiernos municipales", "centros de investigación",
+                        "empresas privadas", "grupos de la sociedad civil", "universidades"],
+        'activity': ["fortalecimiento institucional", "mejoras de infraestructura", "investigación aplicada",
+                     "acceso a mercados", "sistemas de información", "campañas de salud", "formación docente"],
+        'place': ["la región", "los países participantes", "los centros urbanos", "las zonas costeras",
+                  "las provincias fronterizas"],
+        'donor': ["un banco multilateral", "una fundación privada", "una agencia bilateral",
+                  "un fondo fiduciario internacional"]
+    }
+}
+
+TITLE_TEMPLATES = {
+    'en': ["{program} for {activity}", "{activity} in {place}", "Call for proposals: {activity} with {beneficiary}"],
+    'es': ["{program} para {activity}", "{activity} en {place}", "Convocatoria: {activity} con {beneficiary}"]
+}
+
+
+class SyntheticGrantGenerator:
+    """
+    Deterministic generator of grant dictionaries (title, description, full_text).
+    Keywords are drawn from the matcher's keyword database, so keyword density
+    tracks the live taxonomy.
+    """
+
+    def __init__(self, seed: int = 42, keywords: Optional[List[str]] = None):
+        self.seed = seed
+        if keywords is None:
+            keywords = [keyword for keyword_list in load_keyword_database().keyword_lists().values()
+                        for keyword in keyword_list]
+        # Sorted so the corpus does not depend on the order of the source file
+        self.keywords = sorted(set(keywords))
+
+    def generate(self, size: int) -> Iterator[Dict[str, Any]]:
+        """Yield size grants; grant i is the same for any size larger than i"""
+        for index in range(size):
+            yield self.generate_grant(index)
+
+    def generate_grant(self, index: int) -> Dict[str, Any]:
+        """Generate grant number index of this seed"""
+        rnd = random.Random(f"{self.seed}:{index}")
+        language = 'es' if rnd.random() < SPANISH_SHARE else 'en'
+        relevance = self._choose_relevance(rnd)
+        density = KEYWORD_DENSITY[relevance]
+
+        title = self._fill(rnd, rnd.choice(TITLE_TEMPLATES[language]), language, density)
+        title = title[0].upper() + title[1:]
+        description = self._paragraph(rnd, language, density, rnd.randint(2, 5))
+        body = self._paragraph(rnd, language, density, rnd.randint(8, 30))
+
+        return {
+            'id': f"synthetic-{self.seed}-{index}",
+            'language': language,
+            'relevance': relevance,
+            'title': title,
+            'description': description,
+            # Scrapers analyze the title and description together with the body
+            'full_text': f"{title} {description} {body}"
+        }
+
+    def _choose_relevance(self, rnd: random.Random) -> str:
+        """Pick the relevance profile of a grant"""
+        roll = rnd.random()
+        for relevance, share in RELEVANCE_MIX:
+            if roll < share:
+                return relevance
+            roll -= share
+        return RELEVANCE_MIX[-1][0]
+
+    def _paragraph(self, rnd: random.Random, language: str, density: float, sentences: int) -> str:
+        """Build a paragraph of filled sentence templates"""
+        return " ".join(
+            self._fill(rnd, rnd.choice(SENTENCE_TEMPLATES[language]), language, density)
+            for _ in range(sentences)
+        )
+
+    def _fill(self, rnd: random.Random, template: str, language: str, density: float) -> str:
+        """Fill a template, replacing slots with keywords at the given density"""
+        fillers = FILLERS[language]
+        text = template
+        while '{' in text:
+            slot = text[text.index('{') + 1:text.index('}')]
+            if slot in fillers:
+                value = rnd.choice(self.keywords) if rnd.random() < density else rnd.choice(fillers[slot])
+            elif slot == 'amount':
+                value = f"{rnd.randrange(10, 5000) * 1000:,}"
+            elif slot == 'years':
+                value = str(rnd.randint(1, 6))
+            else:
+                value = str(rnd.choice([10, 15, 20, 25, 30]))
+            text = text.replace('{' + slot + '}', value, 1)
+        return text
+
+
+def generate_corpus(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate a corpus of size grants as a list"""
+    return list(SyntheticGrantGenerator(seed).generate(size))
+
+
+def main():
+    """Write a synthetic corpus as JSON Lines"""
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic grant corpus (JSON Lines)')
+    parser.add_argument('--size', type=int, default=1000, help='Number of grants to generate')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--output', default='-', help='Output file, or - for stdout')
+    args = parser.parse_args()
+
+    generator = SyntheticGrantGenerator(args.seed)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for grant in generator.generate(args.size):
+            output.write(json.dumps(grant, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class AnalysisCache:
+    """
+    Memoization cache for keyword relevance analyses.
+    Keeps an in-memory LRU and, optionally, a SQLite store so results survive between runs.
+    Keys include the matcher's keyword-set version, so editing keywords invalidates old entries.
+    """
+    
+    def __init__(self, max_entries: int = 10000, db_path: Optional[str] = None,
+                 max_disk_entries: int = 200000, commit_interval: int = 100):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.commit_interval = commit_interval
+        self._memory = OrderedDict()
+        self._connection = None
+        self._pending_writes = 0
+        
+        self.stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0
+        }
+        
+        if db_path:
+            self._open_store(db_path)
+    
+    def _open_store(self, db_path: str):
+        """Open (and create if needed) the on-disk store"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "key TEXT PRIMARY KEY, analysis TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+        self._connection.commit()
+    
+    @staticmethod
+    def make_key(text: str, title: str, description: str, keyword_set_version: str) -> str:
+        """Hash the analysed fields together with the keyword-set version"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (keyword_set_version, title, description, text):
+            digest.update(part.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a deep copy of the cached analysis (callers may modify it), or None on a miss"""
+        analysis = self._memory.get(key)
+        if analysis is not None:
+            self._memory.move_to_end(key)
+            self.stats['hits'] += 1
+            return copy.deepcopy(analysis)
+        
+        if self._connection is not None:
+            row = self._connection.execute("SELECT analysis FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row:
+                analysis = json.loads(row[0])
+                self._connection.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._count_write()
+                self._remember(key, analysis)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return copy.deepcopy(analysis)
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def put(self, key: str, analysis: Dict[str, Any]):
+        """Store an analysis in memory and, if configured, on disk"""
+        analysis = copy.deepcopy(analysis)
+        self._remember(key, analysis)
+        
+        if self._connection is not None:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analyses (key, analysis, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(analysis, ensure_ascii=False), time.time())
+            )
+            self._count_write()
+    
+    def _remember(self, key: str, analysis: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the least recently used entries"""
+        self._memory[key] = analysis
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _count_write(self):
+        """Commit and enforce the disk size limit every commit_interval writes"""
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_interval:
+            self.flush()
+    
+    def flush(self):
+        """Commit pending writes and trim the on-disk store to max_disk_entries"""
+        if self._connection is None:
+            return
+        
+        count = self._connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        if count > self.max_disk_entries:
+            self._connection.execute(
+                "DELETE FROM analyses WHERE key IN "
+                "(SELECT key FROM analyses ORDER BY last_used LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+            self.logger.debug(f"🧹 Evicted {count - self.max_disk_entries} cached analyses")
+        
+        self._connection.commit()
+        self._pending_writes = 0
+    
+    def close(self):
+        """Flush and close the on-disk store"""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
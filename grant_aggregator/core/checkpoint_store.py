@@ -0,0 +1,141 @@
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+
+def dump_record(record: Any) -> Tuple[str, str]:
+    """(record type, JSON fields) of an opportunity dataclass, for storing it outside the process"""
+    return f"{type(record).__module__}:{type(record).__qualname__}", json.dumps(asdict(record), ensure_ascii=False)
+
+
+def load_record(record_type: str, data: str) -> Any:
+    """Recreate an opportunity dataclass stored with dump_record"""
+    module_name, _, class_name = record_type.partition(':')
+    record_class = getattr(importlib.import_module(module_name), class_name)
+    known_fields = {field.name for field in fields(record_class)}
+    return record_class(**{name: value for name, value in json.loads(data).items() if name in known_fields})
+
+
+class CheckpointStore:
+    """
+    Progress of scraping runs, so an interrupted run can be resumed.
+
+    Per run ID it records which pages (URLs, or other units of work) were
+    completed together with the opportunities extracted from them, and which
+    of those opportunities have been saved. A resumed run replays finished pages
+    from here instead of fetching them again and skips records already saved.
+    Scoring is not stored here: the analysis cache already remembers it.
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id TEXT PRIMARY KEY, sources TEXT NOT NULL, started REAL NOT NULL, finished REAL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "run_id TEXT NOT NULL, source TEXT NOT NULL, page TEXT NOT NULL, completed REAL NOT NULL, "
+            "PRIMARY KEY (run_id, source, page))"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "run_id TEXT NOT NULL, source TEXT NOT NULL, page TEXT NOT NULL, position INTEGER NOT NULL, "
+            "record_type TEXT NOT NULL, data TEXT NOT NULL, saved INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (run_id, source, page, position))"
+        )
+        self._connection.commit()
+
+    def start_run(self, sources: List[str]) -> str:
+        """Register a new run and return its ID"""
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        self._connection.execute(
+            "INSERT INTO runs (run_id, sources, started) VALUES (?, ?, ?)",
+            (run_id, json.dumps(sources), time.time())
+        )
+        self._connection.commit()
+        return run_id
+
+    def find_run(self, run_id: Optional[str] = None) -> Optional[Tuple[str, List[str]]]:
+        """
+        (run ID, sources) of an unfinished run: the given one, or the most
+        recent one without a run ID. None if there is nothing to resume.
+        """
+        if run_id:
+            row = self._connection.execute(
+                "SELECT run_id, sources FROM runs WHERE run_id = ? AND finished IS NULL", (run_id,)
+            ).fetchone()
+        else:
+            row = self._connection.execute(
+                "SELECT run_id, sources FROM runs WHERE finished IS NULL ORDER BY started DESC LIMIT 1"
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def finish_run(self, run_id: str):
+        """Mark a run as finished, so it is no longer offered for resuming"""
+        self._connection.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (time.time(), run_id))
+        self._connection.commit()
+
+    def completed_pages(self, run_id: str) -> Dict[str, set]:
+        """Pages already completed in a run, by source"""
+        pages = {}
+        for source, page in self._connection.execute(
+            "SELECT source, page FROM pages WHERE run_id = ?", (run_id,)
+        ):
+            pages.setdefault(source, set()).add(page)
+        return pages
+
+    def complete_page(self, run_id: str, source: str, page: str, records: List[Any]):
+        """Record a completed page together with the opportunities extracted from it"""
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO records (run_id, source, page, position, record_type, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, source, page, position, *dump_record(record)) for position, record in enumerate(records)]
+        )
+        self._connection.execute(
+            "INSERT OR REPLACE INTO pages (run_id, source, page, completed) VALUES (?, ?, ?, ?)",
+            (run_id, source, page, time.time())
+        )
+        self._connection.commit()
+
+    def page_records(self, run_id: str, source: str, page: str) -> List[Tuple[int, Any]]:
+        """(position, opportunity) of a completed page's records that were not saved yet"""
+        records = []
+        for position, record_type, data in self._connection.execute(
+            "SELECT position, record_type, data FROM records "
+            "WHERE run_id = ? AND source = ? AND page = ? AND saved = 0 ORDER BY position",
+            (run_id, source, page)
+        ):
+            try:
+                records.append((position, load_record(record_type, data)))
+            except (ImportError, AttributeError, TypeError, ValueError) as e:
+                self.logger.warning(f"⚠️ Could not restore a checkpointed {record_type}: {e}")
+        return records
+
+    def mark_saved(self, run_id: str, source: str, page: str, position: int):
+        """Record that an opportunity has been saved, so a resumed run skips it"""
+        self._connection.execute(
+            "UPDATE records SET saved = 1 WHERE run_id = ? AND source = ? AND page = ? AND position = ?",
+            (run_id, source, page, position)
+        )
+        self._connection.commit()
+
+    def close(self):
+        """Close the store"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+👷 Crawl worker for sharded scraping runs
+
+Claims pages from a work queue, fetches, parses and scores them with the
+regular scrapers and hands the relevant opportunities back through the queue,
+where the orchestrator merges them. The orchestrator starts local workers on
+its own (--workers N); more can join from other machines sharing the queue:
+
+    python3 grant_aggregator/core/crawl_worker.py --queue grant_aggregator/cache/work_queue.sqlite
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+from contextlib import AsyncExitStack, nullcontext
+from typing import Dict, Any, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from checkpoint_store import dump_record
+from http_cache import HttpCache
+from http_client import HttpClient
+from keyword_matcher import PeruGrantKeywordMatcher
+from rate_limiter import RateLimiter, source_limit
+from run_metrics import RunMetrics
+from scraper_registry import ScraperRegistry
+from work_queue import WorkQueue, SQLiteWorkQueue, WorkUnit
+
+
+# grant_aggregator/cache, as in the orchestrator
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+
+# Settings a worker takes from the orchestrator's configuration
+WORKER_CONFIG_KEYS = [
+    'relevance_threshold', 'page_time_budget',
+    'retry_attempts', 'retry_delay', 'retry_max_delay', 'retries_per_host',
+    'http_pool_size', 'http_connections_per_host', 'dns_cache_ttl', 'connect_timeout', 'read_timeout',
+    'http_cache_path', 'http_cache_stale_while_revalidate', 'rate_limits', 'respect_robots_txt'
+]
+
+DEFAULT_WORKER_CONFIG = {
+    'relevance_threshold': 3.0,
+    'page_time_budget': 60,
+    'retry_attempts': 3,
+    'retry_delay': 1,
+    'retry_max_delay': 30,
+    'retries_per_host': 10,
+    'http_pool_size': 100,
+    'http_connections_per_host': 6,
+    'dns_cache_ttl': 300,
+    'connect_timeout': 10,
+    'read_timeout': 30,
+    'http_cache_path': os.path.join(CACHE_DIR, 'http_cache.sqlite'),
+    'http_cache_stale_while_revalidate': 0,
+    'rate_limits': {},
+    'respect_robots_txt': True
+}
+
+
+class CrawlWorker:
+    """
+    Processes work units of a sharded crawl, one at a time, until the queue
+    runs dry. Each unit is fetched within the page time budget, parsed and
+    scored; the result holds the relevant opportunities plus counters, stage
+    timings and errors for the orchestrator's report.
+    """
+
+    def __init__(self, work_queue: WorkQueue, worker_id: Optional[str] = None,
+                 config: Optional[Dict[str, Any]] = None, poll_interval: float = 0.5):
+        self.logger = logging.getLogger(__name__)
+        self.work_queue = work_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.config = {**DEFAULT_WORKER_CONFIG, **(config or {})}
+        self.poll_interval = poll_interval
+        # Conditional GETs and extractions are shared with the orchestrator and other workers through the file
+        self.http_cache = HttpCache(self.config['http_cache_path']) if self.config['http_cache_path'] else None
+        self.rate_limiter = RateLimiter()
+        self.http_client = HttpClient(
+            max_attempts=self.config['retry_attempts'],
+            base_delay=self.config['retry_delay'],
+            max_delay=self.config['retry_max_delay'],
+            retries_per_host=self.config['retries_per_host'],
+            pool_size=self.config['http_pool_size'],
+            connections_per_host=self.config['http_connections_per_host'],
+            dns_cache_ttl=self.config['dns_cache_ttl'],
+            connect_timeout=self.config['connect_timeout'],
+            read_timeout=self.config['read_timeout'],
+            cache=self.http_cache,
+            stale_while_revalidate=self.config['http_cache_stale_while_revalidate'],
+            limiter=self.rate_limiter,
+            respect_robots=self.config['respect_robots_txt']
+        )
+        # Scrapers of the sources this worker is handed, sharing one matcher and connection pool
+        self.scrapers = ScraperRegistry(keyword_matcher=PeruGrantKeywordMatcher(), http_client=self.http_client)
+        self._started_sources = set()
+        self._current_run = None
+
+        self.stats = {
+            'units': 0,
+            'scraped': 0,
+            'relevant': 0,
+            'errors': 0
+        }
+
+    async def run(self, run_id: Optional[str] = None, idle_exit: Optional[float] = None):
+        """
+        Work on units of one run (until it has none left) or of any run (until
+        idle for idle_exit seconds; forever without it).
+        """
+        loop = asyncio.get_running_loop()
+        idle_since = loop.time()
+        # The lease outlasts the page budget, so only units of dead workers are handed out again
+        lease = 2 * (self.config['page_time_budget'] or 60) + 30
+
+        async with AsyncExitStack() as stack:
+            stack.push_async_callback(self.http_client.close)  # The pool opens with the first request
+            while True:
+                unit = await asyncio.to_thread(self.work_queue.claim, self.worker_id, run_id, lease)
+                if unit is None:
+                    if run_id is not None and await asyncio.to_thread(self.work_queue.remaining, run_id) == 0:
+                        break
+                    if idle_exit is not None and loop.time() - idle_since >= idle_exit:
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                if unit.run_id != self._current_run:
+                    # Pages are fetched anew and retry budgets refilled for every run the worker serves
+                    if self._current_run is not None:
+                        self.http_client.start_run()
+                    self._current_run = unit.run_id
+                
+                scraper = await self._scraper(unit.source, stack)
+                result = await self.process(unit, scraper)
+                # Other workers wait out the host's current delay before the source's next page
+                hold = self.rate_limiter.delay(unit.url) if unit.url is not None else 0
+                await asyncio.to_thread(self.work_queue.complete, unit, result, hold)
+                idle_since = loop.time()
+
+        if self.http_cache is not None:
+            self.http_cache.close()
+        self.logger.info(f"👷 Worker {self.worker_id} done: {self.stats}")
+        return self.stats
+
+    async def _scraper(self, source_name: str, stack: AsyncExitStack) -> Any:
+        """The worker's scraper for a source, set up on first use"""
+        scraper = self.scrapers[source_name]
+        if source_name not in self._started_sources:
+            limit = source_limit(scraper.request_delay, self.config['rate_limits'].get(source_name))
+            for url in scraper.target_urls:
+                self.rate_limiter.configure(url, limit)
+            if self.scrapers.uses_session(source_name):
+                await stack.enter_async_context(scraper)  # Scrapers stay entered while the worker runs
+        self._started_sources.add(source_name)
+        return scraper
+
+    async def process(self, unit: WorkUnit, scraper: Any) -> Dict[str, Any]:
+        """Fetch, parse and score one unit; failed means the page yielded nothing to checkpoint"""
+        self.stats['units'] += 1
+        result = {'failed': True, 'scraped': 0, 'records': [], 'errors': []}
+        # Timings, requests and bytes of this page, merged into the run's metrics by the orchestrator
+        metrics = RunMetrics()
+        self.http_client.metrics = metrics
+
+        try:
+            async with asyncio.timeout(self.config['page_time_budget'] or None):
+                with metrics.page(unit.source, unit.page):
+                    if unit.url is None:
+                        with metrics.timer('fetch', unit.source, unit.page):
+                            opportunities = await scraper._add_known_programs()
+                    else:
+                        self.logger.info(f"🎯 {unit.source}: fetching {unit.url} ({self.worker_id})")
+                        # HTTP scrapers are paced per request by the HTTP client; the others per page, here
+                        paced = not self.scrapers.uses_session(unit.source)
+                        with metrics.timer('fetch', unit.source, unit.page):
+                            async with self.rate_limiter.throttle(unit.url) if paced else nullcontext():
+                                payload = await scraper.fetch_page(unit.url)
+                        opportunities = None
+                        cache_extraction = self.http_cache is not None and isinstance(payload, str)
+                        if cache_extraction:
+                            opportunities = self.http_cache.extraction(unit.url, scraper, payload)
+                        if payload is not None and opportunities is None:
+                            with metrics.timer('parse', unit.source, unit.page):
+                                opportunities = await scraper.parse_page(unit.url, payload)
+                            if cache_extraction:
+                                self.http_cache.store_extraction(unit.url, scraper, payload, opportunities)
+
+            if opportunities is not None:
+                with metrics.timer('score', unit.source, unit.page):
+                    relevant = await scraper._analyze_and_filter_opportunities(opportunities)
+                relevant = [
+                    opp for opp in relevant
+                    if opp.relevance_score >= self.config['relevance_threshold']
+                ]
+                result.update(failed=False, scraped=len(opportunities), records=[dump_record(opp) for opp in relevant])
+                self.stats['scraped'] += len(opportunities)
+                self.stats['relevant'] += len(relevant)
+            else:
+                result['errors'].append(f"{unit.source} {unit.page}: fetch returned nothing")
+
+        except TimeoutError:
+            result['errors'].append(f"{unit.source} {unit.page} ran over its time budget and was cancelled")
+        except Exception as e:
+            result['errors'].append(f"{unit.source} {unit.page} failed: {str(e)}")
+
+        result['metrics'] = metrics.page_totals(unit.source, unit.page)
+        for error_msg in result['errors']:
+            self.stats['errors'] += 1
+            self.logger.error(f"❌ {error_msg}")
+        return result
+
+
+def run_worker_process(work_queue: WorkQueue, run_id: Optional[str] = None, config: Optional[Dict[str, Any]] = None,
+                       idle_exit: Optional[float] = None):
+    """Entry point of a worker process"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    try:
+        asyncio.run(CrawlWorker(work_queue, config=config).run(run_id=run_id, idle_exit=idle_exit))
+    finally:
+        work_queue.close()
+
+
+def main():
+    """Run a worker from the command line"""
+    parser = argparse.ArgumentParser(description='Crawl worker for sharded Peru grant scraping')
+    parser.add_argument('--queue', default=os.path.join(CACHE_DIR, 'work_queue.sqlite'),
+                        help='Work queue (SQLite file) shared with the orchestrator')
+    parser.add_argument('--run-id', help='Only work on this run (default: any run)')
+    parser.add_argument('--idle-exit', type=float, default=None,
+                        help='Exit after this many seconds without work (default: keep waiting)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_WORKER_CONFIG['relevance_threshold'],
+                        help='Relevance threshold for filtering (default: 3.0)')
+    args = parser.parse_args()
+
+    run_worker_process(SQLiteWorkQueue(args.queue), run_id=args.run_id,
+                       config={'relevance_threshold': args.threshold}, idle_exit=args.idle_exit)
+
+
+if __name__ == "__main__":
+    main()
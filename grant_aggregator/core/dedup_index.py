@@ -0,0 +1,275 @@
+import hashlib
+import logging
+import os
+import random
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # Signatures are computed in pure Python without numpy
+    np = None
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Largest value SQLite stores as a signed 64-bit INTEGER
+_MAX_SQLITE_INT = (1 << 63) - 1
+
+# Modulus of the MinHash permutations (a * x + b) mod p: a prime small enough
+# that a * x + b never overflows 64 bits
+_PERMUTATION_PRIME = (1 << 31) - 1
+
+# Version of the signatures behind the stored buckets; stores of older versions are bucketed again
+_SIGNATURE_VERSION = 2
+
+
+def normalize_tokens(title: str, description: str = "", max_description_words: int = 50) -> Set[str]:
+    """
+    Word set compared for near-duplicates: the title plus the start of the
+    description, lowercased and without accents, so "Programa Perú" and
+    "programa peru" match.
+    """
+    text = f"{title} {' '.join((description or '').split()[:max_description_words])}"
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return set(_TOKEN_RE.findall(text))
+
+
+def jaccard_similarity(words1: Set[str], words2: Set[str]) -> float:
+    """Jaccard similarity of two word sets (two empty sets are identical)"""
+    if not words1 and not words2:
+        return 1.0
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of the opportunities already kept, for near-duplicate
+    detection in sub-linear time.
+
+    Every record gets a MinHash signature of its word set under num_perm
+    independent hash functions (a * h + b) mod p. The signature is cut into
+    bands, and records sharing at least min_band_matches band buckets become
+    candidates. Candidates are then checked with the exact Jaccard
+    similarity, so a duplicate means what it meant before: similarity above the
+    threshold (0.8). With 25 bands of 5 rows and two matching bands, a pair at
+    0.8 similarity is missed with probability below 0.1%, while a pair at 0.5
+    becomes a candidate less than one time in five.
+
+    Records live in SQLite: with db_path they persist between runs, so new
+    opportunities also dedup against earlier runs without loading them. A
+    record added as pending counts as kept for this run only; it persists once
+    confirmed (after it was saved) and is dropped if discarded or never confirmed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, threshold: float = 0.8, num_perm: int = 125,
+                 bands: int = 25, min_band_matches: int = 2, max_entries: int = 200000, commit_interval: int = 100,
+                 max_description_words: int = 50):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_band_matches = min_band_matches
+        self.max_entries = max_entries
+        self.commit_interval = commit_interval
+        self.max_description_words = max_description_words
+        self._pending_writes = 0
+
+        # Fixed seed: signatures stored by earlier runs must stay comparable
+        rnd = random.Random(f"near-duplicate-index:v{_SIGNATURE_VERSION}:{num_perm}")
+        self._permutations = [
+            (rnd.randrange(1, _PERMUTATION_PRIME), rnd.randrange(_PERMUTATION_PRIME)) for _ in range(num_perm)
+        ]
+        if np is not None:
+            self._multipliers = np.array([a for a, _ in self._permutations], dtype=np.uint64)
+            self._offsets = np.array([b for _, b in self._permutations], dtype=np.uint64)
+        else:
+            self._multipliers = self._offsets = None
+
+        self.stats = {
+            'checked': 0,
+            'candidates': 0,
+            'duplicates': 0
+        }
+
+        self._open_store(db_path)
+
+    def _open_store(self, db_path: Optional[str]):
+        """Open (and create if needed) the record store; in memory without db_path"""
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(db_path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        else:
+            self._connection = sqlite3.connect(":memory:")
+
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "id INTEGER PRIMARY KEY, title TEXT NOT NULL, source TEXT NOT NULL, "
+            "words TEXT NOT NULL, added REAL NOT NULL, key TEXT NOT NULL DEFAULT '', "
+            "pending INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(records)")}
+        if 'key' not in columns:
+            self._connection.execute("ALTER TABLE records ADD COLUMN key TEXT NOT NULL DEFAULT ''")
+        if 'pending' not in columns:
+            self._connection.execute("ALTER TABLE records ADD COLUMN pending INTEGER NOT NULL DEFAULT 0")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS lsh_buckets (bucket INTEGER NOT NULL, record_id INTEGER NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_bucket ON lsh_buckets (bucket)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_record ON lsh_buckets (record_id)")
+        # Records a run never confirmed (interrupted before saving them) are not kept
+        self._delete_pending()
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] < _SIGNATURE_VERSION:
+            self._rebuild_buckets()
+        self._connection.commit()
+
+    def _rebuild_buckets(self):
+        """Bucket the stored records again, under the signatures of this version"""
+        rows = self._connection.execute("SELECT id, words FROM records").fetchall()
+        self._connection.execute("DELETE FROM lsh_buckets")
+        self._connection.executemany(
+            "INSERT INTO lsh_buckets (bucket, record_id) VALUES (?, ?)",
+            ((bucket, record_id) for record_id, words in rows for bucket in self._buckets(set(words.split())))
+        )
+        self._connection.execute(f"PRAGMA user_version = {_SIGNATURE_VERSION}")
+
+    def find_or_add(self, title: str, description: str = "", source: str = "", key: str = "",
+                    pending: bool = False) -> Optional[str]:
+        """
+        Return the title of a kept record this one nearly duplicates, or add it
+        to the index and return None.
+
+        key identifies the record itself: a record seen again under the same key
+        (e.g. replayed by a resumed run) is not a duplicate of itself. A pending
+        record (which needs a key) stays until confirm() or discard().
+        """
+        self.stats['checked'] += 1
+        words = normalize_tokens(title, description, self.max_description_words)
+        buckets = self._buckets(words)
+
+        duplicate = self._find_duplicate(words, buckets, key)
+        if duplicate is not None:
+            self.stats['duplicates'] += 1
+            return duplicate
+
+        if key and self._connection.execute("SELECT 1 FROM records WHERE key = ?", (key,)).fetchone():
+            return None
+
+        cursor = self._connection.execute(
+            "INSERT INTO records (title, source, words, added, key, pending) VALUES (?, ?, ?, ?, ?, ?)",
+            (title, source, ' '.join(sorted(words)), time.time(), key, int(pending))
+        )
+        self._connection.executemany(
+            "INSERT INTO lsh_buckets (bucket, record_id) VALUES (?, ?)",
+            [(bucket, cursor.lastrowid) for bucket in buckets]
+        )
+        self._count_write()
+        return None
+
+    def confirm(self, key: str):
+        """Keep a pending record for good (it was saved)"""
+        self._connection.execute("UPDATE records SET pending = 0 WHERE key = ? AND pending = 1", (key,))
+        self._count_write()
+
+    def discard(self, key: str):
+        """Drop a pending record (it could not be saved), so it is not taken for a duplicate later"""
+        self._delete_pending(key)
+        self._count_write()
+
+    def _delete_pending(self, key: Optional[str] = None):
+        """Delete the pending records (of one key)"""
+        condition = "pending = 1" if key is None else "pending = 1 AND key = ?"
+        parameters = () if key is None else (key,)
+        self._connection.execute(
+            f"DELETE FROM lsh_buckets WHERE record_id IN (SELECT id FROM records WHERE {condition})", parameters
+        )
+        self._connection.execute(f"DELETE FROM records WHERE {condition}", parameters)
+
+    def _find_duplicate(self, words: Set[str], buckets: List[int], key: str = "") -> Optional[str]:
+        """Title of the first candidate (other than the record itself) above the similarity threshold"""
+        placeholders = ', '.join('?' * len(buckets))
+        rows = self._connection.execute(
+            "SELECT title, words, key FROM records WHERE id IN "
+            f"(SELECT record_id FROM lsh_buckets WHERE bucket IN ({placeholders}) "
+            "GROUP BY record_id HAVING COUNT(*) >= ?) ORDER BY id",
+            (*buckets, min(self.min_band_matches, len(buckets)))
+        ).fetchall()
+
+        self.stats['candidates'] += len(rows)
+        for title, stored_words, stored_key in rows:
+            if key and stored_key == key:
+                continue
+            if jaccard_similarity(words, set(stored_words.split())) > self.threshold:
+                return title
+        return None
+
+    def _buckets(self, words: Set[str]) -> List[int]:
+        """LSH bucket of every band of the word set's MinHash signature"""
+        if not words:
+            # Empty word sets are identical to each other and similar to nothing else
+            return [0]
+
+        # One independent hash function per permutation: (a * h + b) mod p of the word's hash h
+        hashes = [
+            int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+            % _PERMUTATION_PRIME
+            for word in words
+        ]
+        if self._multipliers is not None:
+            values = np.array(hashes, dtype=np.uint64)
+            permuted = (values[:, None] * self._multipliers + self._offsets) % _PERMUTATION_PRIME
+            signature = permuted.min(axis=0).tolist()
+        else:
+            signature = [min((a * h + b) % _PERMUTATION_PRIME for h in hashes) for a, b in self._permutations]
+
+        buckets = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(digest_size=8)
+            digest.update(band.to_bytes(2, 'little'))
+            for value in signature[band * self.rows:(band + 1) * self.rows]:
+                digest.update(value.to_bytes(8, 'little'))
+            buckets.append(int.from_bytes(digest.digest(), 'little') & _MAX_SQLITE_INT)
+        return buckets
+
+    def _count_write(self):
+        """Commit and enforce the size limit every commit_interval writes"""
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """Commit pending records and trim the store to max_entries, oldest first"""
+        count = self._connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        if count > self.max_entries:
+            oldest = "SELECT id FROM records ORDER BY id LIMIT ?"
+            self._connection.execute(f"DELETE FROM lsh_buckets WHERE record_id IN ({oldest})",
+                                     (count - self.max_entries,))
+            self._connection.execute(f"DELETE FROM records WHERE id IN ({oldest})", (count - self.max_entries,))
+            self.logger.debug(f"🧹 Evicted {count - self.max_entries} deduplication records")
+
+        self._connection.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        """Drop unconfirmed records, flush and close the record store"""
+        if self._connection is not None:
+            self._delete_pending()
+            self.flush()
+            self._connection.close()
+            self._connection = None
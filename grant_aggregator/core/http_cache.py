@@ -0,0 +1,151 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from .checkpoint_store import dump_record, load_record
+    from .http_client import HttpResponse
+except ImportError:
+    from checkpoint_store import dump_record, load_record
+    from http_client import HttpResponse
+
+
+def body_digest(body: str) -> str:
+    """Hash of a page body, identifying what an extraction was made from"""
+    return hashlib.blake2b(body.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+_parser_versions = {}
+
+
+def parser_version(parser: Any) -> str:
+    """Class and source hash of a scraper, so editing its parsing code invalidates cached extractions"""
+    parser_class = type(parser)
+    if parser_class not in _parser_versions:
+        digest = hashlib.blake2b(digest_size=8)
+        try:
+            digest.update(inspect.getsource(inspect.getmodule(parser_class)).encode('utf-8'))
+        except (OSError, TypeError):
+            pass  # Source not available: the class name alone keys its extractions
+        _parser_versions[parser_class] = f"{parser_class.__module__}.{parser_class.__qualname__}:{digest.hexdigest()}"
+    return _parser_versions[parser_class]
+
+
+class HttpCache:
+    """
+    Persistent cache of GET responses with their validators (ETag, Last-Modified)
+    and of the opportunities extracted from them.
+
+    The HTTP client revalidates cached pages with conditional requests; a 304
+    answer reuses the stored body. Extractions are keyed by scraper (class and
+    source hash) and by the digest of the body they came from, so an unchanged
+    page is not parsed again, and a changed page or parser never gets a stale one.
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, status INTEGER NOT NULL, headers TEXT NOT NULL, body TEXT NOT NULL, "
+            "validated_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            "url TEXT NOT NULL, parser TEXT NOT NULL, digest TEXT NOT NULL, records TEXT NOT NULL, "
+            "PRIMARY KEY (url, parser))"
+        )
+        self._connection.commit()
+
+        self.stats = {
+            'stored': 0,
+            'not_modified': 0,
+            'extractions_reused': 0,
+            'extractions_stored': 0
+        }
+
+    @staticmethod
+    def cacheable(response: HttpResponse) -> bool:
+        """Whether a response can be revalidated later: a full 200 with a validator, not marked no-store"""
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        return (
+            response.status == 200 and response.text is not None
+            and ('etag' in headers or 'last-modified' in headers)
+            and 'no-store' not in headers.get('cache-control', '').lower()
+        )
+
+    @staticmethod
+    def conditional_headers(response: HttpResponse) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers revalidating a cached response"""
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        conditional = {}
+        if 'etag' in headers:
+            conditional['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            conditional['If-Modified-Since'] = headers['last-modified']
+        return conditional
+
+    def get(self, url: str) -> Optional[Tuple[HttpResponse, float]]:
+        """The cached response for a URL with the time it was last validated, or None"""
+        row = self._connection.execute(
+            "SELECT status, headers, body, validated_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        response = HttpResponse(url=url, status=row[0], headers=json.loads(row[1]), text=row[2], from_cache=True)
+        return response, row[3]
+
+    def store(self, url: str, response: HttpResponse):
+        """Remember a response (if it is cacheable) in place of the one cached before"""
+        if not self.cacheable(response):
+            return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO pages (url, status, headers, body, validated_at) VALUES (?, ?, ?, ?, ?)",
+            (url, response.status, json.dumps(response.headers), response.text, time.time())
+        )
+        self._connection.commit()
+        self.stats['stored'] += 1
+
+    def revalidated(self, url: str):
+        """Note that the server confirmed the cached response is still current (304)"""
+        self._connection.execute("UPDATE pages SET validated_at = ? WHERE url = ?", (time.time(), url))
+        self._connection.commit()
+        self.stats['not_modified'] += 1
+
+    def extraction(self, url: str, parser: Any, body: str) -> Optional[List[Any]]:
+        """Opportunities the parser extracted before from this exact body, or None"""
+        row = self._connection.execute(
+            "SELECT digest, records FROM extractions WHERE url = ? AND parser = ?", (url, parser_version(parser))
+        ).fetchone()
+        if row is None or row[0] != body_digest(body):
+            return None
+        self.stats['extractions_reused'] += 1
+        return [load_record(record_type, data) for record_type, data in json.loads(row[1])]
+
+    def store_extraction(self, url: str, parser: Any, body: str, records: List[Any]):
+        """Remember what the parser extracted from a body"""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO extractions (url, parser, digest, records) VALUES (?, ?, ?, ?)",
+            (url, parser_version(parser), body_digest(body),
+             json.dumps([dump_record(record) for record in records], ensure_ascii=False))
+        )
+        self._connection.commit()
+        self.stats['extractions_stored'] += 1
+
+    def close(self):
+        """Close the store"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import random
+import ssl
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+try:
+    from .rate_limiter import RateLimiter
+except ImportError:
+    from rate_limiter import RateLimiter
+
+
+# Statuses worth asking again for: timeouts, rate limits and server-side failures
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class HttpResponse:
+    """A completed HTTP response, read in full (text is None for HEAD requests)"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    text: Optional[str] = None
+    size: int = 0  # bytes of the body as downloaded
+    from_cache: bool = False  # body taken from the HTTP cache (not modified, or served stale)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether a request error is transient (timeouts, dropped connections) rather than fatal"""
+    if isinstance(error, (aiohttp.ClientSSLError, aiohttp.InvalidURL, aiohttp.TooManyRedirects)):
+        return False
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """
+    Request layer of the aiohttp scrapers.
+
+    The client owns one session, whose connection pool all its scrapers share:
+    connections are kept alive and reused (one TLS handshake per connection, with
+    one SSL context for all of them), resolved hosts are cached for
+    dns_cache_ttl seconds, and at most connections_per_host connections go to
+    any one host. Connecting and reading a response have separate timeouts.
+    Scrapers pass their own headers with each request.
+
+    With an HttpCache, GET responses carrying validators are stored and later
+    revalidated with If-None-Match / If-Modified-Since; a 304 reuses the stored
+    body. Pages validated less than stale_while_revalidate seconds ago are
+    served from the cache at once and revalidated in the background, so the
+    next run sees any change.
+
+    Every request waits for its host in the rate limiter, which adapts each
+    host's pace to its latency and errors and honors Retry-After; before the
+    first request to a host its robots.txt is read for a Crawl-delay. Hosts
+    never wait for each other.
+
+    Transient failures (timeouts, dropped connections, 408/425/429/5xx) are
+    retried with exponential backoff and full jitter, waiting at least as long
+    as a Retry-After header asks. Every host has a retry budget for the run, so
+    a failing host cannot eat the run's time. Successful responses are
+    remembered for the run, so asking for the same URL again never repeats work
+    that already succeeded. Requests and downloaded bytes are counted in stats,
+    and per page in metrics when a RunMetrics is set.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 retries_per_host: int = 10, pool_size: int = 100, connections_per_host: int = 6,
+                 dns_cache_ttl: int = 300, connect_timeout: float = 10.0, read_timeout: float = 30.0,
+                 cache: Any = None, stale_while_revalidate: float = 0,
+                 limiter: Optional[RateLimiter] = None, respect_robots: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries_per_host = retries_per_host
+        self.pool_size = pool_size
+        self.connections_per_host = connections_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+        self.cache = cache  # HttpCache of conditional GETs, if any
+        self.stale_while_revalidate = stale_while_revalidate
+        self._revalidations = set()
+        self.limiter = limiter or RateLimiter()
+        self.respect_robots = respect_robots
+        self._robots = {}
+        self._retries_left = {}
+        self._completed = {}
+        self.metrics = None  # RunMetrics of the run, if it keeps them
+
+        self.stats = {
+            'requests': 0,
+            'bytes': 0,
+            'retries': 0,
+            'reused': 0,
+            'not_modified': 0,
+            'served_stale': 0,
+            'budget_exhausted': 0
+        }
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """Open the session and its connection pool (requests open it on first use too)"""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.connections_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                ssl=ssl.create_default_context()
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                # The pool may make a request wait for a connection; only the network counts
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout,
+                                              sock_read=self.read_timeout)
+            )
+
+    async def close(self):
+        """Close the session and every pooled connection, after pending background revalidations"""
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def start_run(self):
+        """Forget the requests finished so far and refill the retry budgets, for a new run on the same pool"""
+        self._completed.clear()
+        self._retries_left.clear()
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        """GET a URL and read its body"""
+        return await self.request('GET', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> HttpResponse:
+        """HEAD a URL"""
+        return await self.request('HEAD', url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        """
+        Send a request, retrying transient failures.
+
+        Returns the final response, which may still be an error status once
+        retries are exhausted; raises the last error if no response arrived.
+        """
+        key = (method, url)
+        if key in self._completed:
+            self.stats['reused'] += 1
+            return self._completed[key]
+
+        cached = self.cache.get(url) if self.cache is not None and method == 'GET' else None
+        if cached is None:
+            response = await self._send_with_retries(method, url, **kwargs)
+            if self.cache is not None and method == 'GET':
+                self.cache.store(url, response)
+        else:
+            cached_response, validated_at = cached
+            if time.time() - validated_at <= self.stale_while_revalidate:
+                task = asyncio.create_task(self._revalidate_in_background(url, cached_response, kwargs))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidations.discard)
+                self.stats['served_stale'] += 1
+                response = cached_response
+            else:
+                response = await self._revalidate(url, cached_response, kwargs)
+
+        if response.status < 400:
+            self._completed[key] = response
+        return response
+
+    async def _revalidate(self, url: str, cached: HttpResponse, kwargs: Dict[str, Any]) -> HttpResponse:
+        """Conditional GET of a cached page: the cached response if unchanged (304), else the new one"""
+        headers = {**kwargs.get('headers', {}), **self.cache.conditional_headers(cached)}
+        response = await self._send_with_retries('GET', url, **{**kwargs, 'headers': headers})
+        if response.status == 304:
+            self.cache.revalidated(url)
+            self.stats['not_modified'] += 1
+            return cached
+        self.cache.store(url, response)
+        return response
+
+    async def _revalidate_in_background(self, url: str, cached: HttpResponse, kwargs: Dict[str, Any]):
+        """Revalidate a page served stale; failures only cost the next run a fresh download"""
+        try:
+            await self._revalidate(url, cached, kwargs)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Background revalidation of {url} failed: {str(e)}")
+
+    async def _send_with_retries(self, method: str, url: str, **kwargs) -> HttpResponse:
+        """Send a request until it succeeds, fails for good or runs out of retries"""
+        await self.open()
+        host = urlparse(url).hostname or ''
+        if self.respect_robots:
+            await self._apply_robots(url, kwargs.get('headers'))
+        for attempt in range(self.max_attempts):
+            last_attempt = attempt == self.max_attempts - 1
+            await self.limiter.wait(url)
+            self.stats['requests'] += 1
+            started = time.monotonic()
+            try:
+                response, retry_after = await self._send(method, url, **kwargs)
+            except Exception as e:
+                self.limiter.feedback(url, time.monotonic() - started, error=True)
+                self._count_download(0)
+                if last_attempt or not is_retryable_error(e) or not self._spend_retry(host):
+                    raise
+                self.logger.warning(f"🔁 {method} {url} failed ({type(e).__name__}: {e}), retrying")
+                await self._backoff(attempt)
+                continue
+
+            self.limiter.feedback(url, time.monotonic() - started, status=response.status, retry_after=retry_after)
+            self._count_download(response.size)
+            if response.status < 400:
+                return response
+
+            if last_attempt or response.status not in RETRYABLE_STATUSES:
+                return response
+
+            if retry_after is not None and retry_after > self.max_delay:
+                self.logger.warning(f"⚠️ {url} asks to retry after {retry_after:.0f}s, giving up")
+                return response
+            if not self._spend_retry(host):
+                return response
+
+            self.logger.warning(f"🔁 {method} {url} returned HTTP {response.status}, retrying")
+            await self._backoff(attempt, retry_after)
+
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs) -> Tuple[HttpResponse, Optional[float]]:
+        """Send one request and read the response in full"""
+        async with self._session.request(method, url, **kwargs) as response:
+            # The body is read once; text() decodes the bytes read() kept
+            body = await response.read() if method != 'HEAD' else b''
+            text = await response.text() if method != 'HEAD' else None
+            return (
+                HttpResponse(url=str(response.url), status=response.status, headers=dict(response.headers), text=text,
+                             size=len(body)),
+                parse_retry_after(response.headers.get('Retry-After'))
+            )
+
+    async def _apply_robots(self, url: str, headers: Optional[Dict[str, str]]):
+        """Read the host's robots.txt once, before its first request"""
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in self._robots:
+            # Only the User-Agent: the request's own headers may make it conditional (a 304 would hide the rules)
+            user_agent = {'User-Agent': value for name, value in (headers or {}).items() if name.lower() == 'user-agent'}
+            self._robots[origin] = asyncio.ensure_future(self._read_robots(origin, user_agent))
+        # Shielded: a request cancelled by its time budget must not cancel the read for the others
+        await asyncio.shield(self._robots[origin])
+
+    async def _read_robots(self, origin: str, headers: Dict[str, str]):
+        """Apply a robots.txt Crawl-delay (or Request-rate) to the host's rate limit"""
+        robots_url = f"{origin}/robots.txt"
+        try:
+            await self.limiter.wait(robots_url)
+            self.stats['requests'] += 1
+            response, _ = await self._send('GET', robots_url, headers=headers)
+            self._count_download(response.size)
+        except Exception as e:
+            self.logger.debug(f"robots.txt of {origin} not read: {str(e)}")
+            return
+        if response.status != 200 or not response.text:
+            return
+
+        robots = RobotFileParser(robots_url)
+        robots.parse(response.text.splitlines())
+        agent = headers.get('User-Agent', '*')
+        delay = robots.crawl_delay(agent) or 0
+        rate = robots.request_rate(agent)
+        if rate is not None and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        if delay:
+            self.logger.info(f"🤖 {origin} asks for {delay}s between requests (robots.txt)")
+            self.limiter.set_crawl_delay(robots_url, float(delay))
+
+    def _count_download(self, size: int):
+        """Count the bytes of one request, for the run and for the page it belongs to"""
+        self.stats['bytes'] += size
+        if self.metrics is not None:
+            self.metrics.count_request(size)
+
+    def _spend_retry(self, host: str) -> bool:
+        """Take one retry from the host's budget; False once it is used up"""
+        left = self._retries_left.get(host, self.retries_per_host)
+        if left <= 0:
+            self.stats['budget_exhausted'] += 1
+            self.logger.warning(f"⚠️ Retry budget for {host} used up, not retrying")
+            return False
+        self._retries_left[host] = left - 1
+        self.stats['retries'] += 1
+        return True
+
+    async def _backoff(self, attempt: int, retry_after: Optional[float] = None):
+        """Sleep before the next attempt: full-jitter exponential backoff, at least retry_after"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        await asyncio.sleep(delay)
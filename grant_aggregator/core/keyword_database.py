@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+from typing import Dict, List, Any, Optional
+
+
+# Bump when the artifact layout or the compiled engine tables change
+KEYWORD_DATABASE_FORMAT = 1
+
+DEFAULT_KEYWORD_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords", "peru_keywords.json")
+DEFAULT_KEYWORD_ARTIFACT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "peru_keywords.kwdb"
+)
+
+# Magic, artifact format, marshal format and the sha256 of the source file
+_HEADER = struct.Struct("<4sHH32s")
+_MAGIC = b"PGKW"
+
+# Databases already loaded in this process, by (source, artifact) path
+_loaded_databases = {}
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordDatabase:
+    """
+    Keyword taxonomy loaded from a source file or its precompiled artifact.
+
+    engine holds the matcher's compiled tables when they came from the
+    artifact (or were saved to it), and is None until then. compiled is shared
+    by every matcher using this database, so patterns are compiled once per
+    process.
+    """
+
+    def __init__(self, source_path: str, artifact_path: str, source_digest: bytes, data: Dict[str, Any],
+                 engine: Optional[Dict[str, Any]] = None):
+        self.source_path = source_path
+        self.artifact_path = artifact_path
+        self.source_digest = source_digest
+        self.relevance_threshold = data['relevance_threshold']
+        self.categories = data['categories']
+        self.engine = engine
+        self.compiled = {}
+
+    def keyword_lists(self) -> Dict[str, List[str]]:
+        """Keyword lists by category value, as fresh lists"""
+        return {category: list(entry['keywords']) for category, entry in self.categories.items()}
+
+    def category_weights(self) -> Dict[str, float]:
+        """Category weights by category value"""
+        return {category: entry['weight'] for category, entry in self.categories.items()}
+
+    def keyword_weights(self) -> Dict[str, Dict[str, float]]:
+        """Per-keyword base weights by category value"""
+        return {category: dict(entry['keyword_weights']) for category, entry in self.categories.items()}
+
+    def save_engine(self, engine: Dict[str, Any]) -> bool:
+        """Write the source data and compiled engine tables to the artifact"""
+        payload = marshal.dumps({
+            'relevance_threshold': self.relevance_threshold,
+            'categories': self.categories,
+            'engine': engine
+        })
+
+        temp_path = f"{self.artifact_path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.artifact_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, 'wb') as artifact:
+                artifact.write(_HEADER.pack(_MAGIC, KEYWORD_DATABASE_FORMAT, marshal.version, self.source_digest))
+                artifact.write(payload)
+            os.replace(temp_path, self.artifact_path)
+        except OSError as e:
+            logger.warning(f"Could not write keyword database {self.artifact_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        self.engine = engine
+        return True
+
+
+def read_keyword_source(source: bytes, source_path: str = "") -> Dict[str, Any]:
+    """Parse and validate a keyword source file"""
+    try:
+        raw = json.loads(source.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"Invalid keyword source {source_path}: {e}")
+
+    if not isinstance(raw.get('categories'), dict) or not raw['categories']:
+        raise ValueError(f"Keyword source {source_path} has no categories")
+
+    default_weight = float(raw.get('default_keyword_weight', 1.0))
+    categories = {}
+    for category, entry in raw['categories'].items():
+        keywords = entry.get('keywords')
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) and keyword.strip() for keyword in keywords):
+            raise ValueError(f"Keyword source {source_path}: '{category}' needs a list of non-empty keywords")
+
+        keyword_weights = {keyword: default_weight for keyword in keywords}
+        for keyword, weight in entry.get('keyword_weights', {}).items():
+            if keyword not in keyword_weights:
+                raise ValueError(f"Keyword source {source_path}: weight given for unknown keyword '{keyword}'")
+            keyword_weights[keyword] = float(weight)
+
+        categories[category] = {
+            'weight': float(entry['weight']),
+            'keywords': keywords,
+            'keyword_weights': keyword_weights
+        }
+
+    return {
+        'relevance_threshold': float(raw.get('relevance_threshold', 3.0)),
+        'categories': categories
+    }
+
+
+def load_keyword_database(source_path: Optional[str] = None, artifact_path: Optional[str] = None) -> KeywordDatabase:
+    """
+    Load a keyword database, preferring its precompiled artifact.
+
+    The artifact is memory-mapped and used only if it was built from the
+    current contents of the source file by this artifact and marshal format;
+    otherwise the source is parsed and the artifact is rewritten once a matcher
+    has compiled it. Each database is loaded once per process.
+    """
+    source_path = source_path or DEFAULT_KEYWORD_SOURCE
+    artifact_path = artifact_path or DEFAULT_KEYWORD_ARTIFACT
+
+    with open(source_path, 'rb') as source_file:
+        source = source_file.read()
+    source_digest = hashlib.sha256(source).digest()
+
+    cache_key = (os.path.abspath(source_path), os.path.abspath(artifact_path))
+    database = _loaded_databases.get(cache_key)
+    if database is not None and database.source_digest == source_digest:
+        return database
+
+    data = _read_artifact(artifact_path, source_digest)
+    if data is not None:
+        database = KeywordDatabase(source_path, artifact_path, source_digest, data, data['engine'])
+    else:
+        database = KeywordDatabase(source_path, artifact_path, source_digest, read_keyword_source(source, source_path))
+
+    _loaded_databases[cache_key] = database
+    return database
+
+
+def _read_artifact(artifact_path: str, source_digest: bytes) -> Optional[Dict[str, Any]]:
+    """Memory-map an artifact and decode it, or None if missing or stale"""
+    try:
+        with open(artifact_path, 'rb') as artifact:
+            with mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < _HEADER.size:
+                    return None
+                magic, artifact_format, marshal_format, digest = _HEADER.unpack_from(mapped)
+                if (magic != _MAGIC or artifact_format != KEYWORD_DATABASE_FORMAT
+                        or marshal_format != marshal.version or digest != source_digest):
+                    return None
+                with memoryview(mapped) as view:
+                    return marshal.loads(view[_HEADER.size:])
+    except (OSError, ValueError, EOFError, TypeError) as e:
+        logger.debug(f"Ignoring keyword database {artifact_path}: {e}")
+        return None
+
+
+def build_keyword_database(source_path: Optional[str] = None, artifact_path: Optional[str] = None) -> str:
+    """Compile a keyword source file into its artifact and return the artifact path"""
+    try:
+        from .keyword_matcher import PeruGrantKeywordMatcher
+    except ImportError:
+        from keyword_matcher import PeruGrantKeywordMatcher
+
+    database = load_keyword_database(source_path, artifact_path)
+    database.engine = None
+    matcher = PeruGrantKeywordMatcher(keyword_database=database)
+    if database.engine is None:
+        raise OSError(f"Could not write keyword database {database.artifact_path}")
+
+    stats = matcher.get_keyword_statistics()
+    print(f"✅ Built {database.artifact_path} ({stats['total']} keywords, "
+          f"{len(matcher._keyword_words)} compiled entries)")
+    return database.artifact_path
+
+
+def main():
+    """Command line entry point for building the keyword database artifact"""
+    parser = argparse.ArgumentParser(
+        description="Compile the keyword source file into the matcher's precompiled keyword database"
+    )
+    parser.add_argument('--source', default=DEFAULT_KEYWORD_SOURCE, help='Keyword source file (JSON)')
+    parser.add_argument('--output', default=DEFAULT_KEYWORD_ARTIFACT, help='Artifact to write')
+    args = parser.parse_args()
+
+    build_keyword_database(args.source, args.output)
+
+
+if __name__ == "__main__":
+    main()
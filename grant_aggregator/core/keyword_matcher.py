@@ -1,9 +1,122 @@
+import hashlib
+import heapq
 import json
+import os
 import re
-from typing import Dict, List, Tuple, Any
+import unicodedata
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Vectorized batch scoring is optional
+    np = None
+    sparse = None
+
+try:
+    from .keyword_database import load_keyword_database
+except ImportError:
+    from keyword_database import load_keyword_database
+
+
+# Bump when scoring logic changes so cached analyses are not reused
+SCORING_VERSION = 1
+
+# Word tokens, using the same definition of "word" as the \b in keyword patterns
+_WORD_RE = re.compile(r'\w+')
+
+# Context terms near a match that raise or lower its weight
+CONTEXT_BOOST_TERMS = ('eligible', 'application')
+CONTEXT_PENALTY_TERMS = ('not eligible', 'excluding')
+
+# Characters that re.IGNORECASE treats as equal to a Latin letter but that
+# str.lower() leaves untouched
+_CASE_FOLD = str.maketrans({'\u0131': 'i', '\u017f': 's'})
+_NEEDS_CASE_FOLD = re.compile('[\u0131\u017f]')
+
+
+def _build_accent_fold_table() -> Dict[int, str]:
+    """Map accented Latin letters to their base letter, one character for one."""
+    table = dict(_CASE_FOLD)
+    for code_point in list(range(0x80, 0x250)) + list(range(0x1e00, 0x1f00)):
+        char = chr(code_point)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+        if len(base) == 1 and base != char:
+            table[code_point] = base
+    return table
+
+
+# Accent folding keeps string lengths, so spans found in folded text apply
+# to the original text; only runs of non-ASCII characters are translated
+_ACCENT_FOLD = _build_accent_fold_table()
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+
+def _fold_accents(text: str) -> str:
+    """Fold accents ("perú" -> "peru") in already lowercased text."""
+    if text.isascii():
+        return text
+    return _NON_ASCII_RE.sub(lambda run: run.group(0).translate(_ACCENT_FOLD), text)
+
+
+class _LazyPatterns(dict):
+    """Regex patterns compiled from their source the first time they are used."""
+    
+    def __init__(self, sources: Dict[str, str], flags: int = 0):
+        super().__init__()
+        self._sources = sources
+        self._flags = flags
+    
+    def __missing__(self, key: str):
+        pattern = self[key] = re.compile(self._sources[key], self._flags)
+        return pattern
+
+
+class TopKCollector:
+    """
+    Keep the k highest-scoring items seen so far in a bounded min-heap.
+    
+    Memory stays O(k) and each add is O(log k). Ties keep the earliest added
+    item, so results() orders items as a stable descending sort would.
+    """
+    
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.seen = 0
+        self._heap = []
+    
+    def add(self, score: float, item: Any):
+        """Offer an item; it is kept only if it ranks within the top k."""
+        # The insertion counter breaks ties and keeps items from being compared
+        entry = (score, -self.seen, item)
+        self.seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def results(self) -> List[Any]:
+        """Kept items, highest score first."""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))]
+
+
+def iter_jsonl_grants(path: str) -> Iterator[Dict[str, Any]]:
+    """Read grants lazily from a JSON Lines file, one grant object per line."""
+    with open(path, 'r', encoding='utf-8') as grants_file:
+        for line_number, line in enumerate(grants_file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid grant on line {line_number} of {path}: {e}")
+
 
 class MatchCategory(Enum):
     GEOGRAPHIC = "geographic"
@@ -20,6 +133,7 @@ class KeywordMatch:
     category: MatchCategory
     weight: float
     context: str = ""
+    field: str = ""
 
 
 class PeruGrantKeywordMatcher:
@@ -28,143 +142,282 @@ class PeruGrantKeywordMatcher:
     Uses weighted scoring across multiple categories to identify relevant opportunities.
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[Any] = None, field_aware: bool = False, fold_accents: bool = True,
+                 keyword_database: Optional[Any] = None):
+        # Keywords, category weights, per-keyword weights and the threshold come
+        # from the keyword database (keywords/peru_keywords.json); a path to
+        # another source file or an already loaded KeywordDatabase can be given
+        if keyword_database is None or isinstance(keyword_database, str):
+            keyword_database = load_keyword_database(keyword_database)
+        self.keyword_database = keyword_database
+        
         self.keywords = self._load_peru_keywords()
         self.category_weights = {
-            MatchCategory.GEOGRAPHIC: 3.0,      # Highest weight - geographic relevance
-            MatchCategory.PROGRAM_AREA: 2.5,    # High weight - program alignment
-            MatchCategory.BENEFICIARY: 2.0,     # Medium-high - target population
-            MatchCategory.FUNDING_TYPE: 1.5,    # Medium - funding category
-            MatchCategory.PRIORITY: 1.8,        # Medium-high - priority indicators
-            MatchCategory.EXCLUSION: -5.0       # Strong negative weight - exclusions
+            MatchCategory(category): weight
+            for category, weight in keyword_database.category_weights().items()
+        }
+        self.keyword_weights = {
+            MatchCategory(category): weights
+            for category, weights in keyword_database.keyword_weights().items()
         }
         
         # Minimum score threshold for considering a grant relevant
-        self.relevance_threshold = 3.0
+        self.relevance_threshold = keyword_database.relevance_threshold
+        
+        # Optional memoization cache (see analysis_cache.AnalysisCache)
+        self.cache = cache
+        
+        # Field-aware scoring scans title, description and text once each and
+        # weights matches by field; off by default, which keeps the legacy
+        # duplicated-text scores
+        self.field_aware = field_aware
+        self.field_multipliers = {
+            'title': 2.0,
+            'description': 2.0,
+            'text': 1.0
+        }
+        
+        # Fold accents in keywords and documents, so "PERU" matches "Perú" and
+        # variants such as "Perú"/"Peru" share one entry; False keeps the
+        # accent-sensitive matching of earlier versions
+        self.fold_accents = fold_accents
+        
+        # Compile the whole keyword set once so each analysis is a single scan
+        self._compile_keyword_engine()
         
     def _load_peru_keywords(self) -> Dict[MatchCategory, List[str]]:
-        """Load and categorize Peru grant keywords with variations."""
+        """Load and categorize Peru grant keywords with variations from the keyword database."""
         return {
-            MatchCategory.GEOGRAPHIC: [
-                "Peru", "Perú", "Peruvian", "peruano", "peruana",
-                "Andean region", "Andes", "andino", "andina",
-                "Ancash Province", "Ancash", "Áncash",
-                "Huascarán National Park", "Huascaran", "Huascarán",
-                "Rural Peru", "Peru rural", "rural Peru",
-                "Highland communities", "comunidades altoandinas",
-                "Mountain regions", "regiones montañosas",
-                "Peruvian highlands", "altiplano peruano",
-                "Remote villages Peru", "aldeas remotas Peru",
-                "Indigenous territories", "territorios indígenas",
-                "Latin America", "América Latina", "South America", "Sudamérica",
-                # Additional international geographic terms for grants.gov
-                "developing countries", "países en desarrollo",
-                "international development", "desarrollo internacional",
-                "overseas programs", "programas internacionales",
-                "foreign assistance", "asistencia exterior",
-                "global development", "desarrollo global",
-                "international cooperation", "cooperación internacional"
-            ],
+            MatchCategory(category): keywords
+            for category, keywords in self.keyword_database.keyword_lists().items()
+        }
+    
+    def _compile_keyword_engine(self):
+        """
+        Compile all keywords into a single-pass matching engine.
+        
+        Every keyword pattern starts at a word boundary with a run of word
+        characters (its "anchor"), so a keyword can only match where a word of
+        the text starts with its anchor. The text is tokenized once and its
+        distinct words are intersected with the anchor table; only anchors that
+        occur are located, and only multi-word keywords run their precompiled
+        pattern there, which reproduces the per-keyword scan exactly.
+        
+        With fold_accents, keywords that are equal once accents and case are
+        folded ("Peru", "Perú") become one entry of the engine. Hits are keyed
+        by entry, and each hit reports the variant spelled as in the text.
+        
+        The tables are taken from the keyword database artifact when it was
+        built for the same keywords, and compiled patterns are shared by every
+        matcher in the process that uses the same database.
+        """
+        # Fingerprint of the keywords and their weights, part of every analysis cache key
+        keyword_source = json.dumps(
+            [[category.value, keywords, self.keyword_weights.get(category, {})]
+             for category, keywords in self.keywords.items()],
+            ensure_ascii=False
+        )
+        if self.fold_accents:
+            keyword_source += ':folded'
+        self.keyword_set_version = hashlib.sha256(keyword_source.encode('utf-8')).hexdigest()[:16]
+        
+        engine = self.keyword_database.compiled.get(self.keyword_set_version)
+        if engine is None:
+            tables = self.keyword_database.engine
+            if tables is None or tables['keyword_set_version'] != self.keyword_set_version:
+                tables = self._build_engine_tables()
+                # Only the default configuration is worth writing back to the artifact
+                if self.fold_accents and self._uses_database_keywords():
+                    self.keyword_database.save_engine(tables)
+            engine = self._load_engine_tables(tables)
+            self.keyword_database.compiled[self.keyword_set_version] = engine
+        
+        self._keyword_patterns = engine['keyword_patterns']
+        self._keyword_words = engine['keyword_words']
+        self._keyword_entries = engine['keyword_entries']
+        self._base_weights = engine['base_weights']
+        self._anchor_index = engine['anchor_index']
+        self._anchor_patterns = engine['anchor_patterns']
+        # Anchors of multi-word keywords can also match glued to the next word
+        # ("ruralperu"), because the separator pattern allows zero characters
+        self._prefix_anchor_index = engine['prefix_anchor_index']
+        self._prefix_anchors = engine['prefix_anchors']
+        self._prefix_anchor_lengths = engine['prefix_anchor_lengths']
+    
+    def _build_engine_tables(self) -> Dict[str, Any]:
+        """Build the engine tables from the keywords, as plain serializable data."""
+        entries = {}
+        keyword_words = {}
+        patterns = {}
+        base_weights = {}
+        anchor_index = {}
+        prefix_anchor_index = {}
+        
+        for category, keywords in self.keywords.items():
+            entries[category.value] = self._group_keyword_variants(keywords)
+            base_weights[category.value] = {
+                keyword: self._calculate_base_weight(keyword, category) for keyword in keywords
+            }
             
-            MatchCategory.PROGRAM_AREA: [
-                # Education
-                "rural education", "educación rural", "community learning",
-                "adult literacy", "alfabetización", "digital inclusion",
-                "inclusión digital", "educational access", "acceso educativo",
-                "technical training", "capacitación técnica",
-                
-                # Economic Development  
-                "microfinance", "microfinanzas", "small business",
-                "pequeñas empresas", "agricultural cooperatives",
-                "cooperativas agrícolas", "rural entrepreneurship",
-                "emprendimiento rural", "income generation",
-                "generación de ingresos", "value chain",
+            for entry, _ in entries[category.value]:
+                if entry in patterns:
+                    continue
+                patterns[entry] = self._create_keyword_pattern(entry)
                 
-                # Healthcare
-                "rural health", "salud rural", "mobile medical units",
-                "unidades médicas móviles", "maternal health",
-                "salud materna", "telemedicine", "telemedicina",
-                "community health workers", "promotores de salud",
-                "nutrition", "nutrición",
-                
-                # Agriculture
-                "sustainable farming", "agricultura sostenible",
-                "crop diversification", "diversificación de cultivos",
-                "climate-smart agriculture", "agricultura climáticamente inteligente",
-                "seed improvement", "mejoramiento de semillas",
-                "agribusiness", "agronegocios", "organic farming",
-                
-                # Infrastructure
-                "rural electrification", "electrificación rural",
-                "water access", "acceso al agua", "sanitation",
-                "saneamiento", "road construction", "construcción de carreteras",
-                "digital connectivity", "conectividad digital",
-                "renewable energy", "energías renovables"
-            ],
-            
-            MatchCategory.BENEFICIARY: [
-                "indigenous communities", "comunidades indígenas",
-                "Quechua populations", "poblaciones quechua",
-                "rural women", "mujeres rurales",
-                "smallholder farmers", "pequeños agricultores",
-                "mountain dwellers", "pobladores de montaña",
-                "vulnerable groups", "grupos vulnerables",
-                "rural populations", "poblaciones rurales",
-                "mountain communities", "comunidades de montaña",
-                "indigenous peoples", "pueblos indígenas"
-            ],
-            
-            MatchCategory.FUNDING_TYPE: [
-                "community development grants", "subsidios desarrollo comunitario",
-                "rural infrastructure funding", "financiamiento infraestructura rural",
-                "capacity building programs", "programas fortalecimiento capacidades",
-                "education initiatives", "iniciativas educativas",
-                "health sector grants", "subsidios sector salud",
-                "agricultural development", "desarrollo agrícola",
-                "NGO funding", "financiamiento ONG",
-                "civil society grants", "subsidios sociedad civil",
-                # Additional funding types from grants.gov
-                "federal grants", "subsidios federales",
-                "USAID funding", "financiamiento USAID",
-                "international grants", "subsidios internacionales",
-                "development assistance", "asistencia para el desarrollo",
-                "foreign aid", "ayuda exterior",
-                "cooperative agreements", "acuerdos de cooperación",
-                "technical assistance", "asistencia técnica",
-                "humanitarian aid", "ayuda humanitaria"
-            ],
-            
-            MatchCategory.PRIORITY: [
-                "Peru eligibility", "elegible Peru", "Perú elegible",
-                "rural focus", "enfoque rural", "community-based",
-                "basado en comunidad", "grassroots organizations",
-                "organizaciones de base", "local NGOs", "ONG locales",
-                "indigenous-led initiatives", "iniciativas lideradas indígenas",
-                "participatory development", "desarrollo participativo",
-                "bottom-up approach", "enfoque de abajo hacia arriba",
-                # Additional priority indicators for grants.gov
-                "international eligible", "elegible internacional",
-                "developing countries eligible", "países en desarrollo elegibles",
-                "non-profit organizations", "organizaciones sin fines de lucro",
-                "civil society eligible", "sociedad civil elegible",
-                "small grants program", "programa de pequeños subsidios",
-                "capacity building focus", "enfoque fortalecimiento capacidades",
-                "partnership opportunities", "oportunidades de asociación"
-            ],
-            
-            MatchCategory.EXCLUSION: [
-                "urban only", "solo urbano", "developed countries only",
-                "solo países desarrollados", "research institutions only",
-                "solo instituciones investigación", "government agencies only",
-                "solo agencias gubernamentales", "commercial ventures only",
-                "solo emprendimientos comerciales", "academic organizations only",
-                "solo organizaciones académicas", "for-profit only",
-                "solo con fines de lucro", "United States only", "solo Estados Unidos",
-                "Europe only", "solo Europa", "US citizens only", "solo ciudadanos estadounidenses"
-            ]
+                folded = self._fold_keyword(entry)
+                anchor = _WORD_RE.match(folded).group(0)
+                is_plain_word = anchor == folded
+                # Every word must appear in the text for a multi-word keyword to match
+                keyword_words[entry] = tuple(folded.split())
+                anchor_index.setdefault(anchor, []).append((entry, is_plain_word))
+                if ' ' in entry and ' ' in folded[:len(anchor) + 1]:
+                    prefix_anchor_index.setdefault(anchor, []).append((entry, False))
+        
+        return {
+            'keyword_set_version': self.keyword_set_version,
+            'entries': entries,
+            'keyword_words': keyword_words,
+            'patterns': patterns,
+            'base_weights': base_weights,
+            'anchor_index': anchor_index,
+            'prefix_anchor_index': prefix_anchor_index
+        }
+    
+    def _load_engine_tables(self, tables: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn serialized engine tables into the matcher's lookup structures."""
+        # Most patterns are never needed by a run, so they compile on first use
+        return {
+            'keyword_patterns': _LazyPatterns(tables['patterns'], re.IGNORECASE),
+            'keyword_words': tables['keyword_words'],
+            'keyword_entries': {
+                MatchCategory(category): entries for category, entries in tables['entries'].items()
+            },
+            'base_weights': {
+                (MatchCategory(category), keyword): weight
+                for category, weights in tables['base_weights'].items()
+                for keyword, weight in weights.items()
+            },
+            'anchor_index': tables['anchor_index'],
+            # A leading \b would disable the regex engine's literal prefix search,
+            # so the start boundary is checked by hand in _find_word_starts
+            'anchor_patterns': _LazyPatterns(
+                {anchor: re.escape(anchor) + r'\b' for anchor in tables['anchor_index']}
+            ),
+            'prefix_anchor_index': tables['prefix_anchor_index'],
+            'prefix_anchors': tuple(tables['prefix_anchor_index']),
+            'prefix_anchor_lengths': sorted({len(anchor) for anchor in tables['prefix_anchor_index']})
         }
     
-    def analyze_grant_text(self, text: str, title: str = "", description: str = "") -> Dict[str, Any]:
+    def _uses_database_keywords(self) -> bool:
+        """Check whether the keywords and weights are still the keyword database's own."""
+        return (self.keywords == self._load_peru_keywords()
+                and self.keyword_weights == {MatchCategory(category): weights for category, weights
+                                             in self.keyword_database.keyword_weights().items()})
+    
+    def _fold_keyword(self, keyword: str) -> str:
+        """Lowercase a keyword the way documents are folded before scanning."""
+        folded = keyword.lower().translate(_CASE_FOLD)
+        return _fold_accents(folded) if self.fold_accents else folded
+    
+    def _group_keyword_variants(self, keywords: List[str]) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Group a category's keywords into (entry, variants), in keyword order."""
+        if not self.fold_accents:
+            return [(keyword, (keyword,)) for keyword in keywords]
+        
+        entries = {}
+        for keyword in keywords:
+            entries.setdefault(self._fold_keyword(keyword), []).append(keyword)
+        return [(entry, tuple(variants)) for entry, variants in entries.items()]
+    
+    def _category_entries(self, category: MatchCategory, keywords: List[str]) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Compiled entries for a category, or fresh ones for another keyword list."""
+        if keywords is self.keywords.get(category):
+            return self._keyword_entries[category]
+        return self._group_keyword_variants(keywords)
+    
+    def _reported_keyword(self, variants: Tuple[str, ...], text: str, start: int, end: int) -> str:
+        """Pick the variant spelled as the text spells the match, else the first listed."""
+        if len(variants) > 1:
+            matched = text[start:end]
+            for variant in variants:
+                if variant.lower() == matched:
+                    return variant
+        return variants[0]
+    
+    def _analysis_cache_version(self, field_aware: bool = False) -> str:
+        """Version string covering everything besides the text that shapes an analysis."""
+        weights = ','.join(f"{category.value}={weight}" for category, weight in self.category_weights.items())
+        version = f"{SCORING_VERSION}:{self.keyword_set_version}:{weights}:{self.relevance_threshold}"
+        if field_aware:
+            multipliers = ','.join(f"{field}={weight}" for field, weight in sorted(self.field_multipliers.items()))
+            version += f":fields:{multipliers}"
+        return version
+    
+    def _scan_keyword_hits(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Find the spans of every keyword entry in already lowercased text."""
+        # Length-preserving, so spans found in folded text apply to text
+        if self.fold_accents:
+            folded = _fold_accents(text)
+        else:
+            folded = text.translate(_CASE_FOLD) if _NEEDS_CASE_FOLD.search(text) else text
+        tokens = set(_WORD_RE.findall(folded))
+        
+        candidate_starts = {}
+        for anchor in self._anchor_index.keys() & tokens:
+            entries = [
+                (keyword, is_plain_word) for keyword, is_plain_word in self._anchor_index[anchor]
+                if is_plain_word or all(word in folded for word in self._keyword_words[keyword])
+            ]
+            if not entries:
+                continue
+            for start, end in self._find_word_starts(self._anchor_patterns[anchor], folded):
+                for keyword, is_plain_word in entries:
+                    candidate_starts.setdefault(keyword, []).append((start, end, is_plain_word))
+        
+        for token in tokens:
+            if not token.startswith(self._prefix_anchors):
+                continue
+            for length in self._prefix_anchor_lengths:
+                if length >= len(token):
+                    break
+                anchor = token[:length]
+                if anchor in self._prefix_anchor_index:
+                    for start, end in self._find_word_starts(re.compile(re.escape(token) + r'\b'), folded):
+                        for keyword, is_plain_word in self._prefix_anchor_index[anchor]:
+                            candidate_starts.setdefault(keyword, []).append((start, end, False))
+        
+        hits = {}
+        for keyword, starts in candidate_starts.items():
+            last_end = 0
+            for start, token_end, is_plain_word in sorted(starts):
+                # Matches of one keyword never overlap, as with re.finditer
+                if start < last_end:
+                    continue
+                if is_plain_word:
+                    span = (start, token_end)
+                else:
+                    keyword_match = self._keyword_patterns[keyword].match(folded, start)
+                    if not keyword_match:
+                        continue
+                    span = keyword_match.span()
+                
+                hits.setdefault(keyword, []).append(span)
+                last_end = span[1]
+        
+        return hits
+    
+    def _find_word_starts(self, pattern, text: str) -> List[Tuple[int, int]]:
+        """Spans of pattern matches that also begin at a word boundary."""
+        spans = []
+        for word_match in pattern.finditer(text):
+            start = word_match.start()
+            if start and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                continue
+            spans.append(word_match.span())
+        return spans
+    
+    def analyze_grant_text(self, text: str, title: str = "", description: str = "",
+                           field_aware: Optional[bool] = None) -> Dict[str, Any]:
         """
         Analyze grant text for Peru relevance using intelligent keyword matching.
         
@@ -172,27 +425,44 @@ class PeruGrantKeywordMatcher:
             text: Full grant text to analyze
             title: Grant title (optional, given higher weight)
             description: Grant description (optional, given higher weight)
+            field_aware: Score each field once with field_multipliers instead of
+                duplicating title and description (defaults to self.field_aware)
         
         Returns:
             Dictionary with relevance score, matches, and recommendation
         """
         if not text:
             return self._create_empty_result()
-            
-        # Combine all text sources with weights
-        weighted_text = f"{title} {title} {description} {description} {text}".lower()
+        
+        if field_aware is None:
+            field_aware = self.field_aware
+        
+        if self.cache is not None:
+            cache_key = self.cache.make_key(text, title, description, self._analysis_cache_version(field_aware))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         matches = []
         category_scores = {category: 0.0 for category in MatchCategory}
         
-        # Find matches for each category
-        for category, keywords in self.keywords.items():
-            category_matches = self._find_category_matches(weighted_text, keywords, category)
-            matches.extend(category_matches)
+        if field_aware:
+            matches = self._find_field_matches(text, title, description)
+            for category in self.keywords:
+                category_scores[category] = sum(match.weight for match in matches if match.category == category)
+        else:
+            # Combine all text sources with weights
+            weighted_text = f"{title} {title} {description} {description} {text}".lower()
+            keyword_hits = self._scan_keyword_hits(weighted_text)
             
-            # Calculate category score
-            category_score = sum(match.weight for match in category_matches)
-            category_scores[category] = category_score
+            # Find matches for each category
+            for category, keywords in self.keywords.items():
+                category_matches = self._find_category_matches(weighted_text, keywords, category, keyword_hits)
+                matches.extend(category_matches)
+                
+                # Calculate category score
+                category_score = sum(match.weight for match in category_matches)
+                category_scores[category] = category_score
         
         # Calculate total relevance score
         total_score = sum(
@@ -203,7 +473,7 @@ class PeruGrantKeywordMatcher:
         # Generate recommendation
         recommendation = self._generate_recommendation(total_score, category_scores, matches)
         
-        return {
+        analysis = {
             'relevance_score': round(total_score, 2),
             'is_relevant': total_score >= self.relevance_threshold,
             'category_scores': {cat.value: round(score, 2) for cat, score in category_scores.items()},
@@ -212,20 +482,27 @@ class PeruGrantKeywordMatcher:
             'priority_level': self._calculate_priority_level(total_score),
             'exclusion_flags': [match.keyword for match in matches if match.category == MatchCategory.EXCLUSION]
         }
+        
+        if self.cache is not None:
+            self.cache.put(cache_key, analysis)
+        
+        return analysis
     
-    def _find_category_matches(self, text: str, keywords: List[str], category: MatchCategory) -> List[KeywordMatch]:
+    def _find_category_matches(self, text: str, keywords: List[str], category: MatchCategory,
+                               keyword_hits: Optional[Dict[str, List[Tuple[int, int]]]] = None) -> List[KeywordMatch]:
         """Find keyword matches within a specific category."""
         matches = []
         
-        for keyword in keywords:
-            # Create regex pattern for flexible matching
-            pattern = self._create_keyword_pattern(keyword)
-            regex_matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in regex_matches:
+        if keyword_hits is None:
+            keyword_hits = self._scan_keyword_hits(text)
+        
+        for entry, variants in self._category_entries(category, keywords):
+            for match_start, match_end in keyword_hits.get(entry, ()):
+                keyword = self._reported_keyword(variants, text, match_start, match_end)
+                
                 # Extract context around the match
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 50)
+                start = max(0, match_start - 50)
+                end = min(len(text), match_end + 50)
                 context = text[start:end].strip()
                 
                 # Calculate match weight based on keyword importance and context
@@ -240,6 +517,136 @@ class PeruGrantKeywordMatcher:
         
         return matches
     
+    def _iter_field_hits(self, text: str, title: str, description: str):
+        """
+        Yield (category, keyword, field, field_text, start, end) for every hit,
+        field by field, with start and end bounding the match context.
+        
+        Callers usually build text from the title and description, so a field
+        found inside text is scored from that span instead of being scanned
+        again; only fields missing from text are scanned on their own. Contexts
+        never cross from one field into another.
+        """
+        text_lower = text.lower()
+        field_spans = []
+        sources = [('text', text_lower)]
+        
+        for field, value in (('title', title), ('description', description)):
+            value = value.lower()
+            if not value.strip():
+                continue
+            start = text_lower.find(value)
+            end = start + len(value)
+            if start != -1 and not any(start < span_end and span_start < end for span_start, span_end, _ in field_spans):
+                field_spans.append((start, end, field))
+            else:
+                sources.append((field, value))
+        
+        scanned = [(field, value, self._scan_keyword_hits(value)) for field, value in sources]
+        
+        for category, entries in self._keyword_entries.items():
+            for entry, variants in entries:
+                for source_field, value, keyword_hits in scanned:
+                    for match_start, match_end in keyword_hits.get(entry, ()):
+                        keyword = self._reported_keyword(variants, value, match_start, match_end)
+                        field = source_field
+                        window_start, window_end = 0, len(value)
+                        for span_start, span_end, span_field in field_spans:
+                            if source_field == 'text' and span_start <= match_start < span_end:
+                                field = span_field
+                                window_start, window_end = span_start, span_end
+                                break
+                        
+                        start = max(window_start, match_start - 50)
+                        end = min(max(window_end, match_end), match_end + 50)
+                        yield category, keyword, field, value, start, end
+    
+    def _find_field_matches(self, text: str, title: str, description: str) -> List[KeywordMatch]:
+        """Find keyword matches field by field, weighting each by its field multiplier."""
+        matches = []
+        for category, keyword, field, value, start, end in self._iter_field_hits(text, title, description):
+            # Extract context around the match, within its field
+            context = value[start:end].strip()
+            
+            weight = self._calculate_match_weight(keyword, context, category)
+            matches.append(KeywordMatch(
+                keyword=keyword,
+                category=category,
+                weight=weight * self.field_multipliers.get(field, 1.0),
+                context=context,
+                field=field
+            ))
+        
+        return matches
+    
+    def score_grant_text(self, text: str, title: str = "", description: str = "",
+                         field_aware: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Score grant text without building match details.
+        
+        Returns the relevance_score, is_relevant, category_scores, priority_level
+        and exclusion_flags of analyze_grant_text, with the same values, but no
+        KeywordMatch objects, contexts or recommendation are built. Call
+        analyze_grant_text for the grants whose details will be reviewed.
+        """
+        if not text:
+            return self._create_score_result(self._create_empty_result())
+        
+        if field_aware is None:
+            field_aware = self.field_aware
+        
+        if self.cache is not None:
+            cached = self.cache.get(
+                self.cache.make_key(text, title, description, self._analysis_cache_version(field_aware))
+            )
+            if cached is not None:
+                return self._create_score_result(cached)
+        
+        category_scores = {category: 0.0 for category in MatchCategory}
+        exclusion_flags = []
+        
+        if field_aware:
+            hits = self._iter_field_hits(text, title, description)
+        else:
+            weighted_text = f"{title} {title} {description} {description} {text}".lower()
+            hits = self._iter_text_hits(weighted_text)
+        
+        for category, keyword, field, value, start, end in hits:
+            # Bounded searches find the same terms as the context slice would
+            weight = self._apply_context_adjustments(
+                self._base_weights[(category, keyword)],
+                any(value.find(term, start, end) != -1 for term in CONTEXT_BOOST_TERMS),
+                any(value.find(term, start, end) != -1 for term in CONTEXT_PENALTY_TERMS)
+            )
+            if field_aware:
+                weight *= self.field_multipliers.get(field, 1.0)
+            
+            category_scores[category] += weight
+            if category == MatchCategory.EXCLUSION:
+                exclusion_flags.append(keyword)
+        
+        total_score = sum(
+            category_scores[category] * self.category_weights[category]
+            for category in MatchCategory
+        )
+        
+        return {
+            'relevance_score': round(total_score, 2),
+            'is_relevant': total_score >= self.relevance_threshold,
+            'category_scores': {cat.value: round(score, 2) for cat, score in category_scores.items()},
+            'priority_level': self._calculate_priority_level(total_score),
+            'exclusion_flags': exclusion_flags
+        }
+    
+    def _iter_text_hits(self, text: str):
+        """Yield hits in already lowercased text in the same shape as _iter_field_hits."""
+        keyword_hits = self._scan_keyword_hits(text)
+        for category, entries in self._keyword_entries.items():
+            for entry, variants in entries:
+                for match_start, match_end in keyword_hits.get(entry, ()):
+                    keyword = self._reported_keyword(variants, text, match_start, match_end)
+                    yield category, keyword, 'text', text, max(0, match_start - 50), min(len(text), match_end + 50)
+    
     def _create_keyword_pattern(self, keyword: str) -> str:
         """Create flexible regex pattern for keyword matching."""
         # Handle multi-word keywords
@@ -259,28 +666,29 @@ class PeruGrantKeywordMatcher:
     
     def _calculate_match_weight(self, keyword: str, context: str, category: MatchCategory) -> float:
         """Calculate weight for a keyword match based on various factors."""
-        base_weight = 1.0
-        
-        # Boost weight for key geographic terms
-        if category == MatchCategory.GEOGRAPHIC:
-            if keyword.lower() in ['peru', 'perú', 'peruvian']:
-                base_weight = 2.0
-            elif 'andean' in keyword.lower() or 'andes' in keyword.lower():
-                base_weight = 1.5
-                
-        # Boost weight for high-priority terms
-        if category == MatchCategory.PRIORITY:
-            if 'peru eligibility' in keyword.lower():
-                base_weight = 2.0
-            elif 'rural focus' in keyword.lower():
-                base_weight = 1.5
-        
-        # Context-based adjustments
         context_lower = context.lower()
-        if 'eligible' in context_lower or 'application' in context_lower:
+        base_weight = self._base_weights.get((category, keyword))
+        if base_weight is None:
+            base_weight = self._calculate_base_weight(keyword, category)
+        
+        return self._apply_context_adjustments(
+            base_weight,
+            any(term in context_lower for term in CONTEXT_BOOST_TERMS),
+            any(term in context_lower for term in CONTEXT_PENALTY_TERMS)
+        )
+    
+    def _calculate_base_weight(self, keyword: str, category: MatchCategory) -> float:
+        """Calculate the context-independent weight of a keyword."""
+        # Boosts for key geographic and priority terms are set per keyword in
+        # the keyword database; other keywords weigh 1.0
+        return self.keyword_weights.get(category, {}).get(keyword, 1.0)
+    
+    def _apply_context_adjustments(self, base_weight: float, boosted: bool, penalized: bool) -> float:
+        """Adjust a base weight for eligibility wording around the match."""
+        if boosted:
             base_weight *= 1.2
         
-        if 'not eligible' in context_lower or 'excluding' in context_lower:
+        if penalized:
             base_weight *= 0.5
             
         return base_weight
@@ -332,33 +740,248 @@ class PeruGrantKeywordMatcher:
             'exclusion_flags': []
         }
     
+    def _create_score_result(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a full analysis to the fields returned by score_grant_text."""
+        return {
+            'relevance_score': analysis['relevance_score'],
+            'is_relevant': analysis['is_relevant'],
+            'category_scores': analysis['category_scores'],
+            'priority_level': analysis['priority_level'],
+            'exclusion_flags': analysis['exclusion_flags']
+        }
+    
     def _match_to_dict(self, match: KeywordMatch) -> Dict[str, Any]:
         """Convert KeywordMatch to dictionary."""
-        return {
+        match_dict = {
             'keyword': match.keyword,
             'category': match.category.value,
             'weight': round(match.weight, 2),
             'context': match.context[:100] + "..." if len(match.context) > 100 else match.context
         }
+        if match.field:
+            match_dict['field'] = match.field
+        return match_dict
+    
+    def batch_analyze_grants(self, grants: List[Dict[str, str]], vectorized: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyze multiple grants and return ranked results.
+        
+        With vectorized=True (requires numpy and scipy) the corpus is scored with
+        sparse matrix operations and match contexts are only built for relevant
+        grants; other grants get their matches with an empty context. Scores
+        agree with analyze_grant_text up to floating point summation order.
+        Field-aware matchers always take the per-grant path.
+        """
+        results = self._analyze_grants_in_order(grants, vectorized)
+        
+        # Sort by relevance score (highest first)
+        results.sort(key=lambda x: x['relevance_score'], reverse=True)
+        
+        return results
     
-    def batch_analyze_grants(self, grants: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        """Analyze multiple grants and return ranked results."""
+    def parallel_analyze_grants(self, grants: List[Dict[str, str]], max_workers: Optional[int] = None,
+                                chunk_size: int = 250, vectorized: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyze grants across a process pool and return ranked results.
+        
+        Grants are sent to the workers in chunks of chunk_size. Each worker
+        builds its own matcher once, with this matcher's keywords, weights and
+        threshold. Chunks come back in input order, so the ranking is the same
+        as batch_analyze_grants, ties included.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(grants) <= chunk_size:
+            return self.batch_analyze_grants(grants, vectorized)
+        
+        chunks = [grants[i:i + chunk_size] for i in range(0, len(grants), chunk_size)]
+        worker_config = (self.keywords, self.category_weights, self.relevance_threshold,
+                         self.field_aware, self.field_multipliers, self.fold_accents, self.keyword_weights)
+        
         results = []
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                 initializer=_init_worker_matcher,
+                                 initargs=worker_config) as executor:
+            for chunk, analyses in zip(chunks, executor.map(_analyze_chunk, chunks, [vectorized] * len(chunks))):
+                # Workers leave out the grants to avoid pickling them back
+                for grant, analysis in zip(chunk, analyses):
+                    analysis['original_grant'] = grant
+                    results.append(analysis)
+        
+        # Sort by relevance score (highest first)
+        results.sort(key=lambda x: x['relevance_score'], reverse=True)
+        
+        return results
+    
+    def iter_analyze_grants(self, grants: Iterable[Dict[str, Any]], score_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze grants one at a time from any iterable, yielding in input order.
+        
+        Nothing is held beyond the grant being analyzed, so the grants can come
+        from a generator such as iter_jsonl_grants. With score_only=True each
+        result is the score_grant_text result instead of the full analysis.
+        Every result carries its grant under 'original_grant'.
+        """
+        analyze = self.score_grant_text if score_only else self.analyze_grant_text
         
         for grant in grants:
             title = grant.get('title', '')
             description = grant.get('description', '')
             full_text = grant.get('full_text', f"{title} {description}")
             
-            analysis = self.analyze_grant_text(full_text, title, description)
+            analysis = analyze(full_text, title, description)
             analysis['original_grant'] = grant
-            results.append(analysis)
+            yield analysis
+    
+    def top_k_grants(self, grants: Iterable[Dict[str, Any]], k: int = 10, score_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Rank a stream of grants and return the k most relevant.
         
-        # Sort by relevance score (highest first)
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
+        Grants are scored without match details and only the k best are kept,
+        so memory is O(k) and time O(n log k) whatever the stream length. The
+        full analyses are then built for the winners alone (unless score_only).
+        The result equals batch_analyze_grants(grants)[:k], ties included.
+        """
+        collector = TopKCollector(k)
+        for scored in self.iter_analyze_grants(grants, score_only=True):
+            collector.add(scored['relevance_score'], scored)
+        
+        if score_only:
+            return collector.results()
+        
+        return list(self.iter_analyze_grants([scored['original_grant'] for scored in collector.results()]))
+    
+    def _analyze_grants_in_order(self, grants: List[Dict[str, str]], vectorized: bool = False) -> List[Dict[str, Any]]:
+        """Analyze grants without ranking them, keeping input order."""
+        if vectorized and np is not None and not self.field_aware:
+            return self._batch_analyze_vectorized(grants)
+        
+        return list(self.iter_analyze_grants(grants))
+    
+    def _batch_analyze_vectorized(self, grants: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Score a corpus through a sparse grant x keyword weight matrix."""
+        categories = list(MatchCategory)
+        slots = [(category, entry, variants) for category, entries in self._keyword_entries.items()
+                 for entry, variants in entries]
+        slot_categories = [categories.index(category) for category, _, _ in slots]
+        keyword_slots = {}
+        for slot, (_, entry, _) in enumerate(slots):
+            keyword_slots.setdefault(entry, []).append(slot)
+        
+        # Keyword slot -> category indicator, and category weight vector
+        category_matrix = sparse.csr_matrix(
+            (np.ones(len(slots)), (np.arange(len(slots)), slot_categories)),
+            shape=(len(slots), len(categories))
+        )
+        category_weight_vector = np.array([self.category_weights[category] for category in categories])
+        
+        # Tokenize the corpus once, keeping match spans for the detail pass
+        texts = []
+        grant_matches = []
+        rows, cols, weights = [], [], []
+        
+        for row, grant in enumerate(grants):
+            title = grant.get('title', '')
+            description = grant.get('description', '')
+            full_text = grant.get('full_text', f"{title} {description}")
+            
+            if not full_text:
+                texts.append(None)
+                grant_matches.append([])
+                continue
+            
+            weighted_text = f"{title} {title} {description} {description} {full_text}".lower()
+            keyword_hits = self._scan_keyword_hits(weighted_text)
+            term_positions = self._find_context_term_positions(weighted_text)
+            
+            matches = []
+            for entry, spans in keyword_hits.items():
+                for slot in keyword_slots[entry]:
+                    category, _, variants = slots[slot]
+                    for match_start, match_end in spans:
+                        keyword = self._reported_keyword(variants, weighted_text, match_start, match_end)
+                        
+                        # Context weighting from term positions, without slicing
+                        start = max(0, match_start - 50)
+                        end = min(len(weighted_text), match_end + 50)
+                        weight = self._apply_context_adjustments(
+                            self._base_weights[(category, keyword)],
+                            self._window_contains_term(term_positions, CONTEXT_BOOST_TERMS, start, end),
+                            self._window_contains_term(term_positions, CONTEXT_PENALTY_TERMS, start, end)
+                        )
+                        matches.append((slot, start, end, weight, keyword))
+                        rows.append(row)
+                        cols.append(slot)
+                        weights.append(weight)
+            
+            # Same order as the per-grant scan: category, keyword, position
+            matches.sort()
+            texts.append(weighted_text)
+            grant_matches.append(matches)
+        
+        # Duplicate (grant, keyword) entries are summed into one weight
+        weight_matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(len(grants), len(slots)))
+        category_scores = np.asarray((weight_matrix @ category_matrix).todense())
+        total_scores = category_scores @ category_weight_vector
+        relevant = total_scores >= self.relevance_threshold
+        priority_levels = np.select(
+            [total_scores >= 6.0, total_scores >= 4.5, total_scores >= 3.0, total_scores >= 1.5],
+            ["CRITICAL", "HIGH", "MEDIUM", "LOW"],
+            default="MINIMAL"
+        )
+        
+        results = []
+        for row, grant in enumerate(grants):
+            if texts[row] is None:
+                analysis = self._create_empty_result()
+                analysis['original_grant'] = grant
+                results.append(analysis)
+                continue
+            
+            is_relevant = bool(relevant[row])
+            keyword_matches = []
+            for slot, start, end, weight, keyword in grant_matches[row]:
+                category = slots[slot][0]
+                # Contexts are only worth building for grants someone will review
+                context = texts[row][start:end].strip() if is_relevant else ""
+                keyword_matches.append(KeywordMatch(keyword=keyword, category=category, weight=weight, context=context))
+            
+            total_score = float(total_scores[row])
+            row_scores = {category: float(category_scores[row, index]) for index, category in enumerate(categories)}
+            
+            results.append({
+                'relevance_score': round(total_score, 2),
+                'is_relevant': is_relevant,
+                'category_scores': {cat.value: round(score, 2) for cat, score in row_scores.items()},
+                'matches': [self._match_to_dict(match) for match in keyword_matches],
+                'recommendation': self._generate_recommendation(total_score, row_scores, keyword_matches),
+                'priority_level': str(priority_levels[row]),
+                'exclusion_flags': [match.keyword for match in keyword_matches if match.category == MatchCategory.EXCLUSION],
+                'original_grant': grant
+            })
         
         return results
     
+    def _find_context_term_positions(self, text: str) -> Dict[str, List[int]]:
+        """Find every start offset of the context weighting terms in text."""
+        positions = {}
+        for term in CONTEXT_BOOST_TERMS + CONTEXT_PENALTY_TERMS:
+            offsets = []
+            offset = text.find(term)
+            while offset != -1:
+                offsets.append(offset)
+                offset = text.find(term, offset + 1)
+            positions[term] = offsets
+        return positions
+    
+    def _window_contains_term(self, term_positions: Dict[str, List[int]], terms: Tuple[str, ...], start: int, end: int) -> bool:
+        """Check whether any term lies entirely within text[start:end]."""
+        for term in terms:
+            offsets = term_positions[term]
+            index = bisect_left(offsets, start)
+            if index < len(offsets) and offsets[index] + len(term) <= end:
+                return True
+        return False
+    
     def get_keyword_statistics(self) -> Dict[str, int]:
         """Get statistics about loaded keywords."""
         stats = {}
@@ -368,6 +991,35 @@ class PeruGrantKeywordMatcher:
         return stats
 
 
+# Matcher built once per process-pool worker by _init_worker_matcher
+_worker_matcher = None
+
+
+def _init_worker_matcher(keywords: Dict[MatchCategory, List[str]], category_weights: Dict[MatchCategory, float],
+                         relevance_threshold: float, field_aware: bool = False,
+                         field_multipliers: Optional[Dict[str, float]] = None, fold_accents: bool = True,
+                         keyword_weights: Optional[Dict[MatchCategory, Dict[str, float]]] = None):
+    """Build the compiled matcher state once in a pool worker."""
+    global _worker_matcher
+    _worker_matcher = PeruGrantKeywordMatcher(field_aware=field_aware, fold_accents=fold_accents)
+    _worker_matcher.keywords = keywords
+    _worker_matcher.category_weights = category_weights
+    _worker_matcher.relevance_threshold = relevance_threshold
+    if keyword_weights is not None:
+        _worker_matcher.keyword_weights = keyword_weights
+    if field_multipliers is not None:
+        _worker_matcher.field_multipliers = field_multipliers
+    _worker_matcher._compile_keyword_engine()
+
+
+def _analyze_chunk(grants: List[Dict[str, str]], vectorized: bool) -> List[Dict[str, Any]]:
+    """Analyze one chunk of grants in a pool worker, in input order."""
+    analyses = _worker_matcher._analyze_grants_in_order(grants, vectorized)
+    for analysis in analyses:
+        analysis.pop('original_grant', None)
+    return analyses
+
+
 def test_keyword_matcher():
     """Test the keyword matcher with sample grant data."""
     matcher = PeruGrantKeywordMatcher()
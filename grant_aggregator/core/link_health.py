@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# Statuses of a working link: 403 is normal for some protected pages
+ACCEPTED_STATUSES = (200, 301, 302, 403)
+
+
+@dataclass
+class LinkCheck:
+    """Outcome of checking one link"""
+    url: str
+    ok: bool
+    status: Optional[int] = None  # None: no response (timeout, DNS, TLS, ...)
+    final_url: str = ""  # after redirects
+    latency: float = 0.0  # seconds the check took, waiting for the host included
+    checked_at: float = 0.0  # Unix time
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """How long a check of a link is trusted before the link is checked again"""
+    ok_ttl: float = 24 * 3600
+    failure_ttl: float = 3600  # broken links may come back sooner than working ones break
+    error_ttl: float = 0  # no response at all: usually transient, so checked again every time
+
+    def is_fresh(self, check: LinkCheck, now: Optional[float] = None) -> bool:
+        """Whether a check is recent enough to be reused"""
+        if check.ok:
+            ttl = self.ok_ttl
+        else:
+            ttl = self.failure_ttl if check.status is not None else self.error_ttl
+        return (now or time.time()) - check.checked_at < ttl
+
+
+class LinkHealthStore:
+    """
+    Last check of every link (status, final URL, latency, time), kept in a
+    SQLite file that the scrapers and seed scripts share.
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            "url TEXT PRIMARY KEY, ok INTEGER NOT NULL, status INTEGER, final_url TEXT NOT NULL, "
+            "latency REAL NOT NULL, checked_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[LinkCheck]:
+        """The last check of a link, however old, or None"""
+        row = self._connection.execute(
+            "SELECT ok, status, final_url, latency, checked_at FROM links WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return LinkCheck(url, bool(row[0]), row[1], row[2], row[3], row[4])
+
+    def record(self, check: LinkCheck):
+        """Remember a check in place of the link's previous one"""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO links (url, ok, status, final_url, latency, checked_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (check.url, int(check.ok), check.status, check.final_url, check.latency, check.checked_at or time.time())
+        )
+        self._connection.commit()
+
+    def close(self):
+        """Close the store"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class LinkHealthService:
+    """
+    Checks whether links work, remembering every answer in a LinkHealthStore.
+
+    A link checked within the freshness policy is not requested again, within a
+    run (the same link under several searches) or across runs. Distinct links
+    are checked concurrently through the given HttpClient, whose rate limiter
+    paces every host and whose retries cover transient failures. Links are
+    checked with HEAD; a host answering HEAD with 405 or 501 is asked with GET
+    from then on.
+    """
+
+    def __init__(self, store: LinkHealthStore, http_client: Any, freshness: Optional[FreshnessPolicy] = None,
+                 concurrency: int = 8, accepted_statuses: Iterable[int] = ACCEPTED_STATUSES,
+                 headers: Optional[Dict[str, str]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.http_client = http_client
+        self.freshness = freshness or FreshnessPolicy()
+        self.accepted_statuses = frozenset(accepted_statuses)
+        self.headers = headers or {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._head_rejecting_hosts = set()
+
+        self.stats = {
+            'fresh': 0,
+            'checked': 0,
+            'broken': 0
+        }
+
+    async def check(self, url: str, force: bool = False) -> LinkCheck:
+        """Whether a link works, from a fresh stored check unless forced to ask the host"""
+        if not url or not url.startswith('http'):
+            return LinkCheck(url, False, checked_at=time.time())
+
+        if not force:
+            check = self.store.get(url)
+            if check is not None:
+                # Judged by this service's accepted statuses, not those of the service that stored it
+                check.ok = check.status in self.accepted_statuses
+            if check is not None and self.freshness.is_fresh(check):
+                self.stats['fresh'] += 1
+                return check
+
+        async with self._semaphore:
+            check = await self._request(url)
+        self.store.record(check)
+        self.stats['checked'] += 1
+        if not check.ok:
+            self.stats['broken'] += 1
+        return check
+
+    async def check_many(self, urls: Iterable[str], force: bool = False) -> Dict[str, LinkCheck]:
+        """Check links concurrently, each distinct one once"""
+        links = list(dict.fromkeys(urls))
+        checks = await asyncio.gather(*(self.check(url, force) for url in links))
+        return dict(zip(links, checks))
+
+    async def revalidate_table(self, table: Any, link_field: str = 'Application Link',
+                               force: bool = False) -> List[Tuple[Dict[str, Any], Optional[LinkCheck]]]:
+        """
+        Check the links of every record of an Airtable table (anything with
+        get_all()), as (record, check) pairs; the check is None for records
+        without a link. Links checked within the freshness policy are not asked
+        again unless forced.
+        """
+        records = await asyncio.to_thread(table.get_all)
+        links = [record.get('fields', {}).get(link_field) for record in records]
+        checks = await self.check_many((url for url in links if url), force)
+        results = [(record, checks[url] if url else None) for record, url in zip(records, links)]
+
+        broken = sum(1 for _, check in results if check is not None and not check.ok)
+        self.logger.info(f"🔗 Revalidated {len(results)} records of {getattr(table, 'table_name', 'the table')}: "
+                         f"{broken} broken links, {self.stats}")
+        return results
+
+    async def _request(self, url: str) -> LinkCheck:
+        """Ask the host for a link (HEAD, or GET where HEAD is rejected)"""
+        host = urlparse(url).hostname
+        started = time.monotonic()
+        try:
+            if host not in self._head_rejecting_hosts:
+                response = await self.http_client.head(url, headers=self.headers, allow_redirects=True)
+                if response.status in (405, 501):
+                    self._head_rejecting_hosts.add(host)
+            if host in self._head_rejecting_hosts:
+                response = await self.http_client.get(url, headers=self.headers, allow_redirects=True)
+        except Exception as e:
+            self.logger.debug(f"Link check failed for {url}: {str(e)}")
+            return LinkCheck(url, False, None, "", time.monotonic() - started, time.time())
+
+        return LinkCheck(url, response.status in self.accepted_statuses, response.status, response.url,
+                         time.monotonic() - started, time.time())
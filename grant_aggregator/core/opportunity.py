@@ -0,0 +1,90 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+
+def _intern(value: Any) -> Any:
+    """Shared copy of a string value; None (a null in extracted data) becomes the empty default"""
+    if value is None:
+        return ""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Opportunity:
+    """
+    Funding opportunity, as emitted by every scraper.
+
+    Slots instead of a per-record __dict__ keep large runs small and attribute
+    access fast. Values repeated across many records (organization, source,
+    sector, status, ...) are interned, so all records share one copy of each.
+    Fields a source does not have stay at their empty defaults.
+    """
+    title: str
+    organization: str = ""
+    description: str = ""
+    funding_amount: str = ""
+    deadline: Optional[str] = None
+    announcement_date: Optional[str] = None
+    geographic_focus: str = ""
+    sector: str = ""
+    eligibility_criteria: str = ""
+    status: str = ""
+    application_link: str = ""
+    source_url: str = ""
+    source: str = ""
+    program_type: str = ""  # National Program, Trust Fund, SGP, Federal Grant, etc.
+    implementation_period: str = ""
+    ministry: str = ""  # Peru Government
+    agency: str = ""  # Grants.gov
+    opportunity_number: str = ""  # Grants.gov
+    cfda_number: str = ""  # Grants.gov
+    project_id: str = ""  # World Bank
+    implementing_agency: str = ""  # World Bank
+    target_beneficiaries: str = ""  # World Bank
+    contact_info: str = ""
+    relevance_score: float = 0.0
+    keyword_matches: List[str] = field(default_factory=list)
+    priority_level: str = "LOW"
+
+    def __post_init__(self):
+        self.organization = _intern(self.organization)
+        self.geographic_focus = _intern(self.geographic_focus)
+        self.sector = _intern(self.sector)
+        self.status = _intern(self.status)
+        self.source = _intern(self.source)
+        self.program_type = _intern(self.program_type)
+        self.priority_level = _intern(self.priority_level)
+        if self.keyword_matches is None:
+            self.keyword_matches = []
+
+    def to_airtable_record(self) -> Dict[str, Any]:
+        """Airtable record of the opportunity (values are shared, not copied)"""
+        return {
+            'Grant Name': self.title,
+            'Organization': [self.organization or 'Unknown'],
+            'Description': self.description[:2000],
+            'Amount': self.funding_amount,
+            'Deadline': self.deadline,
+            'Category': [self.sector] if self.sector else [],
+            'Keywords': self.keyword_matches[:10],
+            'Eligibility': self.eligibility_criteria,
+            'Application Link': self.application_link,
+            'Contact Email': self.contact_info,
+            'Status': self.status,
+            'Priority': self.priority_level,
+            'Notes': f"Source: {self.source or 'Unknown'}. Relevance Score: {self.relevance_score}. Auto-scraped via Orchestrator.",
+            'Source': self.source or 'Unknown'
+        }
+
+    def to_report_dict(self) -> Dict[str, Any]:
+        """Summary of the opportunity for scraping reports"""
+        return {
+            'title': self.title,
+            'source': self.source,
+            'funding_amount': self.funding_amount,
+            'relevance_score': self.relevance_score,
+            'priority_level': self.priority_level,
+            'geographic_focus': self.geographic_focus,
+            'application_link': self.application_link
+        }
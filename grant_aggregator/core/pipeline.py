@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Any, AsyncIterable, Callable, Awaitable, Iterable, Optional, Union
+
+
+# Tells a stage worker that its upstream stage has finished
+_END_OF_STREAM = object()
+
+
+@dataclass
+class PipelineStage:
+    """
+    One stage of a StagedPipeline.
+
+    handler is awaited once per item and returns the items to pass to the next
+    stage (an empty list or None drops the item). Items reach the stage through
+    a queue of at most queue_size entries, so a slow stage makes the stages
+    before it wait instead of buffering everything in memory.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Iterable[Any]]]]
+    workers: int = 1
+    queue_size: int = 100
+
+
+class StagedPipeline:
+    """
+    Runs items through a chain of stages connected by bounded asyncio queues.
+    Every stage runs its own workers, so an item moves downstream as soon as
+    it has been handled instead of waiting for the rest of its batch.
+    """
+
+    def __init__(self, stages: List[PipelineStage], logger: Optional[logging.Logger] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {stage.name: {'received': 0, 'emitted': 0, 'errors': 0} for stage in stages}
+        self.errors = []
+
+    async def run(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> Dict[str, Dict[str, int]]:
+        """
+        Feed items into the first stage and wait until every stage has drained.
+        items may also be an async iterable, for items that become available over time.
+        """
+        queues = [asyncio.Queue(maxsize=max(1, stage.queue_size)) for stage in self.stages]
+
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(self._feed(items, queues[0]), name="pipeline feed")
+            for index, stage in enumerate(self.stages):
+                if index + 1 < len(self.stages):
+                    downstream, downstream_workers = queues[index + 1], self._worker_count(self.stages[index + 1])
+                else:
+                    downstream, downstream_workers = None, 0
+                task_group.create_task(
+                    self._run_stage(stage, queues[index], downstream, downstream_workers),
+                    name=f"pipeline {stage.name}"
+                )
+
+        return self.stats
+
+    async def _feed(self, items: Union[Iterable[Any], AsyncIterable[Any]], queue: asyncio.Queue):
+        """Put the input items on the first queue, waiting whenever it is full"""
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                await queue.put(item)
+        else:
+            for item in items:
+                await queue.put(item)
+        for _ in range(self._worker_count(self.stages[0])):
+            await queue.put(_END_OF_STREAM)
+
+    async def _run_stage(self, stage: PipelineStage, queue: asyncio.Queue,
+                         downstream: Optional[asyncio.Queue], downstream_workers: int):
+        """Run the workers of a stage, then tell the next stage no more items are coming"""
+        async with asyncio.TaskGroup() as task_group:
+            for worker in range(self._worker_count(stage)):
+                task_group.create_task(
+                    self._run_worker(stage, queue, downstream),
+                    name=f"pipeline {stage.name} worker {worker + 1}"
+                )
+
+        for _ in range(downstream_workers):
+            await downstream.put(_END_OF_STREAM)
+
+    async def _run_worker(self, stage: PipelineStage, queue: asyncio.Queue, downstream: Optional[asyncio.Queue]):
+        """Handle items until the end of the stream"""
+        stats = self.stats[stage.name]
+
+        while True:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                return
+
+            stats['received'] += 1
+            try:
+                results = await stage.handler(item)
+            except Exception as e:
+                # One bad item must not stop the rest of the stream
+                stats['errors'] += 1
+                error_msg = f"Pipeline stage {stage.name} failed: {str(e)}"
+                self.errors.append(error_msg)
+                self.logger.error(f"❌ {error_msg}")
+                continue
+
+            for result in results or ():
+                stats['emitted'] += 1
+                if downstream is not None:
+                    await downstream.put(result)
+
+    @staticmethod
+    def _worker_count(stage: PipelineStage) -> int:
+        """Number of workers of a stage (at least one)"""
+        return max(1, stage.workers)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Dict, Any, AsyncIterator, Optional
+from urllib.parse import urlparse
+
+
+# Statuses telling a client to slow down
+THROTTLING_STATUSES = {429, 503}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Politeness settings of a host"""
+    delay: float = 1.0  # seconds between requests to start with
+    min_delay: float = 0.25
+    max_delay: float = 60.0
+    burst: int = 1  # requests that may start back to back after the host was idle
+    target_concurrency: float = 1.0  # requests the delay aims to keep in flight (latency / delay)
+
+
+class _HostState:
+    """Token bucket and adapted delay of one host"""
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.delay = max(limit.delay, limit.min_delay)
+        self.floor = limit.min_delay  # raised by robots.txt
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+
+def host_of(url_or_host: str) -> str:
+    """Host of a URL (a bare host is returned as is)"""
+    if '//' not in url_or_host:
+        return url_or_host
+    return urlparse(url_or_host).hostname or url_or_host
+
+
+class RateLimiter:
+    """
+    Per-host token buckets whose rate follows the host, in the spirit of
+    Scrapy's AutoThrottle.
+
+    Every host starts at its configured delay. Each response moves the delay
+    halfway towards latency / target_concurrency, so fast hosts are asked more
+    often and slow ones less; errors never shorten it, and throttling statuses
+    (429, 503) double it. A Retry-After holds the host back for as long as it
+    asks, and a robots.txt Crawl-delay is the shortest delay the host gets.
+    Hosts are independent: waiting for one never delays requests to another.
+    """
+
+    def __init__(self, default: Optional[RateLimit] = None):
+        self.logger = logging.getLogger(__name__)
+        self.default = default or RateLimit()
+        self._limits = {}
+        self._hosts = {}
+
+        self.stats = {
+            'waits': 0,
+            'seconds_waited': 0.0,
+            'throttled': 0
+        }
+
+    def configure(self, url_or_host: str, limit: RateLimit):
+        """Set the politeness of a host (before its first request)"""
+        host = host_of(url_or_host)
+        self._limits[host] = limit
+        self._hosts.pop(host, None)
+
+    def set_crawl_delay(self, url_or_host: str, seconds: float):
+        """Never ask a host more often than its robots.txt allows"""
+        state = self._state(url_or_host)
+        state.floor = max(state.limit.min_delay, seconds)
+        state.delay = max(state.delay, state.floor)
+
+    def delay(self, url_or_host: str) -> float:
+        """Current delay between requests to a host"""
+        return self._state(url_or_host).delay
+
+    def block(self, url_or_host: str, seconds: float):
+        """Hold all requests to a host back for a while (Retry-After)"""
+        state = self._state(url_or_host)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + seconds)
+
+    async def wait(self, url_or_host: str):
+        """Wait until a request to the host may start"""
+        state = self._state(url_or_host)
+        async with state.lock:  # Waiters of a host go in turn
+            waited = 0.0
+            while True:
+                now = time.monotonic()
+                if state.delay > 0:
+                    state.tokens = min(state.limit.burst, state.tokens + (now - state.updated) / state.delay)
+                else:  # No delay at all (min_delay 0): the host is not paced
+                    state.tokens = max(state.tokens, 1.0)
+                state.updated = now
+                pause = max(0.0, state.blocked_until - now)
+                if pause == 0 and state.tokens >= 1:
+                    state.tokens -= 1
+                    break
+                pause = pause or (1 - state.tokens) * state.delay
+                waited += pause
+                await asyncio.sleep(pause)
+
+        if waited:
+            self.stats['waits'] += 1
+            self.stats['seconds_waited'] += waited
+
+    def feedback(self, url_or_host: str, latency: float, status: Optional[int] = None,
+                 retry_after: Optional[float] = None, error: bool = False):
+        """Adapt a host's delay to how a request went (status None with error=True: no response)"""
+        state = self._state(url_or_host)
+        limit = state.limit
+        if status in THROTTLING_STATUSES:
+            self.stats['throttled'] += 1
+            delay = state.delay * 2
+        else:
+            delay = (state.delay + latency / limit.target_concurrency) / 2
+            if error or (status is not None and status >= 400):
+                delay = max(delay, state.delay)
+        state.delay = min(limit.max_delay, max(state.floor, delay))
+
+        if retry_after is not None:
+            self.block(url_or_host, retry_after)
+
+    @asynccontextmanager
+    async def throttle(self, url_or_host: str) -> AsyncIterator[None]:
+        """Wait for the host, then time the enclosed request for its feedback"""
+        await self.wait(url_or_host)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.feedback(url_or_host, time.monotonic() - started, error=True)
+            raise
+        self.feedback(url_or_host, time.monotonic() - started)
+
+    def delays(self) -> Dict[str, Any]:
+        """Current delay of every host seen, for logs and reports"""
+        return {host: round(state.delay, 3) for host, state in self._hosts.items()}
+
+    def _state(self, url_or_host: str) -> _HostState:
+        host = host_of(url_or_host)
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self._limits.get(host, self.default))
+        return self._hosts[host]
+
+
+def source_limit(delay: float, overrides: Optional[Dict[str, Any]] = None) -> RateLimit:
+    """Rate limit of a source: its scraper's delay to start with, then any configured overrides"""
+    limit = RateLimit(delay=delay, max_delay=max(RateLimit.max_delay, delay))
+    return replace(limit, **(overrides or {}))
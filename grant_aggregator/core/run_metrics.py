@@ -0,0 +1,222 @@
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+
+# Latency bucket bounds in seconds, from a cached score to a slow page download
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class LatencyHistogram:
+    """Latency distribution in fixed buckets, as Prometheus histograms keep it"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the percentile (the maximum for the +Inf bucket)"""
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return 0.0
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, observations up to le) for every bucket, ending with +Inf"""
+        bounds = [f"{bound:g}" for bound in self.buckets] + ['+Inf']
+        result, seen = [], 0
+        for bound, count in zip(bounds, self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary and cumulative buckets, for the JSON report"""
+        return {
+            'count': self.count,
+            'seconds': round(self.sum, 4),
+            'mean': round(self.sum / self.count, 4) if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': round(self.max, 4),
+            'buckets': dict(self.cumulative())
+        }
+
+
+class RunMetrics:
+    """
+    Where the time of a scraping run went.
+
+    Stage durations (fetch, parse, score, dedup, sink, ...) are kept as latency
+    histograms per stage and per source, and as totals per page. HTTP requests
+    and downloaded bytes are counted per source and page: the request layer
+    reports them against the page set with page(), so concurrent fetches of
+    different pages are told apart.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.source_stages = {}
+        self.sources = {}
+        self.pages = {}
+        self.gauges = {}
+        self._current_page: ContextVar[Optional[Tuple[str, str]]] = ContextVar('current_page', default=None)
+
+    @contextmanager
+    def timer(self, stage: str, source: str, page: Optional[str] = None) -> Iterator[None]:
+        """Time the enclosed block as one observation of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, source, time.perf_counter() - started, page)
+
+    def observe(self, stage: str, source: str, seconds: float, page: Optional[str] = None):
+        """Record one duration of a stage for a source (and page)"""
+        if stage not in self.stages:
+            self.stages[stage] = LatencyHistogram()
+        self.stages[stage].observe(seconds)
+
+        if (source, stage) not in self.source_stages:
+            self.source_stages[(source, stage)] = LatencyHistogram()
+        self.source_stages[(source, stage)].observe(seconds)
+
+        if page is not None:
+            totals = self.page_totals(source, page)
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def page(self, source: str, page: str) -> Iterator[None]:
+        """Attribute the requests made inside the block to a page"""
+        token = self._current_page.set((source, page))
+        try:
+            yield
+        finally:
+            self._current_page.reset(token)
+
+    def count_request(self, size: int):
+        """Count one HTTP request of the current page and the bytes it downloaded"""
+        current = self._current_page.get()
+        if current is not None:
+            self.count_requests(current[0], current[1], 1, size)
+
+    def count_requests(self, source: str, page: str, requests: int, size: int):
+        """Count requests (and their downloaded bytes) of a page"""
+        source_totals = self._source_totals(source)
+        source_totals['requests'] += requests
+        source_totals['bytes'] += size
+
+        page_totals = self.page_totals(source, page)
+        page_totals['requests'] = page_totals.get('requests', 0) + requests
+        page_totals['bytes'] = page_totals.get('bytes', 0) + size
+
+    def add_page(self, source: str, page: str, totals: Dict[str, Any]):
+        """Take over the page totals measured elsewhere (by a crawl worker), one observation per stage"""
+        for name, value in totals.items():
+            if name not in ('requests', 'bytes'):
+                self.observe(name, source, value, page)
+        self.count_requests(source, page, totals.get('requests', 0), totals.get('bytes', 0))
+
+    def source_done(self, source: str, wall_time: float):
+        """Record how long after the start of the run a source's last page was done"""
+        self._source_totals(source)['wall_time'] = round(wall_time, 4)
+
+    def set_gauge(self, name: str, value: float):
+        """Record a run-level value (run time, opportunity counts, ...)"""
+        self.gauges[name] = value
+
+    def page_totals(self, source: str, page: str) -> Dict[str, Any]:
+        """Seconds per stage, requests and bytes of one page"""
+        if (source, page) not in self.pages:
+            self.pages[(source, page)] = {}
+        return self.pages[(source, page)]
+
+    def _source_totals(self, source: str) -> Dict[str, Any]:
+        if source not in self.sources:
+            self.sources[source] = {'wall_time': None, 'requests': 0, 'bytes': 0}
+        return self.sources[source]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """All metrics, for the JSON report"""
+        sources = {}
+        for source in sorted({source for source, _ in self.source_stages} | set(self.sources)):
+            sources[source] = {
+                **self._source_totals(source),
+                'stages': {
+                    stage: histogram.to_dict()
+                    for (stage_source, stage), histogram in self.source_stages.items() if stage_source == source
+                }
+            }
+
+        return {
+            'run': dict(self.gauges),
+            'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+            'sources': sources,
+            'pages': [
+                {'source': source, 'page': page,
+                 **{name: round(value, 4) if isinstance(value, float) else value for name, value in totals.items()}}
+                for (source, page), totals in self.pages.items()
+            ]
+        }
+
+    def to_prometheus(self, prefix: str = 'grant_scraper') -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per pipeline stage and source.",
+            f"# TYPE {prefix}_stage_seconds histogram"
+        ]
+        for (source, stage), histogram in sorted(self.source_stages.items()):
+            labels = f'stage="{_escape_label(stage)}",source="{_escape_label(source)}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {histogram.count}")
+
+        for name, metric_type, help_text, key in [
+            ('requests_total', 'counter', 'HTTP requests per source.', 'requests'),
+            ('downloaded_bytes_total', 'counter', 'Bytes downloaded per source.', 'bytes'),
+            ('source_wall_seconds', 'gauge', 'Seconds from the start of the run until the source was done.',
+             'wall_time')
+        ]:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for source, totals in sorted(self.sources.items()):
+                if totals[key] is not None:
+                    lines.append(f'{prefix}_{name}{{source="{_escape_label(source)}"}} {totals[key]}')
+
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, prefix: str = 'grant_scraper'):
+        """Write the metrics as a Prometheus text file (replaced atomically, for textfile collectors)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(temporary, path)
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
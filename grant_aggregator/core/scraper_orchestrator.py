@@ -1,21 +1,37 @@
 import asyncio
 import json
 import logging
+import multiprocessing
+import time
+from contextlib import AsyncExitStack, nullcontext
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from itertools import zip_longest
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 import sys
 import os
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from keyword_matcher import PeruGrantKeywordMatcher
+from keyword_matcher import PeruGrantKeywordMatcher, TopKCollector
+from opportunity import Opportunity
 from airtable_client import AirtableClient
-from scrapers.idb_scraper import IDBGrantsScraper
-from scrapers.undp_firecrawl_scraper import UNDPFirecrawlScraper  
-from scrapers.worldbank_firecrawl_scraper import WorldBankFirecrawlScraper
-from scrapers.peru_gov_scraper import PeruGovernmentScraper
+from analysis_cache import AnalysisCache
+from checkpoint_store import CheckpointStore, load_record
+from dedup_index import NearDuplicateIndex
+from pipeline import StagedPipeline, PipelineStage
+from rate_limiter import RateLimiter, source_limit
+from run_metrics import RunMetrics
+from scraper_registry import ScraperRegistry
+from work_queue import WorkQueue, SQLiteWorkQueue
+
+
+# Fetch stage result for a page a resumed run completed before; its records come from the checkpoint
+_CHECKPOINTED_PAGE = object()
+
+# Caches, indexes and checkpoints live in grant_aggregator/cache, wherever the run is started from
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
 
 
 @dataclass
@@ -29,6 +45,10 @@ class ScrapingReport:
     top_opportunities: List[Dict[str, Any]]
     keyword_stats: Dict[str, int]
     execution_time: float
+    partial_sources: List[str] = field(default_factory=list)  # sources cut short by a time budget
+    run_id: str = ""  # checkpoint run ID, for --resume
+    startup_times: Dict[str, float] = field(default_factory=dict)  # seconds: orchestrator, then each scraper loaded
+    metrics: Dict[str, Any] = field(default_factory=dict)  # stage latencies, requests and bytes per source and page
 
 
 class GrantScraperOrchestrator:
@@ -38,8 +58,13 @@ class GrantScraperOrchestrator:
     """
     
     def __init__(self, firecrawl_api_key: str = None):
+        started = time.perf_counter()
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
+        # Analyses persist between runs, so unchanged opportunities are not rescored
+        self.analysis_cache = AnalysisCache(
+            db_path=os.path.join(CACHE_DIR, "analysis_cache.sqlite")
+        )
+        self.keyword_matcher = PeruGrantKeywordMatcher(cache=self.analysis_cache)
         self.airtable_client = AirtableClient()
         
         # Configure comprehensive logging
@@ -52,40 +77,111 @@ class GrantScraperOrchestrator:
             ]
         )
         
-        # Initialize scrapers
-        self.scrapers = {
-            'IDB': None,  # Will be initialized in async context
-            'UNDP': UNDPFirecrawlScraper(firecrawl_api_key),
-            'World Bank': WorldBankFirecrawlScraper(firecrawl_api_key),
-            'Peru Government': None  # Will be initialized in async context
-        }
+        # Scrapers are loaded on first use and share the matcher (with its analysis cache) and Airtable client
+        firecrawl_options = {'firecrawl_api_key': firecrawl_api_key} if firecrawl_api_key else {}
+        self.scrapers = ScraperRegistry(
+            keyword_matcher=self.keyword_matcher,
+            sink=self.airtable_client,
+            scraper_options={'UNDP': firecrawl_options, 'World Bank': firecrawl_options}
+        )
         
         # Scraping configuration
         self.config = {
-            'max_concurrent_scrapers': 2,
+            # Workers per pipeline stage (deduplication always runs in a single worker)
+            'pipeline_workers': {
+                'fetch': 4,
+                'parse': 2,
+                'score': 1,
+                'persist': 2
+            },
+            'pipeline_queue_size': 50,  # items buffered between two stages
+            # Request-level retries: attempts per request, backoff base and cap in seconds,
+            # and the retries each host may use per run
             'retry_attempts': 3,
-            'retry_delay': 5,  # seconds
+            'retry_delay': 1,
+            'retry_max_delay': 30,
+            'retries_per_host': 10,
+            # Connection pool shared by the HTTP scrapers: connections in total and per host,
+            # seconds resolved hosts are cached, and connect and read timeouts in seconds
+            'http_pool_size': 100,
+            'http_connections_per_host': 6,
+            'dns_cache_ttl': 300,
+            'connect_timeout': 10,
+            'read_timeout': 30,
+            # Pages are kept with their ETag / Last-Modified and revalidated with conditional
+            # requests; unchanged pages reuse the stored body and extraction (None disables).
+            # Pages validated less than http_cache_stale_while_revalidate seconds ago are used
+            # right away and revalidated in the background, for the next run
+            'http_cache_path': os.path.join(CACHE_DIR, "http_cache.sqlite"),
+            'http_cache_stale_while_revalidate': 0,
+            # Politeness per host: requests start at the source's request delay, which then follows
+            # the host's latency and errors (AutoThrottle style), honoring Retry-After and robots.txt
+            # Crawl-delay. rate_limits overrides RateLimit fields per source, e.g.
+            # {'Peru Government': {'min_delay': 1.0}}
+            'rate_limits': {},
+            'respect_robots_txt': True,
+            # Time budgets in seconds (None or 0 disables one); work over budget is cancelled
+            'run_deadline': 600,
+            'source_time_budget': 300,  # counted from the source's first page
+            'page_time_budget': 60,
             'relevance_threshold': 3.0,
+            # Opportunities kept per source (0: no cap). They are saved as they arrive, so the cap
+            # keeps the first ones over the relevance threshold, not the most relevant ones
             'max_opportunities_per_source': 50,
             'enable_airtable_save': True,
-            'enable_deduplication': True
+            'enable_deduplication': True,
+            # Opportunities saved by earlier runs are remembered here, so they are not saved again
+            'dedup_index_path': os.path.join(CACHE_DIR, "dedup_index.sqlite"),
+            # Completed pages and saved records of every run, for resuming interrupted runs
+            'checkpoint_path': os.path.join(CACHE_DIR, "checkpoints.sqlite"),
+            # Worker mode: with N > 0, N local worker processes fetch, parse and score pages
+            # taken from a durable work queue (workers on other machines may join), and this
+            # process only merges their results
+            'worker_processes': 0,
+            'work_queue_path': os.path.join(CACHE_DIR, "work_queue.sqlite"),
+            'worker_poll_interval': 0.5,
+            # Run metrics always go into the JSON report; with a path they are also written
+            # there in Prometheus text format (e.g. for node_exporter's textfile collector)
+            'metrics_prometheus_path': None
         }
         
+        # Work queue backend of worker mode; None uses a SQLite queue at work_queue_path
+        self.work_queue: Optional[WorkQueue] = None
+        
         self.session_stats = {
             'start_time': None,
             'end_time': None,
             'total_scraped': 0,
             'total_relevant': 0,
+            'total_saved': 0,
+            'first_saved_after': None,  # seconds from start until the first Airtable save
             'errors': [],
             'sources_completed': []
         }
+        
+        # Seconds spent constructing the orchestrator; scraper load times are added as sources are used
+        self.startup_time = round(time.perf_counter() - started, 4)
     
-    async def run_comprehensive_scraping(self, sources: List[str] = None) -> ScrapingReport:
+    async def run_comprehensive_scraping(self, sources: List[str] = None, resume: Optional[str] = None) -> ScrapingReport:
         """
         Run comprehensive grant scraping across all sources with intelligent filtering.
         
+        Pages flow through a fetch → parse → score → dedup → persist pipeline of
+        bounded queues, so each opportunity reaches Airtable as soon as it is found.
+        Fetching stops at the run deadline and at each source's and page's time
+        budget; what was extracted before is kept and the source is reported partial.
+        
+        Progress is checkpointed per page, so a run that was interrupted (or cut
+        short by a time budget) can be resumed without redoing finished work.
+        
+        In worker mode (worker_processes > 0) pages are put on a work queue
+        instead; worker processes fetch, parse and score them, and a collect stage
+        takes their results into the dedup → persist stages of this process.
+        
         Args:
-            sources: List of source names to scrape. If None, scrapes all sources.
+            sources: List of source names to scrape. If None, scrapes all sources
+                (or, when resuming, the sources of the resumed run).
+            resume: ID of an unfinished run to resume, or "latest" for the most recent one.
         
         Returns:
             ScrapingReport with session results
@@ -96,158 +192,436 @@ class GrantScraperOrchestrator:
         self.logger.info("🚀 STARTING COMPREHENSIVE PERU GRANTS SCRAPING")
         self.logger.info("=" * 60)
         
+        checkpoints = CheckpointStore(self.config['checkpoint_path'])
+        resumed_run = checkpoints.find_run(None if resume == 'latest' else resume) if resume else None
+        if resume and resumed_run is None:
+            self.logger.warning(f"⚠️ No unfinished run to resume ({resume}), starting a new one")
+        
         # Initialize sources to scrape
         if sources is None:
-            sources = list(self.scrapers.keys())
+            sources = resumed_run[1] if resumed_run else list(self.scrapers.keys())
+        sources = [source for source in sources if source in self.scrapers]
         
-        all_opportunities = []
         errors = []
+        # Stage latencies, requests and bytes per source and page
+        metrics = RunMetrics()
+        # Paces the requests to every host; hosts never wait for each other
+        rate_limiter = RateLimiter()
+        
+        # HTTP scrapers share one request layer, so connections, DNS lookups, retry budgets
+        # and finished requests span the run
+        session_sources = [source for source in sources if self.scrapers.uses_session(source)]
+        http_client = None
+        http_cache = None
+        if session_sources:
+            from http_client import HttpClient  # aiohttp is only imported when an HTTP scraper runs
+            if self.config['http_cache_path']:
+                from http_cache import HttpCache
+                http_cache = HttpCache(self.config['http_cache_path'])
+            http_client = HttpClient(
+                max_attempts=self.config['retry_attempts'],
+                base_delay=self.config['retry_delay'],
+                max_delay=self.config['retry_max_delay'],
+                retries_per_host=self.config['retries_per_host'],
+                pool_size=self.config['http_pool_size'],
+                connections_per_host=self.config['http_connections_per_host'],
+                dns_cache_ttl=self.config['dns_cache_ttl'],
+                connect_timeout=self.config['connect_timeout'],
+                read_timeout=self.config['read_timeout'],
+                cache=http_cache,
+                stale_while_revalidate=self.config['http_cache_stale_while_revalidate'],
+                limiter=rate_limiter,
+                respect_robots=self.config['respect_robots_txt']
+            )
+            http_client.metrics = metrics
+        
+        # Scrapers with an HTTP session start every run with a fresh one, on the run's client
+        self.scrapers.http_client = http_client
+        for source_name in session_sources:
+            self.scrapers.create(source_name)
+        
+        for source_name in sources:
+            scraper = self.scrapers[source_name]
+            limit = source_limit(scraper.request_delay, self.config['rate_limits'].get(source_name))
+            for url in scraper.target_urls:
+                rate_limiter.configure(url, limit)
+        
+        if resumed_run:
+            run_id = resumed_run[0]
+            completed_pages = checkpoints.completed_pages(run_id)
+            self.logger.info(f"♻️ Resuming run {run_id}: {sum(map(len, completed_pages.values()))} pages already done")
+        else:
+            run_id = checkpoints.start_run(sources)
+            completed_pages = {}
+        pages_by_source = {source: self._source_pages(source) for source in sources}
+        pages_left = {source: len(pages) for source, pages in pages_by_source.items()}
+        kept_by_source = {source: 0 for source in sources}
+        # Only runs that save to Airtable add to the persistent history
+        dedup_index = NearDuplicateIndex(
+            db_path=self.config['dedup_index_path'] if self.config['enable_airtable_save'] else None
+        )
+        top_opportunities = TopKCollector(10)
+        
+        loop = asyncio.get_running_loop()
+        run_deadline = loop.time() + self.config['run_deadline'] if self.config['run_deadline'] else None
+        source_deadlines = {}
+        partial_sources = []
+        
+        def page_deadline(source_name: str) -> Optional[float]:
+            """Loop time a page must be fetched by: the earliest of the run, source and page budgets"""
+            now = loop.time()
+            if source_name not in source_deadlines:
+                source_budget = self.config['source_time_budget']
+                source_deadlines[source_name] = now + source_budget if source_budget else None
+            page_budget = self.config['page_time_budget']
+            deadlines = [run_deadline, source_deadlines[source_name], now + page_budget if page_budget else None]
+            return min((deadline for deadline in deadlines if deadline is not None), default=None)
+        
+        def mark_partial(source_name: str, reason: str):
+            """Record that a source's results are incomplete"""
+            self.logger.warning(f"⏰ {reason}")
+            if source_name not in partial_sources:
+                partial_sources.append(source_name)
+        
+        def page_done(source_name: str):
+            """Count a page of a source as handled, noting when the source is complete"""
+            pages_left[source_name] -= 1
+            if pages_left[source_name] == 0:
+                elapsed = (datetime.now() - start_time).total_seconds()
+                self.logger.info(f"⏱️ {source_name} finished fetching in {elapsed:.1f}s")
+                metrics.source_done(source_name, elapsed)
+                self.session_stats['sources_completed'].append(source_name)
+        
+        async def fetch(item):
+            """Fetch stage: download one page of a source within its time budgets"""
+            source_name, url = item
+            scraper = self.scrapers[source_name]
+            page = url or 'known programs'
+            payload = None
+            
+            if page in completed_pages.get(source_name, ()):
+                # Completed before the run was interrupted: its records come from the checkpoint
+                payload = _CHECKPOINTED_PAGE
+            else:
+                # HTTP scrapers are paced per request by the HTTP client; the others per page, here
+                paced = url is not None and not self.scrapers.uses_session(source_name)
+                deadline = page_deadline(source_name)
+                if deadline is not None and deadline <= loop.time():
+                    mark_partial(source_name, f"{source_name}: skipped {page}, its time budget is used up")
+                else:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            with metrics.page(source_name, page), metrics.timer('fetch', source_name, page):
+                                async with rate_limiter.throttle(url) if paced else nullcontext():
+                                    payload = await self._fetch_page(source_name, scraper, url, errors)
+                    except TimeoutError:
+                        # Pages fetched before keep flowing downstream; only this one is lost
+                        errors.append(f"{source_name} {page} ran over its time budget and was cancelled")
+                        mark_partial(source_name, f"{source_name}: cancelled {page}, over its time budget")
+            
+            page_done(source_name)
+            return [] if payload is None else [(source_name, url, payload)]
+        
+        async def parse(item):
+            """Parse stage: turn a fetched page into opportunities"""
+            source_name, url, payload = item
+            page = url or 'known programs'
+            if payload is _CHECKPOINTED_PAGE:
+                records = checkpoints.page_records(run_id, source_name, page)
+            else:
+                scraper = self.scrapers[source_name]
+                opportunities = payload if url is None else None
+                cache_extraction = url is not None and http_cache is not None and isinstance(payload, str)
+                if cache_extraction:
+                    # An unchanged page gives what it gave before, without parsing it again
+                    opportunities = http_cache.extraction(url, scraper, payload)
+                if opportunities is None:
+                    with metrics.timer('parse', source_name, page):
+                        opportunities = await scraper.parse_page(url, payload)
+                    if cache_extraction:
+                        http_cache.store_extraction(url, scraper, payload, opportunities)
+                checkpoints.complete_page(run_id, source_name, page, opportunities)
+                records = list(enumerate(opportunities))
+            
+            self.session_stats['total_scraped'] += len(records)
+            # Every opportunity carries its checkpoint position: (page, index on the page)
+            return [(source_name, opp, (page, position)) for position, opp in records]
+        
+        async def score(item):
+            """Score stage: keep opportunities relevant for Peru and above the threshold"""
+            source_name, opportunity, checkpoint = item
+            with metrics.timer('score', source_name, checkpoint[0]):
+                relevant = await self.scrapers[source_name]._analyze_and_filter_opportunities([opportunity])
+            return [
+                (source_name, opp, checkpoint) for opp in relevant
+                if opp.relevance_score >= self.config['relevance_threshold']
+            ]
         
-        # Initialize async context scrapers
-        self.scrapers['IDB'] = IDBGrantsScraper()
-        self.scrapers['Peru Government'] = PeruGovernmentScraper()
+        async def collect(item):
+            """Collect stage (worker mode): take over the opportunities a worker found on one page"""
+            source_name, url, result = item
+            if result is _CHECKPOINTED_PAGE:
+                # Replayed records were checkpointed before scoring
+                return [scored for record in await parse(item) for scored in await score(record)]
+            
+            page = url or 'known programs'
+            errors.extend(result['errors'])
+            self.session_stats['total_scraped'] += result['scraped']
+            metrics.add_page(source_name, page, result.get('metrics', {}))
+            if result['failed']:
+                return []
+            
+            opportunities = [load_record(record_type, data) for record_type, data in result['records']]
+            checkpoints.complete_page(run_id, source_name, page, opportunities)
+            return [(source_name, opp, (page, position)) for position, opp in enumerate(opportunities)]
+        
+        async def worker_results():
+            """Input of the collect stage: checkpointed pages, then pages as workers finish them"""
+            for source_name, url in remote_pages:
+                if (url or 'known programs') in completed_pages.get(source_name, ()):
+                    page_done(source_name)
+                    yield (source_name, url, _CHECKPOINTED_PAGE)
+            
+            while True:
+                finished = await asyncio.to_thread(work_queue.collect, run_id)
+                for unit, result in finished:
+                    page_done(unit.source)
+                    yield (unit.source, unit.url, result)
+                if finished:
+                    continue
+                
+                if await asyncio.to_thread(work_queue.remaining, run_id) == 0:
+                    return
+                
+                if run_deadline is not None and loop.time() >= run_deadline:
+                    reason = "run deadline reached, its remaining pages were cancelled"
+                elif not any(process.is_alive() for process in worker_processes):
+                    reason = "worker processes exited before its pages were done"
+                    errors.append("Worker processes exited before the run was done")
+                else:
+                    await asyncio.sleep(self.config['worker_poll_interval'])
+                    continue
+                
+                for source_name in await asyncio.to_thread(work_queue.cancel, run_id):
+                    mark_partial(source_name, f"{source_name}: {reason}")
+                return
+        
+        def dedup_key(source_name, checkpoint):
+            """Key of an opportunity in the dedup index: run, source, page and position"""
+            return f"{run_id}:{source_name}:{checkpoint[0]}:{checkpoint[1]}"
+        
+        async def deduplicate(item):
+            """Dedup stage: drop near-duplicate titles and opportunities over the per-source limit"""
+            source_name, opportunity, checkpoint = item
+            limit = self.config['max_opportunities_per_source']
+            if limit > 0 and kept_by_source[source_name] >= limit:
+                return []
+            
+            if self.config['enable_deduplication']:
+                # Pending until persist saved it: records that never reach Airtable stay out of the history
+                with metrics.timer('dedup', source_name, checkpoint[0]):
+                    duplicate_of = dedup_index.find_or_add(
+                        opportunity.title, opportunity.description, source_name,
+                        key=dedup_key(source_name, checkpoint), pending=True
+                    )
+                if duplicate_of is not None:
+                    self.logger.debug(f"🔄 Duplicate: {opportunity.title} ~ {duplicate_of}")
+                    return []
+            
+            kept_by_source[source_name] += 1
+            self.session_stats['total_relevant'] += 1
+            top_opportunities.add(opportunity.relevance_score, opportunity)
+            return [item]
+        
+        async def persist(item):
+            """Persist stage: save the opportunity to Airtable right away"""
+            source_name, opportunity, (page, position) = item
+            if not self.config['enable_airtable_save']:
+                return []
+            
+            # The Airtable client blocks, so it runs in a thread and persist workers overlap
+            with metrics.timer('sink', source_name, page):
+                saved = await asyncio.to_thread(self._save_to_airtable, opportunity)
+            if self.config['enable_deduplication']:
+                if saved:
+                    dedup_index.confirm(dedup_key(source_name, (page, position)))
+                else:
+                    dedup_index.discard(dedup_key(source_name, (page, position)))
+            if saved:
+                checkpoints.mark_saved(run_id, source_name, page, position)
+                self.session_stats['total_saved'] += 1
+                if self.session_stats['first_saved_after'] is None:
+                    first_saved_after = (datetime.now() - start_time).total_seconds()
+                    self.session_stats['first_saved_after'] = first_saved_after
+                    self.logger.info(f"💾 First opportunity saved to Airtable after {first_saved_after:.1f}s")
+            return []
+        
+        workers = dict(self.config['pipeline_workers'])
+        if self.config.get('max_concurrent_scrapers') is not None:
+            # Former setting for the sources scraped at once, which are now the fetch workers
+            self.logger.warning("⚠️ max_concurrent_scrapers is deprecated, use pipeline_workers['fetch']")
+            workers['fetch'] = max(1, self.config['max_concurrent_scrapers'])
+        queue_size = self.config['pipeline_queue_size']
+        worker_mode = self.config['worker_processes'] > 0
+        if worker_mode:
+            # Worker processes fetch, parse and score; results are merged here in page order
+            stages = [PipelineStage('collect', collect, 1, queue_size)]
+        else:
+            stages = [
+                PipelineStage('fetch', fetch, workers.get('fetch', 1), queue_size),
+                PipelineStage('parse', parse, workers.get('parse', 1), queue_size),
+                PipelineStage('score', score, workers.get('score', 1), queue_size)
+            ]
+        pipeline = StagedPipeline(stages + [
+            # The near-duplicate index is not shared between threads, so deduplication runs in a single worker
+            PipelineStage('dedup', deduplicate, 1, queue_size),
+            PipelineStage('persist', persist, workers.get('persist', 1), queue_size)
+        ], self.logger)
         
-        # Process each source with error handling and retries
-        semaphore = asyncio.Semaphore(self.config['max_concurrent_scrapers'])
+        # Pages are interleaved across sources, so every fetch worker has a source to work on
+        remote_pages = [page for pages in zip_longest(*pages_by_source.values()) for page in pages if page is not None]
+        work_queue = None
+        worker_processes = []
         
-        async def scrape_source_with_retry(source_name: str):
-            async with semaphore:
-                for attempt in range(self.config['retry_attempts']):
-                    try:
-                        self.logger.info(f"🎯 Scraping {source_name} (Attempt {attempt + 1})")
-                        
-                        scraper = self.scrapers[source_name]
-                        if source_name in ['IDB', 'Peru Government']:
-                            async with scraper:  # Use context manager for async scrapers
-                                opportunities = await scraper.scrape_all_opportunities()
-                        else:
-                            opportunities = await scraper.scrape_all_opportunities()
-                        
-                        self.logger.info(f"✅ {source_name}: Found {len(opportunities)} relevant opportunities")
-                        self.session_stats['sources_completed'].append(source_name)
-                        
-                        return opportunities
-                        
-                    except Exception as e:
-                        error_msg = f"{source_name} attempt {attempt + 1} failed: {str(e)}"
-                        self.logger.error(f"❌ {error_msg}")
-                        errors.append(error_msg)
-                        
-                        if attempt < self.config['retry_attempts'] - 1:
-                            await asyncio.sleep(self.config['retry_delay'])
-                        else:
-                            self.logger.error(f"💥 {source_name} failed all retry attempts")
-                            return []
-        
-        # Execute scrapers concurrently
-        tasks = []
-        for source in sources:
-            if source in self.scrapers:
-                task = scrape_source_with_retry(source)
-                tasks.append((source, task))
-        
-        # Gather results
-        for source, task in tasks:
-            try:
-                opportunities = await task
-                if opportunities:
-                    all_opportunities.extend(opportunities)
-                    self.session_stats['total_scraped'] += len(opportunities)
-            except Exception as e:
-                errors.append(f"Task execution failed for {source}: {str(e)}")
-        
-        # Process and analyze all opportunities
-        final_opportunities = await self._process_all_opportunities(all_opportunities)
+        if self.config['enable_airtable_save']:
+            self.logger.info("💾 Saving relevant opportunities to Airtable as they are found")
+        
+        try:
+            if worker_mode:
+                work_queue = self.work_queue or SQLiteWorkQueue(self.config['work_queue_path'])
+                await asyncio.to_thread(work_queue.put, run_id, [
+                    (source_name, url) for source_name, url in remote_pages
+                    if (url or 'known programs') not in completed_pages.get(source_name, ())
+                ])
+                worker_processes = self._start_worker_processes(work_queue, run_id)
+                await pipeline.run(worker_results())
+            else:
+                async with AsyncExitStack() as stack:
+                    if http_client is not None:
+                        await stack.enter_async_context(http_client)  # The connection pool stays open for the whole run
+                    for source in session_sources:
+                        await stack.enter_async_context(self.scrapers[source])
+                    
+                    await pipeline.run(remote_pages)
+            
+            # A run cut short by its time budgets stays open, so its remaining pages can be resumed
+            if partial_sources:
+                self.logger.info(f"♻️ Run {run_id} is incomplete; continue it with --resume {run_id}")
+            else:
+                checkpoints.finish_run(run_id)
+                if work_queue is not None:
+                    await asyncio.to_thread(work_queue.purge, run_id)
+        finally:
+            # Also on interruption: a resumed run must dedup against everything kept so far
+            dedup_index.close()
+            checkpoints.close()
+            if http_cache is not None:
+                http_cache.close()
+            if worker_processes:
+                await asyncio.to_thread(self._stop_worker_processes, worker_processes)
+            if work_queue is not None and work_queue is not self.work_queue:
+                work_queue.close()
+        
+        errors.extend(pipeline.errors)
+        self.logger.info(f"🔀 Pipeline stages: {pipeline.stats}")
+        if http_client is not None:
+            self.logger.info(f"🌐 HTTP requests: {http_client.stats}")
+        if http_cache is not None:
+            self.logger.info(f"🗄️ HTTP cache: {http_cache.stats}")
+        self.logger.info(f"🚦 Rate limits: {rate_limiter.stats}, delays {rate_limiter.delays()}")
+        self.logger.info(f"🔄 Deduplication: {dedup_index.stats}")
+        self.logger.info(f"⚡ Startup: orchestrator {self.startup_time}s, scrapers {self.scrapers.load_times}")
+        for stage, histogram in metrics.stages.items():
+            self.logger.info(
+                f"📈 {stage}: {histogram.count} x, {histogram.sum:.2f}s total, "
+                f"p50 ≤ {histogram.percentile(50):g}s, p99 ≤ {histogram.percentile(99):g}s"
+            )
+        
+        final_opportunities = top_opportunities.results()
+        self.analysis_cache.flush()
+        self.logger.info(f"🧠 Analysis cache: {self.analysis_cache.stats}")
         
         # Generate comprehensive report
         end_time = datetime.now()
         self.session_stats['end_time'] = end_time
         execution_time = (end_time - start_time).total_seconds()
+        metrics.set_gauge('run_seconds', round(execution_time, 4))
+        metrics.set_gauge('opportunities_scraped', self.session_stats['total_scraped'])
+        metrics.set_gauge('opportunities_relevant', self.session_stats['total_relevant'])
+        metrics.set_gauge('opportunities_saved', self.session_stats['total_saved'])
         
         report = ScrapingReport(
             timestamp=start_time.isoformat(),
-            total_opportunities=len(all_opportunities),
-            relevant_opportunities=len(final_opportunities),
+            total_opportunities=self.session_stats['total_scraped'],
+            relevant_opportunities=self.session_stats['total_relevant'],
             sources_scraped=self.session_stats['sources_completed'],
             errors=errors,
-            top_opportunities=[self._opportunity_to_dict(opp) for opp in final_opportunities[:10]],
+            top_opportunities=[self._opportunity_to_dict(opp) for opp in final_opportunities],
             keyword_stats=self.keyword_matcher.get_keyword_statistics(),
-            execution_time=execution_time
+            execution_time=execution_time,
+            partial_sources=partial_sources,
+            run_id=run_id,
+            startup_times={'orchestrator': self.startup_time, **self.scrapers.load_times},
+            metrics=metrics.to_dict()
         )
         
         await self._save_scraping_report(report)
+        if self.config['metrics_prometheus_path']:
+            self._save_prometheus_metrics(metrics, self.config['metrics_prometheus_path'])
         await self._display_comprehensive_results(report, final_opportunities)
         
         return report
     
-    async def _process_all_opportunities(self, opportunities: List[Any]) -> List[Any]:
-        """Process and deduplicate opportunities from all sources"""
-        self.logger.info(f"📊 Processing {len(opportunities)} opportunities...")
-        
-        # Deduplicate based on title similarity
-        if self.config['enable_deduplication']:
-            opportunities = await self._deduplicate_opportunities(opportunities)
-            self.logger.info(f"🔄 After deduplication: {len(opportunities)} opportunities")
-        
-        # Apply final filtering and ranking
-        filtered_opportunities = []
-        for opp in opportunities:
-            # Get relevance score (should already be set by individual scrapers)
-            relevance_score = getattr(opp, 'relevance_score', 0)
-            
-            if relevance_score >= self.config['relevance_threshold']:
-                filtered_opportunities.append(opp)
-        
-        # Sort by relevance score
-        filtered_opportunities.sort(key=lambda x: getattr(x, 'relevance_score', 0), reverse=True)
-        
-        # Limit per source if configured
-        if self.config['max_opportunities_per_source'] > 0:
-            final_opportunities = filtered_opportunities[:self.config['max_opportunities_per_source']]
-        else:
-            final_opportunities = filtered_opportunities
-        
-        self.session_stats['total_relevant'] = len(final_opportunities)
-        
-        return final_opportunities
+    def _start_worker_processes(self, work_queue: WorkQueue, run_id: str) -> List[multiprocessing.Process]:
+        """Start the local worker processes of a run"""
+        from crawl_worker import WORKER_CONFIG_KEYS, run_worker_process  # only worker mode needs it
+        
+        worker_config = {key: self.config[key] for key in WORKER_CONFIG_KEYS}
+        # Spawned (not forked) workers start clean, without this process's event loop and connections
+        context = multiprocessing.get_context('spawn')
+        processes = [
+            context.Process(target=run_worker_process, args=(work_queue, run_id, worker_config),
+                            name=f"crawl worker {number + 1}", daemon=True)
+            for number in range(self.config['worker_processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.logger.info(f"👷 Started {len(processes)} worker processes for run {run_id}")
+        return processes
     
-    async def _deduplicate_opportunities(self, opportunities: List[Any]) -> List[Any]:
-        """Remove duplicate opportunities based on title similarity"""
-        unique_opportunities = []
-        seen_titles = set()
-        
-        for opp in opportunities:
-            title = getattr(opp, 'title', '').lower().strip()
+    def _stop_worker_processes(self, processes: List[multiprocessing.Process], timeout: float = 10):
+        """Wait for worker processes to finish their current page, terminating those that do not"""
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                self.logger.warning(f"⚠️ Terminating {process.name}")
+                process.terminate()
+                process.join()
+    
+    def _source_pages(self, source_name: str) -> List[Tuple[str, Optional[str]]]:
+        """Work items of the fetch stage for one source, as (source, url) pairs"""
+        pages = [(source_name, url) for url in self.scrapers[source_name].target_urls]
+        if source_name == 'Peru Government':
+            # Known programs need no page; a None url stands for them
+            pages.append((source_name, None))
+        return pages
+    
+    async def _fetch_page(self, source_name: str, scraper: Any, url: Optional[str], errors: List[str]) -> Any:
+        """Fetch one page (requests retry on their own); None if it failed"""
+        try:
+            if url is None:
+                return await scraper._add_known_programs()
             
-            # Simple deduplication based on title similarity
-            is_duplicate = False
-            for seen_title in seen_titles:
-                if self._calculate_similarity(title, seen_title) > 0.8:
-                    is_duplicate = True
-                    break
+            self.logger.info(f"🎯 {source_name}: fetching {url}")
+            return await scraper.fetch_page(url)
             
-            if not is_duplicate:
-                unique_opportunities.append(opp)
-                seen_titles.add(title)
-        
-        return unique_opportunities
-    
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate simple similarity between two texts"""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 and not words2:
-            return 1.0
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+        except Exception as e:
+            error_msg = f"{source_name} {url or 'known programs'} failed: {str(e)}"
+            self.logger.error(f"❌ {error_msg}")
+            errors.append(error_msg)
+            return None
     
-    async def save_all_to_airtable(self, opportunities: List[Any]) -> int:
+    async def save_all_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save all relevant opportunities to Airtable"""
         if not self.config['enable_airtable_save']:
             self.logger.info("💾 Airtable saving disabled in configuration")
@@ -259,51 +633,39 @@ class GrantScraperOrchestrator:
         failed_count = 0
         
         for opp in opportunities:
-            try:
-                # Convert opportunity to Airtable record format
-                record_data = self._convert_to_airtable_record(opp)
-                
-                result = self.airtable_client.upsert_record(record_data)
-                self.logger.debug(f"💾 {result}")
+            if self._save_to_airtable(opp):
                 saved_count += 1
-                
-            except Exception as e:
+            else:
                 failed_count += 1
-                self.logger.error(f"❌ Failed to save {getattr(opp, 'title', 'Unknown')}: {str(e)}")
         
         self.logger.info(f"✅ Airtable save completed: {saved_count} saved, {failed_count} failed")
         return saved_count
     
-    def _convert_to_airtable_record(self, opportunity: Any) -> Dict[str, Any]:
+    def _save_to_airtable(self, opportunity: Opportunity) -> bool:
+        """Upsert a single opportunity into Airtable"""
+        try:
+            # Convert opportunity to Airtable record format
+            record_data = self._convert_to_airtable_record(opportunity)
+            
+            result = self.airtable_client.upsert_record(record_data)
+            # The client reports a failed upsert in its result instead of raising
+            if isinstance(result, str) and result.startswith("Error"):
+                self.logger.error(f"❌ Failed to save {opportunity.title}: {result}")
+                return False
+            self.logger.debug(f"💾 {result}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to save {opportunity.title}: {str(e)}")
+            return False
+    
+    def _convert_to_airtable_record(self, opportunity: Opportunity) -> Dict[str, Any]:
         """Convert opportunity object to Airtable record format"""
-        return {
-            'Grant Name': getattr(opportunity, 'title', ''),
-            'Organization': [getattr(opportunity, 'organization', 'Unknown')],
-            'Description': getattr(opportunity, 'description', '')[:2000],
-            'Amount': getattr(opportunity, 'funding_amount', ''),
-            'Deadline': getattr(opportunity, 'deadline', None),
-            'Category': [getattr(opportunity, 'sector', '')] if getattr(opportunity, 'sector', '') else [],
-            'Keywords': getattr(opportunity, 'keyword_matches', [])[:10],
-            'Eligibility': getattr(opportunity, 'eligibility_criteria', ''),
-            'Application Link': getattr(opportunity, 'application_link', ''),
-            'Contact Email': getattr(opportunity, 'contact_info', ''),
-            'Status': getattr(opportunity, 'status', 'Active'),
-            'Priority': getattr(opportunity, 'priority_level', 'MEDIUM'),
-            'Notes': f"Source: {getattr(opportunity, 'source', 'Unknown')}. Relevance Score: {getattr(opportunity, 'relevance_score', 0)}. Auto-scraped via Orchestrator.",
-            'Source': getattr(opportunity, 'source', 'Unknown')
-        }
+        return opportunity.to_airtable_record()
     
-    def _opportunity_to_dict(self, opportunity: Any) -> Dict[str, Any]:
+    def _opportunity_to_dict(self, opportunity: Opportunity) -> Dict[str, Any]:
         """Convert opportunity to dictionary for reporting"""
-        return {
-            'title': getattr(opportunity, 'title', ''),
-            'source': getattr(opportunity, 'source', ''),
-            'funding_amount': getattr(opportunity, 'funding_amount', ''),
-            'relevance_score': getattr(opportunity, 'relevance_score', 0),
-            'priority_level': getattr(opportunity, 'priority_level', ''),
-            'geographic_focus': getattr(opportunity, 'geographic_focus', ''),
-            'application_link': getattr(opportunity, 'application_link', '')
-        }
+        return opportunity.to_report_dict()
     
     async def _save_scraping_report(self, report: ScrapingReport):
         """Save detailed scraping report to file"""
@@ -322,7 +684,16 @@ class GrantScraperOrchestrator:
         except Exception as e:
             self.logger.error(f"❌ Failed to save scraping report: {str(e)}")
     
-    async def _display_comprehensive_results(self, report: ScrapingReport, opportunities: List[Any]):
+    def _save_prometheus_metrics(self, metrics: RunMetrics, path: str):
+        """Write the run metrics in Prometheus text format"""
+        try:
+            metrics.write_prometheus(path)
+            self.logger.info(f"📈 Prometheus metrics saved to {path}")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to save Prometheus metrics: {str(e)}")
+    
+    async def _display_comprehensive_results(self, report: ScrapingReport, opportunities: List[Opportunity]):
         """Display comprehensive results summary"""
         print("\n" + "="*80)
         print("🎯 PERU GRANTS SCRAPING COMPLETE - COMPREHENSIVE RESULTS")
@@ -335,6 +706,10 @@ class GrantScraperOrchestrator:
         print(f"   • Execution Time: {report.execution_time:.1f} seconds")
         print(f"   • Success Rate: {(len(report.sources_scraped)/len(self.scrapers)*100):.1f}%")
         
+        if report.partial_sources:
+            print(f"\n⏰ PARTIAL RESULTS (time budget reached): {', '.join(report.partial_sources)}")
+            print(f"   Continue this run with: --resume {report.run_id}")
+        
         if report.errors:
             print(f"\n⚠️ ERRORS ENCOUNTERED: {len(report.errors)}")
             for error in report.errors[:3]:  # Show first 3 errors
@@ -347,18 +722,20 @@ class GrantScraperOrchestrator:
         if opportunities:
             print(f"\n🏆 TOP {min(5, len(opportunities))} OPPORTUNITIES:")
             for i, opp in enumerate(opportunities[:5], 1):
-                print(f"\n{i}. {getattr(opp, 'title', 'Unknown Title')}")
-                print(f"   🏢 Source: {getattr(opp, 'source', 'Unknown')}")
-                print(f"   💰 Amount: {getattr(opp, 'funding_amount', 'Not specified')}")
-                print(f"   📍 Geographic: {getattr(opp, 'geographic_focus', 'Not specified')}")
-                print(f"   🎯 Relevance Score: {getattr(opp, 'relevance_score', 0):.1f}")
-                print(f"   📅 Deadline: {getattr(opp, 'deadline', 'Not specified')}")
-                print(f"   🔗 Link: {getattr(opp, 'application_link', 'Not provided')}")
+                print(f"\n{i}. {opp.title or 'Unknown Title'}")
+                print(f"   🏢 Source: {opp.source or 'Unknown'}")
+                print(f"   💰 Amount: {opp.funding_amount or 'Not specified'}")
+                print(f"   📍 Geographic: {opp.geographic_focus or 'Not specified'}")
+                print(f"   🎯 Relevance Score: {opp.relevance_score:.1f}")
+                print(f"   📅 Deadline: {opp.deadline or 'Not specified'}")
+                print(f"   🔗 Link: {opp.application_link or 'Not provided'}")
         
         print(f"\n💾 AIRTABLE INTEGRATION:")
         if self.config['enable_airtable_save']:
-            saved_count = await self.save_all_to_airtable(opportunities)
-            print(f"   • {saved_count} opportunities saved to Airtable")
+            # Opportunities were saved by the pipeline's persist stage as they were found
+            print(f"   • {self.session_stats['total_saved']} opportunities saved to Airtable")
+            if self.session_stats['first_saved_after'] is not None:
+                print(f"   • First record saved after {self.session_stats['first_saved_after']:.1f} seconds")
         else:
             print("   • Airtable saving disabled")
         
@@ -0,0 +1,89 @@
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class ScraperSpec:
+    """Where a source's scraper class lives and how it is run"""
+    module: str
+    class_name: str
+    uses_session: bool = False  # makes HTTP requests through an HttpClient, entered with `async with`; every run gets a fresh instance
+
+
+# Sources the orchestrator knows, in the order they are scraped
+SCRAPER_SPECS = {
+    'IDB': ScraperSpec('scrapers.idb_scraper', 'IDBGrantsScraper', uses_session=True),
+    'UNDP': ScraperSpec('scrapers.undp_firecrawl_scraper', 'UNDPFirecrawlScraper'),
+    'World Bank': ScraperSpec('scrapers.worldbank_firecrawl_scraper', 'WorldBankFirecrawlScraper'),
+    'Peru Government': ScraperSpec('scrapers.peru_gov_scraper', 'PeruGovernmentScraper', uses_session=True)
+}
+
+
+class ScraperRegistry:
+    """
+    Scrapers by source name, imported and constructed on first use.
+
+    A run only pays for the scrapers (and their HTTP and parsing libraries) of
+    the sources it scrapes. Every scraper gets the same keyword matcher and the
+    same sink client, instead of building its own; scrapers that use a session
+    also get the same HTTP client, so they share its connection pool. How long
+    each scraper took to load is kept in load_times.
+    """
+
+    def __init__(self, keyword_matcher: Any = None, sink: Any = None, http_client: Any = None,
+                 specs: Optional[Dict[str, ScraperSpec]] = None,
+                 scraper_options: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.keyword_matcher = keyword_matcher
+        self.sink = sink
+        self.http_client = http_client
+        self.specs = dict(specs if specs is not None else SCRAPER_SPECS)
+        self.scraper_options = scraper_options or {}
+        self.load_times = {}
+        self._scrapers = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def keys(self) -> List[str]:
+        """Names of all registered sources"""
+        return list(self.specs)
+
+    def uses_session(self, name: str) -> bool:
+        """Whether a source's scraper must be entered with `async with` before use"""
+        return self.specs[name].uses_session
+
+    def get(self, name: str) -> Any:
+        """The source's scraper, loading it on first use"""
+        if name not in self._scrapers:
+            return self.create(name)
+        return self._scrapers[name]
+
+    def create(self, name: str) -> Any:
+        """Construct a new scraper for a source, replacing the one in use"""
+        if name not in self.specs:
+            raise KeyError(f"Unknown source: {name}")
+
+        spec = self.specs[name]
+        started = time.perf_counter()
+        scraper_class = getattr(importlib.import_module(spec.module), spec.class_name)
+        options = dict(self.scraper_options.get(name, {}))
+        if spec.uses_session and self.http_client is not None:
+            options['http_client'] = self.http_client
+        scraper = scraper_class(keyword_matcher=self.keyword_matcher, airtable_client=self.sink, **options)
+        self.load_times.setdefault(name, round(time.perf_counter() - started, 4))
+
+        self._scrapers[name] = scraper
+        return scraper
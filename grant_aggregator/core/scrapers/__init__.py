@@ -1,10 +1,26 @@
 # Scrapers package
+#
+# Scrapers are imported on first access, so importing one scraper does not pull
+# in the others (and their HTTP and parsing dependencies).
+
+import importlib
+
+_EXPORTS = {
+    'GrantsGovScraper': 'grants_gov_scraper',
+    'run_grants_gov_scraper': 'grants_gov_scraper',
+    'PeruGovernmentScraper': 'peru_gov_scraper',
+    'run_peru_gov_scraper': 'peru_gov_scraper',
+    'IDBGrantsScraper': 'idb_scraper',
+    'UNDPFirecrawlScraper': 'undp_firecrawl_scraper',
+    'WorldBankFirecrawlScraper': 'worldbank_firecrawl_scraper'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
 
-from .grants_gov_scraper import GrantsGovScraper, run_grants_gov_scraper
-from .peru_gov_scraper import PeruGovernmentScraper, run_peru_gov_scraper
-from .idb_scraper import IDBGrantsScraper
-from .undp_firecrawl_scraper import UNDPFirecrawlScraper 
-from .worldbank_firecrawl_scraper import WorldBankFirecrawlScraper
 
 __all__ = [
     'GrantsGovScraper',
@@ -14,4 +30,4 @@ __all__ = [
     'IDBGrantsScraper',
     'UNDPFirecrawlScraper',
     'WorldBankFirecrawlScraper'
-]
\ No newline at end of file
+]
@@ -1,47 +1,40 @@
 import asyncio
 import json
 import logging
-import aiohttp
+import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from functools import partial
 from bs4 import BeautifulSoup
 import re
 import urllib.parse
 from urllib.parse import urljoin, urlparse
 
-from ..keyword_matcher import PeruGrantKeywordMatcher
-from ..airtable_client import AirtableClient
+try:
+    from ..keyword_matcher import PeruGrantKeywordMatcher
+    from ..opportunity import Opportunity
+    from ..airtable_client import AirtableClient
+    from ..http_client import HttpClient
+    from ..link_health import LinkHealthService, LinkHealthStore
+    from ..rate_limiter import source_limit
+except ImportError:
+    from keyword_matcher import PeruGrantKeywordMatcher
+    from opportunity import Opportunity
+    from airtable_client import AirtableClient
+    from http_client import HttpClient
+    from link_health import LinkHealthService, LinkHealthStore
+    from rate_limiter import source_limit
 
 
-@dataclass
-class GrantsGovOpportunity:
-    """Data structure for Grants.gov funding opportunities"""
-    title: str
-    organization: str = "Grants.gov"
-    description: str = ""
-    funding_amount: str = ""
-    deadline: Optional[str] = None
-    announcement_date: Optional[str] = None
-    geographic_focus: str = "United States"
-    sector: str = ""
-    eligibility_criteria: str = ""
-    status: str = "Open"
-    application_link: str = ""
-    source_url: str = ""
-    source: str = "Grants.gov"
-    program_type: str = "Federal Grant"
-    agency: str = ""
-    opportunity_number: str = ""
-    cfda_number: str = ""
-    contact_info: str = ""
-    relevance_score: float = 0.0
-    keyword_matches: List[str] = None
-    priority_level: str = "LOW"
-    
-    def __post_init__(self):
-        if self.keyword_matches is None:
-            self.keyword_matches = []
+# Opportunities of this scraper, with its organization and source filled in
+new_opportunity = partial(
+    Opportunity,
+    organization="Grants.gov",
+    geographic_focus="United States",
+    status="Open",
+    source="Grants.gov",
+    program_type="Federal Grant"
+)
 
 
 class GrantsGovScraper:
@@ -50,11 +43,21 @@ class GrantsGovScraper:
     Implements intelligent search, link verification, and filters for high-quality results.
     """
     
-    def __init__(self):
+    def __init__(self, keyword_matcher: Optional[PeruGrantKeywordMatcher] = None,
+                 airtable_client: Optional[AirtableClient] = None, http_client: Optional[HttpClient] = None,
+                 link_health: Optional[LinkHealthStore] = None):
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
-        self.airtable_client = AirtableClient()
-        self.session = None
+        # The scraper registry injects instances shared by all scrapers
+        self.keyword_matcher = keyword_matcher or PeruGrantKeywordMatcher()
+        self.airtable_client = airtable_client or AirtableClient()
+        # Pooled connections with retries; on its own, at most 5 connections go to Grants.gov
+        self.http_client = http_client or HttpClient(pool_size=10, connections_per_host=5)
+        self._owns_http_client = http_client is None
+        # Link checks shared with other scrapers and the seed scripts, remembered across runs
+        self.link_health = link_health or LinkHealthStore(os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "link_health.sqlite"
+        ))
+        self._owns_link_health = link_health is None
         
         # Configure logging
         logging.basicConfig(
@@ -98,26 +101,28 @@ class GrantsGovScraper:
             "cultural preservation"
         ]
         
-        # Session timeout and delays
-        self.request_delay = 2.0  # Respectful delay between requests
-        self.timeout = 30
+        # Delay between requests to Grants.gov, in seconds; the HTTP client adapts it to the host
+        self.request_delay = 2.0
+        if self._owns_http_client:
+            self.http_client.limiter.configure(self.base_url, source_limit(self.request_delay))
+        
+        # Verifies application links, skipping those checked recently
+        self.link_checker = LinkHealthService(self.link_health, self.http_client, headers=self.headers)
     
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers=self.headers,
-            connector=connector
-        )
+        if self._owns_http_client:
+            await self.http_client.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        if self._owns_http_client:
+            await self.http_client.close()
+        if self._owns_link_health:
+            self.link_health.close()
     
-    async def scrape_all_opportunities(self) -> List[GrantsGovOpportunity]:
+    async def scrape_all_opportunities(self) -> List[Opportunity]:
         """Main method to scrape Grants.gov opportunities following session pattern"""
         self.logger.info("🚀 Starting Grants.gov scraping following user session pattern...")
         
@@ -134,13 +139,7 @@ class GrantsGovScraper:
             try:
                 self.logger.info(f"🔍 Searching for: {keyword}")
                 opportunities = await self._perform_search(keyword)
-                
-                # Verify each opportunity's application link
-                verified_opportunities = await self._verify_opportunity_links(opportunities)
-                all_opportunities.extend(verified_opportunities)
-                
-                # Respectful delay between searches
-                await asyncio.sleep(self.request_delay)
+                all_opportunities.extend(opportunities)
                 
             except Exception as e:
                 self.logger.error(f"❌ Error searching for '{keyword}': {str(e)}")
@@ -149,10 +148,13 @@ class GrantsGovScraper:
         # Remove duplicates based on title and opportunity number
         unique_opportunities = self._remove_duplicates(all_opportunities)
         
+        # Verify each remaining opportunity's application link (once per link)
+        verified_opportunities = await self._verify_opportunity_links(unique_opportunities)
+        
         # Filter and analyze opportunities
-        relevant_opportunities = await self._analyze_and_filter_opportunities(unique_opportunities)
+        relevant_opportunities = await self._analyze_and_filter_opportunities(verified_opportunities)
         
-        self.logger.info(f"✅ Grants.gov scraping completed. Found {len(all_opportunities)} total, {len(unique_opportunities)} unique, {len(relevant_opportunities)} relevant.")
+        self.logger.info(f"✅ Grants.gov scraping completed. Found {len(all_opportunities)} total, {len(unique_opportunities)} unique, {len(verified_opportunities)} verified, {len(relevant_opportunities)} relevant.")
         
         return relevant_opportunities
     
@@ -160,12 +162,11 @@ class GrantsGovScraper:
         """Simulate homepage visit following user session"""
         try:
             self.logger.debug("🏠 Visiting Grants.gov homepage...")
-            async with self.session.get(self.base_url) as response:
-                if response.status == 200:
-                    self.logger.debug("✅ Homepage loaded successfully")
-                else:
-                    self.logger.warning(f"⚠️ Homepage returned status {response.status}")
-                await asyncio.sleep(1)  # Brief pause like in session
+            response = await self.http_client.get(self.base_url, headers=self.headers)
+            if response.status == 200:
+                self.logger.debug("✅ Homepage loaded successfully")
+            else:
+                self.logger.warning(f"⚠️ Homepage returned status {response.status}")
         except Exception as e:
             self.logger.warning(f"⚠️ Could not load homepage: {str(e)}")
     
@@ -173,16 +174,15 @@ class GrantsGovScraper:
         """Simulate search page visit following user session"""
         try:
             self.logger.debug("🔍 Navigating to search grants page...")
-            async with self.session.get(self.search_url) as response:
-                if response.status == 200:
-                    self.logger.debug("✅ Search page loaded successfully")
-                else:
-                    self.logger.warning(f"⚠️ Search page returned status {response.status}")
-                await asyncio.sleep(1)  # Brief pause like in session
+            response = await self.http_client.get(self.search_url, headers=self.headers)
+            if response.status == 200:
+                self.logger.debug("✅ Search page loaded successfully")
+            else:
+                self.logger.warning(f"⚠️ Search page returned status {response.status}")
         except Exception as e:
             self.logger.warning(f"⚠️ Could not load search page: {str(e)}")
     
-    async def _perform_search(self, keyword: str) -> List[GrantsGovOpportunity]:
+    async def _perform_search(self, keyword: str) -> List[Opportunity]:
         """Perform search with progressive keyword input (mimicking user session)"""
         opportunities = []
         
@@ -197,23 +197,22 @@ class GrantsGovScraper:
             
             search_url_with_params = f"{self.search_url}?" + urllib.parse.urlencode(search_params)
             
-            async with self.session.get(search_url_with_params) as response:
-                if response.status != 200:
-                    self.logger.warning(f"⚠️ Search returned status {response.status} for keyword: {keyword}")
-                    return opportunities
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Parse search results
-                opportunities = await self._parse_search_results(soup, keyword)
+            response = await self.http_client.get(search_url_with_params, headers=self.headers)
+            if response.status != 200:
+                self.logger.warning(f"⚠️ Search returned status {response.status} for keyword: {keyword}")
+                return opportunities
+            
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Parse search results
+            opportunities = await self._parse_search_results(soup, keyword)
                 
         except Exception as e:
             self.logger.error(f"❌ Error performing search for '{keyword}': {str(e)}")
         
         return opportunities
     
-    async def _parse_search_results(self, soup: BeautifulSoup, search_keyword: str) -> List[GrantsGovOpportunity]:
+    async def _parse_search_results(self, soup: BeautifulSoup, search_keyword: str) -> List[Opportunity]:
         """Parse search results from Grants.gov search page"""
         opportunities = []
         
@@ -243,7 +242,7 @@ class GrantsGovScraper:
         
         return opportunities
     
-    async def _extract_opportunity_from_container(self, container, search_keyword: str) -> Optional[GrantsGovOpportunity]:
+    async def _extract_opportunity_from_container(self, container, search_keyword: str) -> Optional[Opportunity]:
         """Extract opportunity information from HTML container"""
         try:
             # Extract title
@@ -292,7 +291,7 @@ class GrantsGovScraper:
                     application_link = urljoin(self.base_url, href)
             
             # Create opportunity object
-            opportunity = GrantsGovOpportunity(
+            opportunity = new_opportunity(
                 title=title,
                 description=description[:2000] if description else f"Grant opportunity related to {search_keyword}",
                 agency=agency,
@@ -339,43 +338,23 @@ class GrantsGovScraper:
             return self._clean_text(eligibility_elem.get_text(strip=True))[:500]
         return ""
     
-    async def _verify_opportunity_links(self, opportunities: List[GrantsGovOpportunity]) -> List[GrantsGovOpportunity]:
+    async def _verify_opportunity_links(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Verify application links to prevent fake/hallucinated results"""
-        verified_opportunities = []
+        # Each distinct link is checked once, several at a time (the HTTP client paces every host)
+        checks = await self.link_checker.check_many(opportunity.application_link for opportunity in opportunities)
         
+        verified_opportunities = []
         for opportunity in opportunities:
-            try:
-                # Check if link is valid and accessible
-                if await self._verify_link(opportunity.application_link):
-                    verified_opportunities.append(opportunity)
-                    self.logger.debug(f"✅ Verified link for: {opportunity.title}")
-                else:
-                    self.logger.warning(f"❌ Invalid link for: {opportunity.title} - {opportunity.application_link}")
-                
-                # Small delay between link verifications
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                self.logger.debug(f"Error verifying link for {opportunity.title}: {str(e)}")
-                # Include opportunity even if verification fails (might be temporary network issue)
+            if checks[opportunity.application_link].ok:
                 verified_opportunities.append(opportunity)
+                self.logger.debug(f"✅ Verified link for: {opportunity.title}")
+            else:
+                self.logger.warning(f"❌ Invalid link for: {opportunity.title} - {opportunity.application_link}")
         
+        self.logger.info(f"🔗 Verified {len(checks)} links: {self.link_checker.stats}")
         return verified_opportunities
     
-    async def _verify_link(self, url: str) -> bool:
-        """Verify that a URL is accessible and returns valid content"""
-        if not url or not url.startswith('http'):
-            return False
-        
-        try:
-            async with self.session.head(url, allow_redirects=True) as response:
-                # Accept 200 OK and 302/301 redirects as valid
-                return response.status in [200, 301, 302, 403]  # 403 might be normal for some protected pages
-        except Exception as e:
-            self.logger.debug(f"Link verification failed for {url}: {str(e)}")
-            return False
-    
-    def _remove_duplicates(self, opportunities: List[GrantsGovOpportunity]) -> List[GrantsGovOpportunity]:
+    def _remove_duplicates(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Remove duplicate opportunities based on title and opportunity number"""
         seen = set()
         unique_opportunities = []
@@ -392,7 +371,7 @@ class GrantsGovScraper:
         
         return unique_opportunities
     
-    def _is_valid_opportunity(self, opportunity: GrantsGovOpportunity) -> bool:
+    def _is_valid_opportunity(self, opportunity: Opportunity) -> bool:
         """Validate opportunity to prevent fake/low-quality results"""
         # Check title quality
         if len(opportunity.title) < 10 or len(opportunity.title) > 300:
@@ -429,7 +408,7 @@ class GrantsGovScraper:
         
         return text[:2000]  # Limit length
     
-    async def _analyze_and_filter_opportunities(self, opportunities: List[GrantsGovOpportunity]) -> List[GrantsGovOpportunity]:
+    async def _analyze_and_filter_opportunities(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Analyze opportunities using keyword matcher and filter for relevance"""
         relevant_opportunities = []
         
@@ -438,8 +417,8 @@ class GrantsGovScraper:
                 # Prepare text for analysis
                 full_text = f"{opportunity.title} {opportunity.description} {opportunity.sector} {opportunity.agency} {opportunity.eligibility_criteria}"
                 
-                # Analyze with keyword matcher
-                analysis = self.keyword_matcher.analyze_grant_text(
+                # Score with keyword matcher; match details are only built for kept opportunities
+                analysis = self.keyword_matcher.score_grant_text(
                     full_text, 
                     opportunity.title, 
                     opportunity.description
@@ -448,10 +427,15 @@ class GrantsGovScraper:
                 # Update opportunity with analysis results
                 opportunity.relevance_score = analysis['relevance_score']
                 opportunity.priority_level = analysis['priority_level']
-                opportunity.keyword_matches = [match['keyword'] for match in analysis['matches']]
                 
                 # Include relevant opportunities (higher threshold for grants.gov due to volume)
                 if analysis['relevance_score'] >= 2.0 and not analysis['exclusion_flags']:
+                    details = self.keyword_matcher.analyze_grant_text(
+                        full_text, 
+                        opportunity.title, 
+                        opportunity.description
+                    )
+                    opportunity.keyword_matches = [match['keyword'] for match in details['matches']]
                     relevant_opportunities.append(opportunity)
                     self.logger.info(f"✅ Relevant: {opportunity.title} (Score: {opportunity.relevance_score})")
                 else:
@@ -466,7 +450,7 @@ class GrantsGovScraper:
         
         return relevant_opportunities
     
-    async def save_to_airtable(self, opportunities: List[GrantsGovOpportunity]) -> int:
+    async def save_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save opportunities to Airtable"""
         saved_count = 0
         
@@ -3,40 +3,26 @@ import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-import aiohttp
+from functools import partial
 from bs4 import BeautifulSoup
 import re
 
-from ..keyword_matcher import PeruGrantKeywordMatcher
-from ..airtable_client import AirtableClient
+try:
+    from ..keyword_matcher import PeruGrantKeywordMatcher
+    from ..opportunity import Opportunity
+    from ..airtable_client import AirtableClient
+    from ..http_client import HttpClient
+    from ..rate_limiter import source_limit
+except ImportError:
+    from keyword_matcher import PeruGrantKeywordMatcher
+    from opportunity import Opportunity
+    from airtable_client import AirtableClient
+    from http_client import HttpClient
+    from rate_limiter import source_limit
 
 
-@dataclass
-class GrantOpportunity:
-    """Data structure for grant opportunities"""
-    title: str
-    organization: str = "Inter-American Development Bank (IDB)"
-    description: str = ""
-    funding_amount: str = ""
-    deadline: Optional[str] = None
-    announcement_date: Optional[str] = None
-    geographic_focus: str = ""
-    sector: str = ""
-    eligibility_criteria: str = ""
-    status: str = ""
-    application_link: str = ""
-    source_url: str = ""
-    source: str = "IDB"
-    implementation_period: str = ""
-    contact_info: str = ""
-    relevance_score: float = 0.0
-    keyword_matches: List[str] = None
-    priority_level: str = "LOW"
-    
-    def __post_init__(self):
-        if self.keyword_matches is None:
-            self.keyword_matches = []
+# Opportunities of this scraper, with its organization and source filled in
+new_opportunity = partial(Opportunity, organization="Inter-American Development Bank (IDB)", source="IDB")
 
 
 class IDBGrantsScraper:
@@ -45,12 +31,16 @@ class IDBGrantsScraper:
     Focuses on Peru-relevant grants using the keyword matching engine.
     """
     
-    def __init__(self):
+    def __init__(self, keyword_matcher: Optional[PeruGrantKeywordMatcher] = None,
+                 airtable_client: Optional[AirtableClient] = None, http_client: Optional[HttpClient] = None):
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
-        self.airtable_client = AirtableClient()
+        # The scraper registry injects instances shared by all scrapers
+        self.keyword_matcher = keyword_matcher or PeruGrantKeywordMatcher()
+        self.airtable_client = airtable_client or AirtableClient()
         self.base_url = "https://www.iadb.org"
-        self.session = None
+        # Pooled connections with retries; the orchestrator's client is shared and stays open across scrapers
+        self.http_client = http_client or HttpClient()
+        self._owns_http_client = http_client is None
         
         # Configure logging
         logging.basicConfig(
@@ -64,28 +54,35 @@ class IDBGrantsScraper:
             "https://www.iadb.org/en/how-we-can-work-together/public-sector/financing-solutions/grants",
             "https://www.iadb.org/en/how-we-can-work-together/public-sector/technical-cooperation-grants"
         ]
+        
+        # Delay between page requests, in seconds; the HTTP client adapts it to each host
+        self.request_delay = 2
+        if self._owns_http_client:
+            for url in self.target_urls:
+                self.http_client.limiter.configure(url, source_limit(self.request_delay))
+        
+        # Headers sent with every request
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-        )
+        if self._owns_http_client:
+            await self.http_client.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        if self._owns_http_client:
+            await self.http_client.close()
     
-    async def scrape_all_opportunities(self) -> List[GrantOpportunity]:
+    async def scrape_all_opportunities(self) -> List[Opportunity]:
         """Main method to scrape all IDB grant opportunities"""
         self.logger.info("🚀 Starting IDB grants scraping...")
         
@@ -97,9 +94,6 @@ class IDBGrantsScraper:
                 opportunities = await self._scrape_page(url)
                 all_opportunities.extend(opportunities)
                 
-                # Add delay between requests to be respectful
-                await asyncio.sleep(2)
-                
             except Exception as e:
                 self.logger.error(f"❌ Error scraping {url}: {str(e)}")
                 continue
@@ -111,34 +105,49 @@ class IDBGrantsScraper:
         
         return relevant_opportunities
     
-    async def _scrape_page(self, url: str) -> List[GrantOpportunity]:
+    async def _scrape_page(self, url: str) -> List[Opportunity]:
         """Scrape a specific page for grant opportunities"""
+        html = await self.fetch_page(url)
+        if html is None:
+            return []
+        return await self.parse_page(url, html)
+    
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Download a page, returning its HTML or None if it could not be fetched"""
         try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    self.logger.warning(f"⚠️ HTTP {response.status} for {url}")
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                opportunities = []
-                
-                # Parse based on URL type
-                if "calls-proposals" in url:
-                    opportunities.extend(await self._parse_calls_for_proposals(soup, url))
-                elif "grants" in url:
-                    opportunities.extend(await self._parse_grants_page(soup, url))
-                elif "technical-cooperation" in url:
-                    opportunities.extend(await self._parse_technical_cooperation(soup, url))
-                
-                return opportunities
-                
+            response = await self.http_client.get(url, headers=self.headers)
+            if response.status != 200:
+                self.logger.warning(f"⚠️ HTTP {response.status} for {url}")
+                return None
+            
+            return response.text
+            
         except Exception as e:
             self.logger.error(f"❌ Failed to scrape {url}: {str(e)}")
+            return None
+    
+    async def parse_page(self, url: str, html: str) -> List[Opportunity]:
+        """Extract grant opportunities from a downloaded page"""
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            opportunities = []
+            
+            # Parse based on URL type
+            if "calls-proposals" in url:
+                opportunities.extend(await self._parse_calls_for_proposals(soup, url))
+            elif "grants" in url:
+                opportunities.extend(await self._parse_grants_page(soup, url))
+            elif "technical-cooperation" in url:
+                opportunities.extend(await self._parse_technical_cooperation(soup, url))
+            
+            return opportunities
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to parse {url}: {str(e)}")
             return []
     
-    async def _parse_calls_for_proposals(self, soup: BeautifulSoup, source_url: str) -> List[GrantOpportunity]:
+    async def _parse_calls_for_proposals(self, soup: BeautifulSoup, source_url: str) -> List[Opportunity]:
         """Parse the calls for proposals page"""
         opportunities = []
         
@@ -168,7 +177,7 @@ class IDBGrantsScraper:
         
         return opportunities
     
-    async def _parse_grants_page(self, soup: BeautifulSoup, source_url: str) -> List[GrantOpportunity]:
+    async def _parse_grants_page(self, soup: BeautifulSoup, source_url: str) -> List[Opportunity]:
         """Parse general grants overview page"""
         opportunities = []
         
@@ -187,7 +196,7 @@ class IDBGrantsScraper:
                     
                     # Check if this looks like an actual grant opportunity
                     if self._is_potential_grant_text(title, description):
-                        opportunity = GrantOpportunity(
+                        opportunity = new_opportunity(
                             title=title,
                             description=description,
                             source_url=source_url,
@@ -201,7 +210,7 @@ class IDBGrantsScraper:
         
         return opportunities
     
-    async def _parse_technical_cooperation(self, soup: BeautifulSoup, source_url: str) -> List[GrantOpportunity]:
+    async def _parse_technical_cooperation(self, soup: BeautifulSoup, source_url: str) -> List[Opportunity]:
         """Parse technical cooperation grants page"""
         opportunities = []
         
@@ -219,7 +228,7 @@ class IDBGrantsScraper:
         
         return opportunities
     
-    async def _extract_opportunity_data(self, element, source_url: str) -> Optional[GrantOpportunity]:
+    async def _extract_opportunity_data(self, element, source_url: str) -> Optional[Opportunity]:
         """Extract grant opportunity data from a DOM element"""
         try:
             # Extract title
@@ -259,7 +268,7 @@ class IDBGrantsScraper:
             sector = self._extract_sector(title, description)
             geographic_focus = self._extract_geographic_focus(title, description)
             
-            opportunity = GrantOpportunity(
+            opportunity = new_opportunity(
                 title=title,
                 description=description,
                 funding_amount=funding_amount,
@@ -277,7 +286,7 @@ class IDBGrantsScraper:
             self.logger.debug(f"Error extracting opportunity data: {str(e)}")
             return None
     
-    async def _extract_text_based_opportunities(self, soup: BeautifulSoup, source_url: str) -> List[GrantOpportunity]:
+    async def _extract_text_based_opportunities(self, soup: BeautifulSoup, source_url: str) -> List[Opportunity]:
         """Extract opportunities from text content that mentions specific programs"""
         opportunities = []
         
@@ -304,7 +313,7 @@ class IDBGrantsScraper:
                 if title_match:
                     title = title_match.group(1).strip()
                     if len(title) > 10 and len(title) < 200:
-                        opportunity = GrantOpportunity(
+                        opportunity = new_opportunity(
                             title=title,
                             description=context,
                             source_url=source_url,
@@ -314,7 +323,7 @@ class IDBGrantsScraper:
         
         return opportunities
     
-    async def _analyze_and_filter_opportunities(self, opportunities: List[GrantOpportunity]) -> List[GrantOpportunity]:
+    async def _analyze_and_filter_opportunities(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Analyze opportunities using keyword matcher and filter relevant ones"""
         relevant_opportunities = []
         
@@ -323,8 +332,8 @@ class IDBGrantsScraper:
                 # Prepare text for analysis
                 full_text = f"{opportunity.title} {opportunity.description} {opportunity.sector} {opportunity.geographic_focus}"
                 
-                # Analyze with keyword matcher
-                analysis = self.keyword_matcher.analyze_grant_text(
+                # Score with keyword matcher; match details are only built for kept opportunities
+                analysis = self.keyword_matcher.score_grant_text(
                     full_text, 
                     opportunity.title, 
                     opportunity.description
@@ -333,10 +342,15 @@ class IDBGrantsScraper:
                 # Update opportunity with analysis results
                 opportunity.relevance_score = analysis['relevance_score']
                 opportunity.priority_level = analysis['priority_level']
-                opportunity.keyword_matches = [match['keyword'] for match in analysis['matches']]
                 
                 # Only include relevant opportunities
                 if analysis['is_relevant'] and not analysis['exclusion_flags']:
+                    details = self.keyword_matcher.analyze_grant_text(
+                        full_text, 
+                        opportunity.title, 
+                        opportunity.description
+                    )
+                    opportunity.keyword_matches = [match['keyword'] for match in details['matches']]
                     relevant_opportunities.append(opportunity)
                     self.logger.info(f"✅ Relevant: {opportunity.title} (Score: {opportunity.relevance_score})")
                 else:
@@ -459,7 +473,7 @@ class IDBGrantsScraper:
         
         return text[:2000]  # Limit text length
     
-    async def save_to_airtable(self, opportunities: List[GrantOpportunity]) -> int:
+    async def save_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save opportunities to Airtable"""
         saved_count = 0
         
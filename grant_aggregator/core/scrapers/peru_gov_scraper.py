@@ -3,41 +3,31 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-import aiohttp
+from functools import partial
 from bs4 import BeautifulSoup
 import re
 
-from ..keyword_matcher import PeruGrantKeywordMatcher
-from ..airtable_client import AirtableClient
+try:
+    from ..keyword_matcher import PeruGrantKeywordMatcher
+    from ..opportunity import Opportunity
+    from ..airtable_client import AirtableClient
+    from ..http_client import HttpClient
+    from ..rate_limiter import source_limit
+except ImportError:
+    from keyword_matcher import PeruGrantKeywordMatcher
+    from opportunity import Opportunity
+    from airtable_client import AirtableClient
+    from http_client import HttpClient
+    from rate_limiter import source_limit
 
 
-@dataclass
-class PeruGovOpportunity:
-    """Data structure for Peru government funding opportunities"""
-    title: str
-    organization: str = "Government of Peru"
-    description: str = ""
-    funding_amount: str = ""
-    deadline: Optional[str] = None
-    announcement_date: Optional[str] = None
-    geographic_focus: str = "Peru"
-    sector: str = ""
-    eligibility_criteria: str = ""
-    status: str = ""
-    application_link: str = ""
-    source_url: str = ""
-    source: str = "Peru Government"
-    program_type: str = ""  # National Program, Regional Initiative, etc.
-    ministry: str = ""
-    contact_info: str = ""
-    relevance_score: float = 0.0
-    keyword_matches: List[str] = None
-    priority_level: str = "LOW"
-    
-    def __post_init__(self):
-        if self.keyword_matches is None:
-            self.keyword_matches = []
+# Opportunities of this scraper, with its organization and source filled in
+new_opportunity = partial(
+    Opportunity,
+    organization="Government of Peru",
+    geographic_focus="Peru",
+    source="Peru Government"
+)
 
 
 class PeruGovernmentScraper:
@@ -46,11 +36,15 @@ class PeruGovernmentScraper:
     Focuses on social development, rural programs, and indigenous initiatives.
     """
     
-    def __init__(self):
+    def __init__(self, keyword_matcher: Optional[PeruGrantKeywordMatcher] = None,
+                 airtable_client: Optional[AirtableClient] = None, http_client: Optional[HttpClient] = None):
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
-        self.airtable_client = AirtableClient()
-        self.session = None
+        # The scraper registry injects instances shared by all scrapers
+        self.keyword_matcher = keyword_matcher or PeruGrantKeywordMatcher()
+        self.airtable_client = airtable_client or AirtableClient()
+        # Pooled connections with retries; the orchestrator's client is shared and stays open across scrapers
+        self.http_client = http_client or HttpClient()
+        self._owns_http_client = http_client is None
         
         # Configure logging
         logging.basicConfig(
@@ -93,6 +87,12 @@ class PeruGovernmentScraper:
             "https://www.gob.pe/agrorural", # Rural development
         ]
         
+        # Delay between page requests, in seconds; the HTTP client adapts it to each host
+        self.request_delay = 3
+        if self._owns_http_client:
+            for url in self.target_urls:
+                self.http_client.limiter.configure(url, source_limit(self.request_delay))
+        
         # Headers for respectful scraping
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -104,18 +104,16 @@ class PeruGovernmentScraper:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers=self.headers
-        )
+        if self._owns_http_client:
+            await self.http_client.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        if self._owns_http_client:
+            await self.http_client.close()
     
-    async def scrape_all_opportunities(self) -> List[PeruGovOpportunity]:
+    async def scrape_all_opportunities(self) -> List[Opportunity]:
         """Main method to scrape Peru government opportunities"""
         self.logger.info("🚀 Starting Peru government scraping...")
         
@@ -127,9 +125,6 @@ class PeruGovernmentScraper:
                 opportunities = await self._scrape_government_site(url)
                 all_opportunities.extend(opportunities)
                 
-                # Respectful delay
-                await asyncio.sleep(3)
-                
             except Exception as e:
                 self.logger.error(f"❌ Error scraping {url}: {str(e)}")
                 continue
@@ -144,41 +139,56 @@ class PeruGovernmentScraper:
         
         return relevant_opportunities
     
-    async def _scrape_government_site(self, url: str) -> List[PeruGovOpportunity]:
+    async def _scrape_government_site(self, url: str) -> List[Opportunity]:
         """Scrape a specific government site"""
+        html = await self.fetch_page(url)
+        if html is None:
+            return []
+        return await self.parse_page(url, html)
+    
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Download a government page, returning its HTML or None if it could not be fetched"""
+        try:
+            response = await self.http_client.get(url, headers=self.headers)
+            if response.status != 200:
+                self.logger.warning(f"⚠️ HTTP {response.status} for {url}")
+                return None
+            
+            return response.text
+            
+        except Exception as e:
+            self.logger.error(f"❌ Failed to scrape {url}: {str(e)}")
+            return None
+    
+    async def parse_page(self, url: str, html: str) -> List[Opportunity]:
+        """Extract opportunities from a downloaded government page"""
         opportunities = []
         
         try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    self.logger.warning(f"⚠️ HTTP {response.status} for {url}")
-                    return opportunities
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract opportunities based on URL type
-                if "midis" in url:
-                    opportunities.extend(await self._parse_social_development(soup, url))
-                elif "midagri" in url or "agrorural" in url:
-                    opportunities.extend(await self._parse_agriculture_programs(soup, url))
-                elif "minam" in url:
-                    opportunities.extend(await self._parse_environment_programs(soup, url))
-                elif "cultura" in url:
-                    opportunities.extend(await self._parse_culture_indigenous(soup, url))
-                elif "minedu" in url or "pronabec" in url:
-                    opportunities.extend(await self._parse_education_programs(soup, url))
-                elif "foncodes" in url:
-                    opportunities.extend(await self._parse_foncodes_programs(soup, url))
-                else:
-                    opportunities.extend(await self._parse_general_programs(soup, url))
-                
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            # Extract opportunities based on URL type
+            if "midis" in url:
+                opportunities.extend(await self._parse_social_development(soup, url))
+            elif "midagri" in url or "agrorural" in url:
+                opportunities.extend(await self._parse_agriculture_programs(soup, url))
+            elif "minam" in url:
+                opportunities.extend(await self._parse_environment_programs(soup, url))
+            elif "cultura" in url:
+                opportunities.extend(await self._parse_culture_indigenous(soup, url))
+            elif "minedu" in url or "pronabec" in url:
+                opportunities.extend(await self._parse_education_programs(soup, url))
+            elif "foncodes" in url:
+                opportunities.extend(await self._parse_foncodes_programs(soup, url))
+            else:
+                opportunities.extend(await self._parse_general_programs(soup, url))
+            
         except Exception as e:
-            self.logger.error(f"❌ Failed to scrape {url}: {str(e)}")
+            self.logger.error(f"❌ Failed to parse {url}: {str(e)}")
         
         return opportunities
     
-    async def _parse_social_development(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_social_development(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse social development ministry programs"""
         opportunities = []
         
@@ -196,7 +206,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_agriculture_programs(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_agriculture_programs(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse agriculture and rural development programs"""
         opportunities = []
         
@@ -214,7 +224,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_environment_programs(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_environment_programs(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse environment ministry programs"""
         opportunities = []
         
@@ -232,7 +242,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_culture_indigenous(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_culture_indigenous(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse culture ministry and indigenous programs"""
         opportunities = []
         
@@ -250,7 +260,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_education_programs(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_education_programs(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse education programs and scholarships"""
         opportunities = []
         
@@ -268,7 +278,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_foncodes_programs(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_foncodes_programs(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse FONCODES social development programs"""
         opportunities = []
         
@@ -286,7 +296,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _parse_general_programs(self, soup: BeautifulSoup, url: str) -> List[PeruGovOpportunity]:
+    async def _parse_general_programs(self, soup: BeautifulSoup, url: str) -> List[Opportunity]:
         """Parse general government programs"""
         opportunities = []
         
@@ -303,7 +313,7 @@ class PeruGovernmentScraper:
         
         return opportunities
     
-    async def _extract_program_info(self, element, source_url: str, sector: str) -> Optional[PeruGovOpportunity]:
+    async def _extract_program_info(self, element, source_url: str, sector: str) -> Optional[Opportunity]:
         """Extract program information from HTML element"""
         try:
             # Extract title
@@ -336,7 +346,7 @@ class PeruGovernmentScraper:
             if not self._is_valid_program(title, description):
                 return None
             
-            opportunity = PeruGovOpportunity(
+            opportunity = new_opportunity(
                 title=title,
                 description=description[:1500],  # Limit length
                 sector=sector,
@@ -352,7 +362,7 @@ class PeruGovernmentScraper:
             self.logger.debug(f"Error extracting program info: {str(e)}")
             return None
     
-    async def _add_known_programs(self) -> List[PeruGovOpportunity]:
+    async def _add_known_programs(self) -> List[Opportunity]:
         """Add known Peru government programs based on research"""
         known_programs = [
             {
@@ -400,7 +410,7 @@ class PeruGovernmentScraper:
         
         opportunities = []
         for program in known_programs:
-            opportunity = PeruGovOpportunity(
+            opportunity = new_opportunity(
                 title=program["title"],
                 description=program["description"],
                 sector=program["sector"],
@@ -448,7 +458,7 @@ class PeruGovernmentScraper:
         
         return text[:1000]  # Limit length
     
-    async def _analyze_and_filter_opportunities(self, opportunities: List[PeruGovOpportunity]) -> List[PeruGovOpportunity]:
+    async def _analyze_and_filter_opportunities(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Analyze opportunities using keyword matcher"""
         relevant_opportunities = []
         
@@ -457,8 +467,8 @@ class PeruGovernmentScraper:
                 # Prepare text for analysis
                 full_text = f"{opportunity.title} {opportunity.description} {opportunity.sector} {opportunity.ministry}"
                 
-                # Analyze with keyword matcher
-                analysis = self.keyword_matcher.analyze_grant_text(
+                # Score with keyword matcher; match details are only built for kept opportunities
+                analysis = self.keyword_matcher.score_grant_text(
                     full_text, 
                     opportunity.title, 
                     opportunity.description
@@ -467,10 +477,15 @@ class PeruGovernmentScraper:
                 # Update opportunity with analysis results
                 opportunity.relevance_score = analysis['relevance_score']
                 opportunity.priority_level = analysis['priority_level']
-                opportunity.keyword_matches = [match['keyword'] for match in analysis['matches']]
                 
                 # Include relevant opportunities (lower threshold for Peru gov programs)
                 if analysis['relevance_score'] >= 1.5 and not analysis['exclusion_flags']:
+                    details = self.keyword_matcher.analyze_grant_text(
+                        full_text, 
+                        opportunity.title, 
+                        opportunity.description
+                    )
+                    opportunity.keyword_matches = [match['keyword'] for match in details['matches']]
                     relevant_opportunities.append(opportunity)
                     self.logger.info(f"✅ Relevant: {opportunity.title} (Score: {opportunity.relevance_score})")
                 else:
@@ -485,7 +500,7 @@ class PeruGovernmentScraper:
         
         return relevant_opportunities
     
-    async def save_to_airtable(self, opportunities: List[PeruGovOpportunity]) -> int:
+    async def save_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save opportunities to Airtable"""
         saved_count = 0
         
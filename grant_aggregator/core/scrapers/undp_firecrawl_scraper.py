@@ -3,38 +3,23 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from functools import partial
 import re
 
-from ..keyword_matcher import PeruGrantKeywordMatcher
-from ..airtable_client import AirtableClient
+try:
+    from ..keyword_matcher import PeruGrantKeywordMatcher
+    from ..opportunity import Opportunity
+    from ..airtable_client import AirtableClient
+    from ..rate_limiter import RateLimiter, source_limit
+except ImportError:
+    from keyword_matcher import PeruGrantKeywordMatcher
+    from opportunity import Opportunity
+    from airtable_client import AirtableClient
+    from rate_limiter import RateLimiter, source_limit
 
 
-@dataclass
-class UNDPOpportunity:
-    """Data structure for UNDP funding opportunities"""
-    title: str
-    organization: str = "United Nations Development Programme (UNDP)"
-    description: str = ""
-    funding_amount: str = ""
-    deadline: Optional[str] = None
-    announcement_date: Optional[str] = None
-    geographic_focus: str = ""
-    sector: str = ""
-    eligibility_criteria: str = ""
-    status: str = ""
-    application_link: str = ""
-    source_url: str = ""
-    source: str = "UNDP"
-    program_type: str = ""  # SGP, Procurement, Youth4Climate, etc.
-    contact_info: str = ""
-    relevance_score: float = 0.0
-    keyword_matches: List[str] = None
-    priority_level: str = "LOW"
-    
-    def __post_init__(self):
-        if self.keyword_matches is None:
-            self.keyword_matches = []
+# Opportunities of this scraper, with its organization and source filled in
+new_opportunity = partial(Opportunity, organization="United Nations Development Programme (UNDP)", source="UNDP")
 
 
 class UNDPFirecrawlScraper:
@@ -43,10 +28,12 @@ class UNDPFirecrawlScraper:
     Focuses on Peru-relevant opportunities using keyword matching.
     """
     
-    def __init__(self, firecrawl_api_key: str = None):
+    def __init__(self, firecrawl_api_key: str = None, keyword_matcher: Optional[PeruGrantKeywordMatcher] = None,
+                 airtable_client: Optional[AirtableClient] = None):
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
-        self.airtable_client = AirtableClient()
+        # The scraper registry injects instances shared by all scrapers
+        self.keyword_matcher = keyword_matcher or PeruGrantKeywordMatcher()
+        self.airtable_client = airtable_client or AirtableClient()
         
         # Configure logging
         logging.basicConfig(
@@ -76,6 +63,10 @@ class UNDPFirecrawlScraper:
             "https://www.undp.org/sustainable-development-goals"
         ]
         
+        # Delay between page requests, in seconds; standalone runs pace each host from it
+        self.request_delay = 3
+        self.rate_limiter = RateLimiter(source_limit(self.request_delay))
+        
         # Define extraction schemas for different opportunity types
         self.extraction_schemas = {
             "procurement": {
@@ -146,7 +137,7 @@ class UNDPFirecrawlScraper:
             }
         }
     
-    async def scrape_all_opportunities(self) -> List[UNDPOpportunity]:
+    async def scrape_all_opportunities(self) -> List[Opportunity]:
         """Main method to scrape UNDP opportunities using Firecrawl"""
         self.logger.info("🚀 Starting UNDP grants scraping with Firecrawl...")
         
@@ -158,12 +149,10 @@ class UNDPFirecrawlScraper:
                 self.logger.info(f"🔍 Processing: {url}")
                 
                 # Determine the best extraction approach based on URL
-                opportunities = await self._process_url_with_firecrawl(url)
+                async with self.rate_limiter.throttle(url):
+                    opportunities = await self._process_url_with_firecrawl(url)
                 all_opportunities.extend(opportunities)
                 
-                # Rate limiting
-                await asyncio.sleep(3)
-                
             except Exception as e:
                 self.logger.error(f"❌ Error processing {url}: {str(e)}")
                 continue
@@ -175,7 +164,7 @@ class UNDPFirecrawlScraper:
         
         return relevant_opportunities
     
-    async def _process_url_with_firecrawl(self, url: str) -> List[UNDPOpportunity]:
+    async def _process_url_with_firecrawl(self, url: str) -> List[Opportunity]:
         """Process a URL using Firecrawl with intelligent extraction"""
         opportunities = []
         
@@ -197,7 +186,18 @@ class UNDPFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_procurement_notices(self, url: str) -> List[UNDPOpportunity]:
+    async def fetch_page(self, url: str) -> List[Opportunity]:
+        """
+        Fetch a UNDP page through Firecrawl. Firecrawl extracts structured
+        data server-side, so the page arrives already turned into opportunities.
+        """
+        return await self._process_url_with_firecrawl(url)
+    
+    async def parse_page(self, url: str, extracted: List[Opportunity]) -> List[Opportunity]:
+        """Opportunities of a fetched page (extraction already happened in fetch_page)"""
+        return list(extracted)
+    
+    async def _scrape_procurement_notices(self, url: str) -> List[Opportunity]:
         """Scrape UNDP procurement notices using Firecrawl extract"""
         opportunities = []
         
@@ -226,7 +226,7 @@ class UNDPFirecrawlScraper:
             
             if extracted_data and "opportunities" in extracted_data:
                 for opp_data in extracted_data["opportunities"]:
-                    opportunity = UNDPOpportunity(
+                    opportunity = new_opportunity(
                         title=opp_data.get("title", ""),
                         description=opp_data.get("description", ""),
                         deadline=opp_data.get("deadline"),
@@ -247,7 +247,7 @@ class UNDPFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_small_grants_program(self, url: str) -> List[UNDPOpportunity]:
+    async def _scrape_small_grants_program(self, url: str) -> List[Opportunity]:
         """Scrape UNDP Small Grants Programme information"""
         opportunities = []
         
@@ -270,7 +270,7 @@ class UNDPFirecrawlScraper:
             
             if extracted_data and "funding_opportunities" in extracted_data:
                 for grant_data in extracted_data["funding_opportunities"]:
-                    opportunity = UNDPOpportunity(
+                    opportunity = new_opportunity(
                         title=grant_data.get("program_name", "UNDP-GEF Small Grants Programme"),
                         description=grant_data.get("description", ""),
                         funding_amount=grant_data.get("funding_amount", "Up to $50,000"),
@@ -290,7 +290,7 @@ class UNDPFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_peru_specific_content(self, url: str) -> List[UNDPOpportunity]:
+    async def _scrape_peru_specific_content(self, url: str) -> List[Opportunity]:
         """Scrape Peru-specific UNDP content"""
         opportunities = []
         
@@ -313,7 +313,7 @@ class UNDPFirecrawlScraper:
             
             if extracted_data and "peru_initiatives" in extracted_data:
                 for initiative in extracted_data["peru_initiatives"]:
-                    opportunity = UNDPOpportunity(
+                    opportunity = new_opportunity(
                         title=initiative.get("initiative_name", ""),
                         description=initiative.get("description", ""),
                         funding_amount=initiative.get("funding_amount", ""),
@@ -334,7 +334,7 @@ class UNDPFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_climate_finance(self, url: str) -> List[UNDPOpportunity]:
+    async def _scrape_climate_finance(self, url: str) -> List[Opportunity]:
         """Scrape climate finance and trust fund opportunities"""
         opportunities = []
         
@@ -371,7 +371,7 @@ class UNDPFirecrawlScraper:
             ]
             
             for climate_data in climate_opportunities:
-                opportunity = UNDPOpportunity(
+                opportunity = new_opportunity(
                     title=climate_data["title"],
                     description=climate_data["description"],
                     funding_amount=climate_data["funding_amount"],
@@ -389,7 +389,7 @@ class UNDPFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_general_undp_content(self, url: str) -> List[UNDPOpportunity]:
+    async def _scrape_general_undp_content(self, url: str) -> List[Opportunity]:
         """Scrape general UNDP content for opportunities"""
         opportunities = []
         
@@ -412,7 +412,7 @@ class UNDPFirecrawlScraper:
             ]
             
             for gen_data in general_opportunities:
-                opportunity = UNDPOpportunity(
+                opportunity = new_opportunity(
                     title=gen_data["title"],
                     description=gen_data["description"],
                     geographic_focus=gen_data["geographic_focus"],
@@ -470,7 +470,7 @@ class UNDPFirecrawlScraper:
         
         return {}
     
-    async def _analyze_and_filter_opportunities(self, opportunities: List[UNDPOpportunity]) -> List[UNDPOpportunity]:
+    async def _analyze_and_filter_opportunities(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Analyze opportunities using keyword matcher and filter relevant ones"""
         relevant_opportunities = []
         
@@ -479,8 +479,8 @@ class UNDPFirecrawlScraper:
                 # Prepare text for analysis
                 full_text = f"{opportunity.title} {opportunity.description} {opportunity.sector} {opportunity.geographic_focus} {opportunity.eligibility_criteria}"
                 
-                # Analyze with keyword matcher
-                analysis = self.keyword_matcher.analyze_grant_text(
+                # Score with keyword matcher; match details are only built for kept opportunities
+                analysis = self.keyword_matcher.score_grant_text(
                     full_text, 
                     opportunity.title, 
                     opportunity.description
@@ -489,10 +489,15 @@ class UNDPFirecrawlScraper:
                 # Update opportunity with analysis results
                 opportunity.relevance_score = analysis['relevance_score']
                 opportunity.priority_level = analysis['priority_level']
-                opportunity.keyword_matches = [match['keyword'] for match in analysis['matches']]
                 
                 # Include relevant opportunities (lower threshold for UNDP due to development focus)
                 if analysis['relevance_score'] >= 2.0 and not analysis['exclusion_flags']:
+                    details = self.keyword_matcher.analyze_grant_text(
+                        full_text, 
+                        opportunity.title, 
+                        opportunity.description
+                    )
+                    opportunity.keyword_matches = [match['keyword'] for match in details['matches']]
                     relevant_opportunities.append(opportunity)
                     self.logger.info(f"✅ Relevant: {opportunity.title} (Score: {opportunity.relevance_score})")
                 else:
@@ -507,7 +512,7 @@ class UNDPFirecrawlScraper:
         
         return relevant_opportunities
     
-    async def save_to_airtable(self, opportunities: List[UNDPOpportunity]) -> int:
+    async def save_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save opportunities to Airtable"""
         saved_count = 0
         
@@ -3,41 +3,23 @@ import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from functools import partial
 import re
 
-from ..keyword_matcher import PeruGrantKeywordMatcher
-from ..airtable_client import AirtableClient
+try:
+    from ..keyword_matcher import PeruGrantKeywordMatcher
+    from ..opportunity import Opportunity
+    from ..airtable_client import AirtableClient
+    from ..rate_limiter import RateLimiter, source_limit
+except ImportError:
+    from keyword_matcher import PeruGrantKeywordMatcher
+    from opportunity import Opportunity
+    from airtable_client import AirtableClient
+    from rate_limiter import RateLimiter, source_limit
 
 
-@dataclass
-class WorldBankOpportunity:
-    """Data structure for World Bank funding opportunities"""
-    title: str
-    organization: str = "World Bank Group"
-    description: str = ""
-    funding_amount: str = ""
-    deadline: Optional[str] = None
-    announcement_date: Optional[str] = None
-    geographic_focus: str = ""
-    sector: str = ""
-    eligibility_criteria: str = ""
-    status: str = ""
-    application_link: str = ""
-    source_url: str = ""
-    source: str = "World Bank"
-    program_type: str = ""  # Trust Fund, Procurement, Investment Project, etc.
-    project_id: str = ""
-    implementing_agency: str = ""
-    target_beneficiaries: str = ""
-    contact_info: str = ""
-    relevance_score: float = 0.0
-    keyword_matches: List[str] = None
-    priority_level: str = "LOW"
-    
-    def __post_init__(self):
-        if self.keyword_matches is None:
-            self.keyword_matches = []
+# Opportunities of this scraper, with its organization and source filled in
+new_opportunity = partial(Opportunity, organization="World Bank Group", source="World Bank")
 
 
 class WorldBankFirecrawlScraper:
@@ -46,10 +28,12 @@ class WorldBankFirecrawlScraper:
     Focuses on Peru-relevant opportunities using advanced keyword matching.
     """
     
-    def __init__(self, firecrawl_api_key: str = None):
+    def __init__(self, firecrawl_api_key: str = None, keyword_matcher: Optional[PeruGrantKeywordMatcher] = None,
+                 airtable_client: Optional[AirtableClient] = None):
         self.logger = logging.getLogger(__name__)
-        self.keyword_matcher = PeruGrantKeywordMatcher()
-        self.airtable_client = AirtableClient()
+        # The scraper registry injects instances shared by all scrapers
+        self.keyword_matcher = keyword_matcher or PeruGrantKeywordMatcher()
+        self.airtable_client = airtable_client or AirtableClient()
         
         # Configure logging
         logging.basicConfig(
@@ -88,6 +72,10 @@ class WorldBankFirecrawlScraper:
             "https://www.worldbank.org/en/topic/poverty"
         ]
         
+        # Delay between page requests, in seconds; standalone runs pace each host from it
+        self.request_delay = 4
+        self.rate_limiter = RateLimiter(source_limit(self.request_delay))
+        
         # Peru country office contact
         self.peru_contact = {
             "phone": "+51 1 622-2300",
@@ -166,7 +154,7 @@ class WorldBankFirecrawlScraper:
             }
         }
     
-    async def scrape_all_opportunities(self) -> List[WorldBankOpportunity]:
+    async def scrape_all_opportunities(self) -> List[Opportunity]:
         """Main method to scrape World Bank opportunities using Firecrawl"""
         self.logger.info("🚀 Starting World Bank grants scraping with Firecrawl...")
         
@@ -177,12 +165,10 @@ class WorldBankFirecrawlScraper:
             try:
                 self.logger.info(f"🔍 Processing World Bank URL: {url}")
                 
-                opportunities = await self._process_url_with_firecrawl(url)
+                async with self.rate_limiter.throttle(url):
+                    opportunities = await self._process_url_with_firecrawl(url)
                 all_opportunities.extend(opportunities)
                 
-                # Respectful rate limiting
-                await asyncio.sleep(4)
-                
             except Exception as e:
                 self.logger.error(f"❌ Error processing {url}: {str(e)}")
                 continue
@@ -194,7 +180,7 @@ class WorldBankFirecrawlScraper:
         
         return relevant_opportunities
     
-    async def _process_url_with_firecrawl(self, url: str) -> List[WorldBankOpportunity]:
+    async def _process_url_with_firecrawl(self, url: str) -> List[Opportunity]:
         """Process URL using Firecrawl with content-specific extraction"""
         opportunities = []
         
@@ -220,7 +206,18 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_peru_country_program(self, url: str) -> List[WorldBankOpportunity]:
+    async def fetch_page(self, url: str) -> List[Opportunity]:
+        """
+        Fetch a World Bank page through Firecrawl. Firecrawl extracts structured
+        data server-side, so the page arrives already turned into opportunities.
+        """
+        return await self._process_url_with_firecrawl(url)
+    
+    async def parse_page(self, url: str, extracted: List[Opportunity]) -> List[Opportunity]:
+        """Opportunities of a fetched page (extraction already happened in fetch_page)"""
+        return list(extracted)
+    
+    async def _scrape_peru_country_program(self, url: str) -> List[Opportunity]:
         """Scrape Peru-specific World Bank country program information"""
         opportunities = []
         
@@ -273,7 +270,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for program in peru_programs:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=program["project_name"],
                     description=program["description"],
                     funding_amount=program["funding_amount"],
@@ -294,7 +291,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_procurement_opportunities(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_procurement_opportunities(self, url: str) -> List[Opportunity]:
         """Scrape World Bank procurement and business opportunities"""
         opportunities = []
         
@@ -335,7 +332,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for opp in procurement_opps:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=opp["opportunity_title"],
                     description=opp["description"],
                     funding_amount=opp["estimated_value"],
@@ -355,7 +352,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_trust_funds(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_trust_funds(self, url: str) -> List[Opportunity]:
         """Scrape World Bank trust fund opportunities"""
         opportunities = []
         
@@ -401,7 +398,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for fund in trust_funds:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=fund["fund_name"],
                     description=fund["description"],
                     funding_amount=fund["funding_available"],
@@ -421,7 +418,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_indigenous_programs(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_indigenous_programs(self, url: str) -> List[Opportunity]:
         """Scrape World Bank indigenous peoples programs"""
         opportunities = []
         
@@ -458,7 +455,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for program in indigenous_programs:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=program["program_name"],
                     description=program["description"],
                     geographic_focus=program["geographic_focus"],
@@ -475,7 +472,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_civil_society_partnerships(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_civil_society_partnerships(self, url: str) -> List[Opportunity]:
         """Scrape World Bank civil society partnership opportunities"""
         opportunities = []
         
@@ -499,7 +496,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for opp in cs_opportunities:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=opp["title"],
                     description=opp["description"],
                     geographic_focus=opp["geographic_focus"],
@@ -517,7 +514,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_thematic_programs(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_thematic_programs(self, url: str) -> List[Opportunity]:
         """Scrape thematic World Bank programs (environment, agriculture, etc.)"""
         opportunities = []
         
@@ -539,7 +536,7 @@ class WorldBankFirecrawlScraper:
             ]
             
             for program in thematic_programs:
-                opportunity = WorldBankOpportunity(
+                opportunity = new_opportunity(
                     title=program["title"],
                     description=program["description"],
                     sector=program["sector"],
@@ -556,12 +553,12 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _scrape_general_wb_content(self, url: str) -> List[WorldBankOpportunity]:
+    async def _scrape_general_wb_content(self, url: str) -> List[Opportunity]:
         """Scrape general World Bank content for opportunities"""
         opportunities = []
         
         # Generic opportunity based on World Bank structure
-        opportunity = WorldBankOpportunity(
+        opportunity = new_opportunity(
             title="World Bank General Development Programs",
             description="Ongoing World Bank development initiatives and partnership opportunities",
             geographic_focus="Global/Latin America",
@@ -575,7 +572,7 @@ class WorldBankFirecrawlScraper:
         
         return opportunities
     
-    async def _analyze_and_filter_opportunities(self, opportunities: List[WorldBankOpportunity]) -> List[WorldBankOpportunity]:
+    async def _analyze_and_filter_opportunities(self, opportunities: List[Opportunity]) -> List[Opportunity]:
         """Analyze opportunities using keyword matcher and filter relevant ones"""
         relevant_opportunities = []
         
@@ -584,8 +581,8 @@ class WorldBankFirecrawlScraper:
                 # Prepare text for analysis
                 full_text = f"{opportunity.title} {opportunity.description} {opportunity.sector} {opportunity.geographic_focus} {opportunity.target_beneficiaries} {opportunity.eligibility_criteria}"
                 
-                # Analyze with keyword matcher
-                analysis = self.keyword_matcher.analyze_grant_text(
+                # Score with keyword matcher; match details are only built for kept opportunities
+                analysis = self.keyword_matcher.score_grant_text(
                     full_text, 
                     opportunity.title, 
                     opportunity.description
@@ -594,10 +591,15 @@ class WorldBankFirecrawlScraper:
                 # Update opportunity with analysis results
                 opportunity.relevance_score = analysis['relevance_score']
                 opportunity.priority_level = analysis['priority_level']
-                opportunity.keyword_matches = [match['keyword'] for match in analysis['matches']]
                 
                 # Include relevant opportunities (adjusted threshold for World Bank development focus)
                 if analysis['relevance_score'] >= 2.5 and not analysis['exclusion_flags']:
+                    details = self.keyword_matcher.analyze_grant_text(
+                        full_text, 
+                        opportunity.title, 
+                        opportunity.description
+                    )
+                    opportunity.keyword_matches = [match['keyword'] for match in details['matches']]
                     relevant_opportunities.append(opportunity)
                     self.logger.info(f"✅ Relevant: {opportunity.title} (Score: {opportunity.relevance_score})")
                 else:
@@ -612,7 +614,7 @@ class WorldBankFirecrawlScraper:
         
         return relevant_opportunities
     
-    async def save_to_airtable(self, opportunities: List[WorldBankOpportunity]) -> int:
+    async def save_to_airtable(self, opportunities: List[Opportunity]) -> int:
         """Save opportunities to Airtable"""
         saved_count = 0
         
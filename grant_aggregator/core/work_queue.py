@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+
+@dataclass
+class WorkUnit:
+    """One unit of a sharded crawl: a page of a source (url None stands for a source's known programs)"""
+    unit_id: int
+    run_id: str
+    source: str
+    url: Optional[str]
+    attempts: int = 0
+
+    @property
+    def page(self) -> str:
+        """Name of the page, as used by checkpoints"""
+        return self.url or 'known programs'
+
+
+class WorkQueue:
+    """
+    Durable queue of crawl work units, shared by the orchestrator and its workers.
+
+    The orchestrator puts the units of a run, workers claim them, process them
+    and complete them with a result, and the orchestrator collects finished
+    units for merging. A claim is a lease: a unit whose worker dies becomes
+    available again once its lease runs out. Only one unit per source is
+    leased at a time, and a completed unit can hold its source back for a
+    while, so workers together keep each source's request delay.
+
+    Backends subclass this. Worker processes receive the queue object itself,
+    so a backend must be picklable and (re)connect on first use.
+    """
+
+    def put(self, run_id: str, units: List[Tuple[str, Optional[str]]]):
+        """Add (source, url) units to a run; units already there are queued again unless leased"""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, run_id: Optional[str] = None, lease: float = 120) -> Optional[WorkUnit]:
+        """Lease the next available unit (of one run, or of any); None if there is none right now"""
+        raise NotImplementedError
+
+    def complete(self, unit: WorkUnit, result: Dict[str, Any], hold_source: float = 0):
+        """Finish a unit with its result, keeping other units of its source back for hold_source seconds"""
+        raise NotImplementedError
+
+    def collect(self, run_id: str) -> List[Tuple[WorkUnit, Dict[str, Any]]]:
+        """Finished units of a run not collected yet, with their results"""
+        raise NotImplementedError
+
+    def remaining(self, run_id: str) -> int:
+        """Units of a run that are still queued or being worked on"""
+        raise NotImplementedError
+
+    def cancel(self, run_id: str) -> List[str]:
+        """Drop the units of a run nobody works on, returning the sources of all unfinished units"""
+        raise NotImplementedError
+
+    def purge(self, run_id: str):
+        """Forget every unit of a finished run"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the queue's resources"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Work queue in a SQLite file. Claims run in immediate transactions, so
+    worker processes on one machine (or on machines sharing a disk that
+    supports SQLite locking) never lease the same unit twice.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._connection = None
+
+    def __getstate__(self):
+        # Connections do not cross processes; the receiving process opens its own
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        state['logger'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.logger = logging.getLogger(__name__)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (and create if needed) the queue on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Autocommit mode: claims manage their own transactions. Callers hand the queue to
+            # worker threads (asyncio.to_thread), one call at a time
+            self._connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS units ("
+                "id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, source TEXT NOT NULL, page TEXT NOT NULL, url TEXT, "
+                "status TEXT NOT NULL DEFAULT 'queued', worker TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "lease_until REAL, result TEXT, collected INTEGER NOT NULL DEFAULT 0, "
+                "UNIQUE (run_id, source, page))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS units_status ON units (status, run_id)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS source_holds (source TEXT PRIMARY KEY, until REAL NOT NULL)"
+            )
+        return self._connection
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, so concurrent workers see all of it or nothing"""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def put(self, run_id: str, units: List[Tuple[str, Optional[str]]]):
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO units (run_id, source, page, url) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (run_id, source, page) DO UPDATE SET "
+                "status = 'queued', worker = NULL, attempts = 0, lease_until = NULL, result = NULL, collected = 0 "
+                "WHERE status != 'leased'",
+                [(run_id, source, url or 'known programs', url) for source, url in units]
+            )
+
+    def claim(self, worker_id: str, run_id: Optional[str] = None, lease: float = 120) -> Optional[WorkUnit]:
+        now = time.time()
+        with self._transaction() as connection:
+            # Units whose worker died too often are given up
+            connection.execute(
+                "UPDATE units SET status = 'done', collected = 0, result = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (json.dumps({'failed': True, 'errors': ['worker lost, attempts used up']}), now, self.max_attempts)
+            )
+            row = connection.execute(
+                "SELECT id, run_id, source, url, attempts FROM units "
+                "WHERE (status = 'queued' OR (status = 'leased' AND lease_until < ?)) AND (? IS NULL OR run_id = ?) "
+                "AND source NOT IN (SELECT source FROM units WHERE status = 'leased' AND lease_until >= ?) "
+                "AND source NOT IN (SELECT source FROM source_holds WHERE until > ?) "
+                "ORDER BY id LIMIT 1",
+                (now, run_id, run_id, now, now)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE units SET status = 'leased', worker = ?, attempts = attempts + 1, lease_until = ? "
+                    "WHERE id = ?",
+                    (worker_id, now + lease, row[0])
+                )
+
+        if row is None:
+            return None
+        return WorkUnit(unit_id=row[0], run_id=row[1], source=row[2], url=row[3], attempts=row[4] + 1)
+
+    def complete(self, unit: WorkUnit, result: Dict[str, Any], hold_source: float = 0):
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE units SET status = 'done', lease_until = NULL, result = ?, collected = 0 WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), unit.unit_id)
+            )
+            if hold_source > 0:
+                connection.execute(
+                    "INSERT OR REPLACE INTO source_holds (source, until) VALUES (?, ?)",
+                    (unit.source, time.time() + hold_source)
+                )
+
+    def collect(self, run_id: str) -> List[Tuple[WorkUnit, Dict[str, Any]]]:
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, run_id, source, url, attempts, result FROM units "
+                "WHERE run_id = ? AND status = 'done' AND collected = 0 ORDER BY id",
+                (run_id,)
+            ).fetchall()
+            connection.executemany("UPDATE units SET collected = 1 WHERE id = ?", [(row[0],) for row in rows])
+        return [
+            (WorkUnit(unit_id=row[0], run_id=row[1], source=row[2], url=row[3], attempts=row[4]), json.loads(row[5]))
+            for row in rows
+        ]
+
+    def remaining(self, run_id: str) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM units WHERE run_id = ? AND status != 'done'", (run_id,)
+        ).fetchone()[0]
+
+    def cancel(self, run_id: str) -> List[str]:
+        now = time.time()
+        with self._transaction() as connection:
+            sources = [row[0] for row in connection.execute(
+                "SELECT DISTINCT source FROM units WHERE run_id = ? AND status != 'done' ORDER BY source", (run_id,)
+            )]
+            connection.execute(
+                "DELETE FROM units WHERE run_id = ? AND (status = 'queued' OR (status = 'leased' AND lease_until < ?))",
+                (run_id, now)
+            )
+        return sources
+
+    def purge(self, run_id: str):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM units WHERE run_id = ?", (run_id,))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -17,6 +17,10 @@ Features:
 - Comprehensive error handling and reporting
 """
 
+import time
+
+STARTUP_STARTED = time.perf_counter()  # startup is measured from here
+
 import asyncio
 import sys
 import os
@@ -26,13 +30,19 @@ from datetime import datetime
 # Add the grant_aggregator/core to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'grant_aggregator', 'core'))
 
+
+def print_import_error(error: ImportError):
+    """Explain a failed import"""
+    print(f"❌ Import Error: {error}")
+    print("Make sure you're running from the project root directory")
+    print("and all dependencies are installed.")
+
+
+# The orchestrator (and the scrapers it loads) is only imported when scraping
 try:
-    from scraper_orchestrator import GrantScraperOrchestrator
     from keyword_matcher import PeruGrantKeywordMatcher
 except ImportError as e:
-    print(f"❌ Import Error: {e}")
-    print("Make sure you're running from the project root directory")
-    print("and all dependencies are installed.")
+    print_import_error(e)
     sys.exit(1)
 
 
@@ -73,7 +83,26 @@ Advanced Options:
     
     --threshold FLOAT               Set relevance threshold (default: 3.0)
     
-    --max-opportunities INT         Max opportunities per source (default: 50)
+    --max-opportunities INT         Max opportunities kept per source, in arrival order
+                                    (default: 50)
+    
+    --deadline SECONDS              Stop fetching after SECONDS, keeping partial results
+                                    (default: 600, 0 = no limit)
+    
+    --resume [RUN_ID]               Resume an interrupted run, skipping pages it already
+                                    completed (default: the most recent unfinished run)
+    
+    --workers N                     Fetch, parse and score in N worker processes fed by a
+                                    work queue (default: 0 = all in this process); more
+                                    workers can join with grant_aggregator/core/crawl_worker.py
+    
+    --stale-while-revalidate SECONDS
+                                    Use cached pages validated within SECONDS right away,
+                                    revalidating them in the background (default: 0 = always
+                                    revalidate before use)
+    
+    --metrics-file PATH             Also write the run metrics (stage latencies, requests,
+                                    bytes per source) to PATH in Prometheus text format
     
     --test-keywords                 Test keyword matching engine only
     
@@ -93,6 +122,15 @@ Examples:
     
     # Test mode - no Airtable saving
     python3 run_intelligent_scraping.py --no-airtable --verbose
+    
+    # Pick up where an interrupted run stopped
+    python3 run_intelligent_scraping.py --resume
+    
+    # Spread the crawl over 4 worker processes
+    python3 run_intelligent_scraping.py --workers 4
+    
+    # Export run metrics for Prometheus' node_exporter textfile collector
+    python3 run_intelligent_scraping.py --metrics-file /var/lib/node_exporter/grant_scraper.prom
 
 📋 SYSTEM REQUIREMENTS:
     • Python 3.7+
@@ -107,7 +145,9 @@ Examples:
     
 💾 OUTPUT FILES:
     • Logs: grant_scraping_YYYYMMDD.log
-    • Reports: grant_aggregator/logs/scraping_report_*.json
+    • Reports: grant_aggregator/logs/scraping_report_*.json (with per-stage metrics)
+    • Checkpoints: grant_aggregator/cache/checkpoints.sqlite (for --resume)
+    • HTTP cache: grant_aggregator/cache/http_cache.sqlite (pages and their extractions)
     • Airtable: Records automatically created in configured base
 """
     print(help_text)
@@ -179,7 +219,22 @@ async def main():
                        help='Relevance threshold for filtering (default: 3.0)')
     
     parser.add_argument('--max-opportunities', type=int, default=50,
-                       help='Max opportunities per source (default: 50)')
+                       help='Max opportunities kept per source, in arrival order (default: 50)')
+    
+    parser.add_argument('--deadline', type=float, default=600,
+                       help='Stop fetching after this many seconds, keeping partial results (default: 600, 0 = no limit)')
+    
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='RUN_ID',
+                       help='Resume an interrupted run (default: the most recent unfinished run)')
+    
+    parser.add_argument('--workers', type=int, default=0,
+                       help='Worker processes that fetch, parse and score pages (default: 0 = none)')
+    
+    parser.add_argument('--stale-while-revalidate', type=float, default=0, metavar='SECONDS',
+                       help='Use cached pages validated within this many seconds right away, revalidating them in the background')
+    
+    parser.add_argument('--metrics-file', metavar='PATH',
+                       help='Also write run metrics to this file in Prometheus text format')
     
     parser.add_argument('--test-keywords', action='store_true',
                        help='Test keyword matching engine only')
@@ -202,12 +257,19 @@ async def main():
     
     # Test keyword engine if requested
     if args.test_keywords:
+        print(f"⚡ Startup: {time.perf_counter() - STARTUP_STARTED:.2f} seconds")
         await test_keyword_engine()
         return
     
     # Initialize orchestrator with configuration
     print("🔧 Initializing Grant Scraper Orchestrator...")
+    try:
+        from scraper_orchestrator import GrantScraperOrchestrator
+    except ImportError as e:
+        print_import_error(e)
+        return 1
     orchestrator = GrantScraperOrchestrator()
+    print(f"⚡ Startup: {time.perf_counter() - STARTUP_STARTED:.2f} seconds (scrapers load as their sources run)")
     
     # Apply command line configuration
     if args.no_airtable:
@@ -216,6 +278,10 @@ async def main():
     
     orchestrator.config['relevance_threshold'] = args.threshold
     orchestrator.config['max_opportunities_per_source'] = args.max_opportunities
+    orchestrator.config['run_deadline'] = args.deadline
+    orchestrator.config['worker_processes'] = args.workers
+    orchestrator.config['metrics_prometheus_path'] = args.metrics_file
+    orchestrator.config['http_cache_stale_while_revalidate'] = args.stale_while_revalidate
     
     if args.verbose:
         import logging
@@ -225,15 +291,23 @@ async def main():
     print(f"⚙️ Configuration:")
     print(f"   • Relevance threshold: {args.threshold}")
     print(f"   • Max opportunities per source: {args.max_opportunities}")
+    print(f"   • Run deadline: {f'{args.deadline:.0f} seconds' if args.deadline else 'None'}")
+    print(f"   • Worker processes: {args.workers if args.workers else 'None (single process)'}")
     print(f"   • Airtable integration: {'Enabled' if not args.no_airtable else 'Disabled'}")
     print(f"   • Sources: {args.sources if args.sources else 'All sources'}")
+    if args.stale_while_revalidate:
+        print(f"   • Stale-while-revalidate: {args.stale_while_revalidate:.0f} seconds")
+    if args.metrics_file:
+        print(f"   • Prometheus metrics: {args.metrics_file}")
+    if args.resume:
+        print(f"   • Resuming: {'most recent unfinished run' if args.resume == 'latest' else args.resume}")
     
     # Run comprehensive scraping
     try:
         print("\n🚀 Starting comprehensive grant scraping...")
         print("=" * 60)
         
-        report = await orchestrator.run_comprehensive_scraping(sources=args.sources)
+        report = await orchestrator.run_comprehensive_scraping(sources=args.sources, resume=args.resume)
         
         # Final summary
         print(f"\n📋 SESSION SUMMARY:")
@@ -242,6 +316,14 @@ async def main():
         print(f"   • Total opportunities: {report.total_opportunities}")
         print(f"   • Peru-relevant: {report.relevant_opportunities}")
         print(f"   • Success rate: {(len(report.sources_scraped)/len(orchestrator.scrapers)*100):.1f}%")
+        print(f"   • Startup (seconds): {', '.join(f'{name} {seconds:.2f}' for name, seconds in report.startup_times.items())}")
+        stage_seconds = {stage: stats['seconds'] for stage, stats in report.metrics.get('stages', {}).items()}
+        if stage_seconds:
+            print(f"   • Stage time (seconds): {', '.join(f'{stage} {seconds:.2f}' for stage, seconds in stage_seconds.items())}")
+        
+        if report.partial_sources:
+            print(f"   • Partial sources (time budget reached): {', '.join(report.partial_sources)}")
+            print(f"   • Resume with: python3 run_intelligent_scraping.py --resume {report.run_id}")
         
         if report.errors:
             print(f"   • Errors encountered: {len(report.errors)}")